@@ -109,7 +109,7 @@ module "lambda_detector" {
   alerts_table_name             = module.dynamodb.alerts_table_name
   alerts_table_arn              = module.dynamodb.alerts_table_arn
   dynamodb_kms_arn              = module.dynamodb.kms_key_arn
-  rag_lambda_arn                = module.lambda_rag_query.lambda_function_arn
+  rag_lambda_arn                = module.lambda_rag_query.lambda_alias_arn
   risk_threshold                = var.risk_threshold
   bedrock_model_id              = var.bedrock_model_id
   schedule_expression           = var.schedule_expression
@@ -313,6 +313,16 @@ resource "aws_dynamodb_table" "telemetry" {
     type = "S"
   }
 
+  attribute {
+    name = "registry_pk"
+    type = "S"
+  }
+
+  attribute {
+    name = "last_seen"
+    type = "N"
+  }
+
   global_secondary_index {
     name            = "HazardLevelIndex"
     hash_key        = "hazard_level"
@@ -334,6 +344,16 @@ resource "aws_dynamodb_table" "telemetry" {
     projection_type = "ALL"
   }
 
+  # Sparse index over the one-per-sensor registry items written by the
+  # ingestor (timestamp = 0); lets the detector list active sensors
+  # without scanning the time series
+  global_secondary_index {
+    name            = "SensorRegistryIndex"
+    hash_key        = "registry_pk"
+    range_key       = "last_seen"
+    projection_type = "KEYS_ONLY"
+  }
+
   ttl {
     attribute_name = "ttl"
     enabled        = true
@@ -390,6 +410,18 @@ resource "aws_dynamodb_table" "alerts" {
     type = "S"
   }
 
+  attribute {
+    name = "detection_id"
+    type = "S"
+  }
+
+  global_secondary_index {
+    name            = "DetectionIndex"
+    hash_key        = "detection_id"
+    range_key       = "created_at"
+    projection_type = "ALL"
+  }
+
   global_secondary_index {
     name            = "StatusIndex"
     hash_key        = "status"
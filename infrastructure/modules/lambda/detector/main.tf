@@ -39,6 +39,9 @@ resource "aws_lambda_function" "detector" {
       POWERTOOLS_LOG_LEVEL    = var.lambda_log_level
       POWERTOOLS_SERVICE_NAME = "openlews-detector"
       PLACE_INDEX_NAME        = var.place_index_name
+      BEDROCK_BATCH_BUCKET    = var.bedrock_batch_bucket
+      BEDROCK_BATCH_ROLE_ARN  = var.bedrock_batch_role_arn
+      USE_SENSOR_REGISTRY     = "true"
     }
   }
 
@@ -179,6 +182,41 @@ resource "aws_iam_role_policy" "detector_lambda" {
   })
 }
 
+# Bedrock batch inference (only when a bucket and service role are configured)
+resource "aws_iam_role_policy" "detector_bedrock_batch" {
+  count = var.bedrock_batch_bucket != "" && var.bedrock_batch_role_arn != "" ? 1 : 0
+  name  = "${local.lambda_name}-bedrock-batch"
+  role  = aws_iam_role.detector_lambda.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "bedrock:CreateModelInvocationJob",
+          "bedrock:GetModelInvocationJob",
+          "bedrock:StopModelInvocationJob"
+        ]
+        Resource = "*"
+      },
+      {
+        Effect   = "Allow"
+        Action   = ["iam:PassRole"]
+        Resource = var.bedrock_batch_role_arn
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "s3:PutObject",
+          "s3:GetObject"
+        ]
+        Resource = "arn:aws:s3:::${var.bedrock_batch_bucket}/batch/*"
+      }
+    ]
+  })
+}
+
 data "aws_caller_identity" "current" {}
 
 # EventBridge Schedule (every 15 minutes)
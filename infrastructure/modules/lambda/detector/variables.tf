@@ -34,7 +34,7 @@ variable "dynamodb_kms_arn" {
 }
 
 variable "rag_lambda_arn" {
-  description = "ARN of RAG Query Lambda function"
+  description = "Qualified (alias) ARN of RAG Query Lambda function"
   type        = string
 }
 
@@ -98,6 +98,18 @@ variable "place_index_arn" {
   default     = ""
 }
 
+variable "bedrock_batch_bucket" {
+  description = "S3 bucket for Bedrock batch inference input/output (empty disables batch)"
+  type        = string
+  default     = ""
+}
+
+variable "bedrock_batch_role_arn" {
+  description = "Service role Bedrock assumes to run batch inference jobs (empty disables batch)"
+  type        = string
+  default     = ""
+}
+
 
 variable "tags" {
   description = "Resource tags"
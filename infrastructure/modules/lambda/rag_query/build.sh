@@ -8,12 +8,14 @@ TF_MODULE_DIR="${REPO_ROOT}/infrastructure/modules/lambda/rag_query"
 
 REQ_FILE="${SRC_DIR}/requirements.txt"
 PY_FILE="${SRC_DIR}/rag_query_lambda.py"
+SHARED_FILE="${REPO_ROOT}/src/lambdas/shared/geohash_cells.py"
 
 OUT_ZIP="${TF_MODULE_DIR}/lambda_package.zip"
 BUILD_DIR="${TF_MODULE_DIR}/.build"
 
 [[ -f "${REQ_FILE}" ]] || { echo "Missing: ${REQ_FILE}"; exit 1; }
 [[ -f "${PY_FILE}"  ]] || { echo "Missing: ${PY_FILE}"; exit 1; }
+[[ -f "${SHARED_FILE}" ]] || { echo "Missing: ${SHARED_FILE}"; exit 1; }
 
 echo "Cleaning build dir..."
 rm -rf "${BUILD_DIR}"
@@ -33,6 +35,7 @@ python3 -m pip install \
 
 echo "Copying lambda code..."
 cp "${PY_FILE}" "${BUILD_DIR}/lambda_function.py"
+cp "${SHARED_FILE}" "${BUILD_DIR}/"
 
 echo "Creating zip..."
 rm -f "${OUT_ZIP}"
@@ -73,6 +73,12 @@ variable "geohash_precision" {
   default     = 4
 }
 
+variable "provisioned_concurrency" {
+  description = "Provisioned concurrent executions on the live alias (0 disables)"
+  type        = number
+  default     = 2
+}
+
 variable "tags" {
   type    = map(string)
   default = {}
@@ -180,6 +186,7 @@ resource "aws_lambda_function" "rag_query" {
   runtime       = "python3.11"
   timeout       = 30
   memory_size   = 512
+  publish       = true
 
   filename         = "${path.module}/lambda_package.zip"
   source_code_hash = fileexists("${path.module}/lambda_package.zip") ? filebase64sha256("${path.module}/lambda_package.zip") : null
@@ -206,6 +213,21 @@ resource "aws_lambda_function" "rag_query" {
   ]
 }
 
+# Live alias - callers invoke this so bursts land on pre-initialized environments
+resource "aws_lambda_alias" "rag_query_live" {
+  name             = "live"
+  function_name    = aws_lambda_function.rag_query.function_name
+  function_version = aws_lambda_function.rag_query.version
+}
+
+resource "aws_lambda_provisioned_concurrency_config" "rag_query_live" {
+  count = var.provisioned_concurrency > 0 ? 1 : 0
+
+  function_name                     = aws_lambda_function.rag_query.function_name
+  qualifier                         = aws_lambda_alias.rag_query_live.name
+  provisioned_concurrent_executions = var.provisioned_concurrency
+}
+
 # Lambda Function URL (for direct HTTPS invocation)
 resource "aws_lambda_function_url" "rag_query" {
   function_name      = aws_lambda_function.rag_query.function_name
@@ -245,6 +267,11 @@ output "lambda_function_arn" {
   value       = aws_lambda_function.rag_query.arn
 }
 
+output "lambda_alias_arn" {
+  description = "ARN of the live alias (qualified, provisioned concurrency)"
+  value       = aws_lambda_alias.rag_query_live.arn
+}
+
 output "lambda_function_url" {
   description = "HTTPS URL for invoking the Lambda"
   value       = aws_lambda_function_url.rag_query.function_url
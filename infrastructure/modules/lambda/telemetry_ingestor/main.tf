@@ -240,6 +240,7 @@ resource "aws_lambda_function" "ingestor" {
       LOG_LEVEL              = var.environment == "prod" ? "INFO" : "DEBUG"
       HAZARD_GEOHASH_INDEX   = var.geohash_index_name
       HAZARD_GEOHASH_KEY     = "geohash"
+      ENABLE_SENSOR_REGISTRY = "true"
     }
   }
 
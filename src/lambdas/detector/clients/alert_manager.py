@@ -10,9 +10,10 @@ Handles alert lifecycle:
 
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, Optional
 from decimal import Decimal
+from typing import Any, Dict, Iterable, Optional
 
 from aws_lambda_powertools import Logger
 
@@ -84,33 +85,81 @@ class AlertManager:
         self.sns_topic_arn = sns_topic_arn
         logger.info("Initialized AlertManager", extra={"table": alerts_table_name})
 
-    def get_active_alert(self, alert_id_prefix: str) -> Optional[Dict]:
+    # Parallel DetectionIndex queries when deduplicating a run's detections
+    MAX_LOOKUP_WORKERS = 16
+
+    def _query_active_alert(self, detection_id: str) -> Optional[Dict]:
+        """
+        Newest active alert for a detection from DetectionIndex (raises on
+        query failure).
+        """
+        kwargs = {
+            "IndexName": "DetectionIndex",
+            "KeyConditionExpression": "detection_id = :detection_id",
+            "FilterExpression": "#status = :status",
+            "ExpressionAttributeNames": {"#status": "status"},
+            "ExpressionAttributeValues": {
+                ":detection_id": detection_id,
+                ":status": "active",
+            },
+            "ScanIndexForward": False,
+        }
+        while True:
+            response = self.table.query(**kwargs)
+            if response.get("Items"):
+                return response["Items"][0]
+            if "LastEvaluatedKey" not in response:
+                return None
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def get_active_alert(self, detection_id: str) -> Optional[Dict]:
         try:
-            response = self.table.query(
-                IndexName="StatusIndex",
-                KeyConditionExpression="#status = :status",
-                FilterExpression="begins_with(alert_id, :prefix)",
-                ExpressionAttributeNames={"#status": "status"},
-                ExpressionAttributeValues={
-                    ":status": "active",
-                    ":prefix": alert_id_prefix,
-                },
-                ScanIndexForward=False,
-                Limit=1,
+            alert = self._query_active_alert(detection_id)
+        except Exception:
+            logger.exception(
+                "Failed to query active alerts", extra={"detection_id": detection_id}
             )
-            if response.get("Items"):
-                alert = response["Items"][0]
-                logger.info(
-                    "Found active alert", extra={"alert_id": alert.get("alert_id")}
-                )
-                return alert
             return None
+
+        if alert:
+            logger.info("Found active alert", extra={"alert_id": alert.get("alert_id")})
+        return alert
+
+    def get_active_alerts(self, detection_ids: Iterable[str]) -> Optional[Dict]:
+        """
+        Look up the active alert for many detections at once.
+
+        Alerts carry the detection_id they were raised for, so each detection
+        is a keyed DetectionIndex query; the queries run concurrently.
+
+        Args:
+            detection_ids: Detection IDs (sensor or CLUSTER_ IDs)
+
+        Returns:
+            Mapping of detection_id to its newest active alert (detections
+            without an active alert are omitted), or None if a query failed
+        """
+        ids = list(dict.fromkeys(detection_ids))
+        if not ids:
+            return {}
+
+        try:
+            workers = min(self.MAX_LOOKUP_WORKERS, len(ids))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                found = list(executor.map(self._query_active_alert, ids))
         except Exception:
             logger.exception(
-                "Failed to query active alerts", extra={"prefix": alert_id_prefix}
+                "Failed to query active alerts", extra={"detections": len(ids)}
             )
             return None
 
+        alerts = {did: alert for did, alert in zip(ids, found) if alert}
+        logger.info(
+            "Fetched active alerts",
+            extra={"detections": len(ids), "matched": len(alerts)},
+        )
+        return alerts
+
     def create_alert(
         self,
         alert_id_prefix: str,
@@ -178,10 +227,13 @@ class AlertManager:
 
         alert = {
             "alert_id": alert_id,
+            # Deduplication key (DetectionIndex)
+            "detection_id": alert_id_prefix,
             "created_at": timestamp,
             "updated_at": timestamp,
             "status": "active",
             "risk_level": llm_assessment["risk_level"],
+            "risk_level_num": self.RISK_HIERARCHY.get(llm_assessment["risk_level"]),
             "confidence": llm_assessment["confidence"],
             "llm_reasoning": llm_assessment.get("reasoning"),
             "trigger_factors": llm_assessment.get("trigger_factors", []),
@@ -282,6 +334,7 @@ class AlertManager:
             UpdateExpression="""
                 SET updated_at = :timestamp,
                     risk_level = :new_level,
+                    risk_level_num = :new_level_num,
                     confidence = :confidence,
                     llm_reasoning = :reasoning,
                     recommended_action = :action,
@@ -290,6 +343,7 @@ class AlertManager:
             ExpressionAttributeValues={
                 ":timestamp": timestamp,
                 ":new_level": new_level,
+                ":new_level_num": self.RISK_HIERARCHY.get(new_level),
                 ":confidence": new_assessment["confidence"],
                 ":reasoning": new_assessment["reasoning"],
                 ":action": new_assessment["recommended_action"],
@@ -302,6 +356,7 @@ class AlertManager:
             {
                 "updated_at": timestamp,
                 "risk_level": new_level,
+                "risk_level_num": self.RISK_HIERARCHY.get(new_level),
                 "confidence": new_assessment["confidence"],
                 "llm_reasoning": new_assessment["reasoning"],
                 "recommended_action": new_assessment["recommended_action"],
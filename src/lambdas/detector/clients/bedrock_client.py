@@ -7,18 +7,20 @@ Functions:
 - Adds throttling backoff + retries.
 """
 
+import asyncio
 import json
 import os
 import random
 import time
-from typing import Dict, Optional, List
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
 
 import boto3
+from aws_lambda_powertools import Logger
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
-from aws_lambda_powertools import Logger
-
 logger = Logger(child=True)
 
 
@@ -91,6 +93,10 @@ OUTPUT FORMAT (JSON only, no markdown):
   "references": ["Aranayake 2016|Meeriyabedda 2014|NBRO threshold|other"]
 }}"""
 
+    JSON_ONLY_SUFFIX = (
+        "\n\nIMPORTANT: Return ONLY valid JSON. No extra keys, no prose outside JSON."
+    )
+
     NARRATIVE_TEMPLATE = """Generate an urgent evacuation alert for local disaster management officials and affected communities.
 
 CONTEXT:
@@ -129,18 +135,38 @@ Keep it concise and actionable."""
         self.model_id = model_id or self.DEFAULT_MODEL_ID
         self.region_name = region_name or self.DEFAULT_REGION
 
-        # Standard retry config (covers some transient errors)
+        # Standard retry config (covers some transient errors); pool sized
+        # for concurrent detections
         cfg = Config(
             region_name=self.region_name,
             retries={
                 "max_attempts": int(os.environ.get("BEDROCK_BOTO_RETRIES", "5")),
                 "mode": "standard",
             },
+            max_pool_connections=int(os.environ.get("BOTO_MAX_POOL", "64")),
+            tcp_keepalive=True,
         )
 
         self.client = boto3.client(
             "bedrock-runtime", region_name=self.region_name, config=cfg
         )
+
+        # Batch inference (optional): needs an S3 bucket and a Bedrock service role
+        self.batch_bucket = os.environ.get("BEDROCK_BATCH_BUCKET", "")
+        self.batch_role_arn = os.environ.get("BEDROCK_BATCH_ROLE_ARN", "")
+        self.batch_min_records = int(os.environ.get("BEDROCK_BATCH_MIN_RECORDS", "100"))
+        self.batch_timeout_sec = float(
+            os.environ.get("BEDROCK_BATCH_TIMEOUT_SEC", "240")
+        )
+        self.batch_poll_sec = float(os.environ.get("BEDROCK_BATCH_POLL_SEC", "10"))
+        # Invocation time kept back for real-time calls if the job is not done
+        self.batch_reserve_sec = float(
+            os.environ.get("BEDROCK_BATCH_RESERVE_SEC", "120")
+        )
+        self._batch_cfg = cfg
+        self._control_client = None
+        self._s3_client = None
+
         logger.info(
             "Initialized BedrockClient",
             extra={"model_id": self.model_id, "region": self.region_name},
@@ -159,6 +185,85 @@ Keep it concise and actionable."""
         prompt = self._build_risk_assessment_prompt(detection_input)
         response_text = await self._invoke_bedrock(prompt, expect_json=True)
 
+        return self._parse_assessment(response_text)
+
+    def batch_available(self, num_records: int) -> bool:
+        """
+        Whether assess_risk_batch would submit a batch inference job.
+
+        Batch jobs need a configured bucket/role and enough records to meet
+        the Bedrock per-job minimum; below that, real-time calls are used.
+        """
+        return (
+            bool(self.batch_bucket and self.batch_role_arn)
+            and num_records >= self.batch_min_records
+        )
+
+    def batch_wait_budget(self, remaining_sec: Optional[float] = None) -> float:
+        """
+        Seconds a batch job may be waited for.
+
+        BEDROCK_BATCH_TIMEOUT_SEC, capped so that BEDROCK_BATCH_RESERVE_SEC
+        of the invocation's remaining time is left for the real-time
+        fallback. Zero when that leaves less than one poll interval.
+        """
+        budget = self.batch_timeout_sec
+        if remaining_sec is not None:
+            budget = min(budget, remaining_sec - self.batch_reserve_sec)
+        return budget if budget >= self.batch_poll_sec else 0.0
+
+    async def assess_risk_batch(
+        self, detection_inputs: List[Dict], remaining_sec: Optional[float] = None
+    ) -> List[Optional[Dict]]:
+        """
+        Assess many detections with one Bedrock batch inference job.
+
+        Args:
+            detection_inputs: Inputs as passed to assess_risk
+            remaining_sec: Time left in the invocation (caps the job wait)
+
+        Returns:
+            Assessments in input order. None where no batch result is
+            available (batch disabled, no time to wait, job failed/timed
+            out, or the record errored); callers fall back to assess_risk
+            for those.
+        """
+        results: List[Optional[Dict]] = [None] * len(detection_inputs)
+        if not self.batch_available(len(detection_inputs)):
+            return results
+
+        wait_sec = self.batch_wait_budget(remaining_sec)
+        if not wait_sec:
+            logger.warning(
+                "Too little time left to wait for a Bedrock batch job",
+                extra={"remaining_sec": remaining_sec},
+            )
+            return results
+
+        try:
+            outputs = await asyncio.to_thread(
+                self._run_batch_job, detection_inputs, wait_sec
+            )
+        except Exception:
+            logger.exception("Bedrock batch inference failed; using real-time calls")
+            return results
+
+        for i, text in outputs.items():
+            try:
+                results[i] = self._parse_assessment(text)
+            except ValueError:
+                pass  # Falls back to a real-time assess_risk call
+
+        logger.info(
+            "Bedrock batch assessments received",
+            extra={
+                "records": len(detection_inputs),
+                "completed": sum(r is not None for r in results),
+            },
+        )
+        return results
+
+    def _parse_assessment(self, response_text: str) -> Dict:
         try:
             assessment = json.loads(response_text)
 
@@ -276,8 +381,6 @@ Keep it concise and actionable."""
     def _build_narrative_prompt(
         self, risk_assessment: Dict, detection_data: Dict, rag_context: Dict
     ) -> str:
-        from datetime import datetime
-
         loc = detection_data.get("location") or {}
         loc_label = loc.get("location_label") or loc.get("label")
 
@@ -324,6 +427,121 @@ Keep it concise and actionable."""
             "[Current timestamp]", datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")
         )
 
+    def _run_batch_job(
+        self, detection_inputs: List[Dict], wait_sec: float
+    ) -> Dict[int, str]:
+        """
+        Submit a batch inference job and wait for it (blocking).
+
+        Writes {recordId, modelInput} JSONL to S3, runs
+        CreateModelInvocationJob and polls until it finishes or wait_sec
+        elapses (the job is then stopped).
+
+        Returns:
+            Input index -> response text, for records that succeeded
+        """
+        if self._control_client is None:
+            self._control_client = boto3.client(
+                "bedrock", region_name=self.region_name, config=self._batch_cfg
+            )
+            self._s3_client = boto3.client("s3", region_name=self.region_name)
+
+        job_name = f"openlews-assess-{uuid.uuid4().hex[:12]}"
+        prefix = f"batch/{job_name}"
+        input_key = f"{prefix}/input/records.jsonl"
+
+        inference = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": int(os.environ.get("BEDROCK_MAX_TOKENS", "2000")),
+            "temperature": float(os.environ.get("BEDROCK_TEMPERATURE", "0.3")),
+            "top_p": float(os.environ.get("BEDROCK_TOP_P", "0.9")),
+            "system": self.SYSTEM_PROMPT,
+        }
+
+        lines = []
+        for i, detection_input in enumerate(detection_inputs):
+            prompt = self._build_risk_assessment_prompt(detection_input)
+            message = {
+                "role": "user",
+                "content": [{"type": "text", "text": prompt + self.JSON_ONLY_SUFFIX}],
+            }
+            record = {
+                "recordId": f"REC{i:08d}",
+                "modelInput": {**inference, "messages": [message]},
+            }
+            lines.append(json.dumps(record, default=str))
+
+        self._s3_client.put_object(
+            Bucket=self.batch_bucket,
+            Key=input_key,
+            Body="\n".join(lines).encode("utf-8"),
+        )
+
+        job_arn = self._control_client.create_model_invocation_job(
+            jobName=job_name,
+            roleArn=self.batch_role_arn,
+            modelId=self.model_id,
+            inputDataConfig={
+                "s3InputDataConfig": {
+                    "s3Uri": f"s3://{self.batch_bucket}/{input_key}",
+                    "s3InputFormat": "JSONL",
+                }
+            },
+            outputDataConfig={
+                "s3OutputDataConfig": {
+                    "s3Uri": f"s3://{self.batch_bucket}/{prefix}/output/"
+                }
+            },
+        )["jobArn"]
+
+        logger.info(
+            "Submitted Bedrock batch job",
+            extra={"job_arn": job_arn, "records": len(detection_inputs)},
+        )
+
+        deadline = time.monotonic() + wait_sec
+        while True:
+            status = self._control_client.get_model_invocation_job(
+                jobIdentifier=job_arn
+            )["status"]
+            if status in ("Completed", "PartiallyCompleted"):
+                break
+            if status in ("Failed", "Stopped", "Expired"):
+                raise RuntimeError(f"Bedrock batch job {job_arn} ended as {status}")
+            if time.monotonic() >= deadline:
+                self._control_client.stop_model_invocation_job(jobIdentifier=job_arn)
+                raise TimeoutError(f"Bedrock batch job {job_arn} still {status}")
+            time.sleep(min(self.batch_poll_sec, max(0.0, deadline - time.monotonic())))
+
+        # Output lands under <output prefix>/<job id>/<input file>.out
+        job_id = job_arn.rsplit("/", 1)[-1]
+        obj = self._s3_client.get_object(
+            Bucket=self.batch_bucket,
+            Key=f"{prefix}/output/{job_id}/records.jsonl.out",
+        )
+
+        outputs: Dict[int, str] = {}
+        for line in obj["Body"].iter_lines():
+            if not line:
+                continue
+            record = json.loads(line)
+            model_output = record.get("modelOutput")
+            if not model_output:
+                logger.warning(
+                    "Bedrock batch record failed",
+                    extra={
+                        "record_id": record.get("recordId"),
+                        "error": record.get("error"),
+                    },
+                )
+                continue
+            text = "".join(
+                block.get("text", "") for block in model_output.get("content", [])
+            )
+            outputs[int(record["recordId"][3:])] = text.strip()
+
+        return outputs
+
     async def _invoke_bedrock(self, user_prompt: str, expect_json: bool) -> str:
         """
         Calls Bedrock using the Converse API.
@@ -334,10 +552,7 @@ Keep it concise and actionable."""
         top_p = float(os.environ.get("BEDROCK_TOP_P", "0.9"))
 
         if expect_json:
-            user_prompt = (
-                user_prompt
-                + "\n\nIMPORTANT: Return ONLY valid JSON. No extra keys, no prose outside JSON."
-            )
+            user_prompt = user_prompt + self.JSON_ONLY_SUFFIX
 
         messages = [{"role": "user", "content": [{"text": user_prompt}]}]
         system_prompts = [{"text": self.SYSTEM_PROMPT}]
@@ -356,7 +571,10 @@ Keep it concise and actionable."""
 
         for attempt in range(1, max_attempts + 1):
             try:
-                resp = self.client.converse(
+                # Run the blocking call off the event loop so concurrent
+                # detections overlap their Bedrock round-trips
+                resp = await asyncio.to_thread(
+                    self.client.converse,
                     modelId=self.model_id,
                     messages=messages,
                     system=system_prompts,
@@ -408,7 +626,7 @@ Keep it concise and actionable."""
                     raise
 
                 sleep_s = (base_sleep * (2 ** (attempt - 1))) + random.uniform(0, 0.25)
-                time.sleep(min(sleep_s, 10.0))
+                await asyncio.sleep(min(sleep_s, 10.0))
 
             except Exception as e:
                 last_err = e
@@ -419,7 +637,7 @@ Keep it concise and actionable."""
                 if attempt == max_attempts:
                     raise
                 sleep_s = (base_sleep * (2 ** (attempt - 1))) + random.uniform(0, 0.25)
-                time.sleep(min(sleep_s, 10.0))
+                await asyncio.sleep(min(sleep_s, 10.0))
 
         raise RuntimeError(
             f"Bedrock invocation failed after {max_attempts} attempts: {last_err}"
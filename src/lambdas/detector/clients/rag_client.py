@@ -5,12 +5,66 @@ Invokes the RAG Query Lambda to retrieve geological context
 from NSDI hazard zones for sensor locations.
 """
 
-import json
-from typing import Dict
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import orjson
 from aws_lambda_powertools import Logger
 
 logger = Logger(child=True)
 
+# Upper bound on concurrent RAG invocations from query_nearest_batch
+MAX_BATCH_WORKERS = 64
+
+# Locations kept per container (least recently used evicted first)
+CACHE_MAX_ENTRIES = 4096
+
+
+@lru_cache(maxsize=64)
+def _estimate_critical_moisture(hazard_level: str, soil_type: str) -> float:
+    """
+    Estimate critical moisture threshold based on hazard level and soil type.
+
+    This is a simplified heuristic. In production, this would come from
+    soil water characteristic curves (SWCC) in the RAG database.
+
+    Pure lookup over (hazard_level, soil_type), so results are cached.
+
+    Args:
+        hazard_level: NSDI hazard level
+        soil_type: Soil classification
+
+    Returns:
+        Estimated critical moisture (%)
+    """
+    base_thresholds = {
+        "Colluvium": 35,  # Loose, unstable
+        "Residual": 45,  # More stable
+        "Fill": 30,  # Very unstable
+        "Bedrock": 60,  # Very stable
+    }
+
+    base = base_thresholds.get(soil_type, 40)
+
+    # Adjust by hazard level
+    adjustments = {
+        "Very High": -5,  # Lower threshold (more sensitive)
+        "High": -2,
+        "Moderate": 0,
+        "Low": +5,
+        "Very Low": +10,
+    }
+
+    adjustment = adjustments.get(hazard_level, 0)
+
+    critical = max(25, min(65, base + adjustment))  # Clamp to 25-65%
+
+    return float(critical)
+
 
 class RAGClient:
     """
@@ -23,12 +77,32 @@ class RAGClient:
 
         Args:
             lambda_client: boto3 Lambda client
-            rag_lambda_arn: ARN of RAG Query Lambda
+            rag_lambda_arn: Qualified ARN of RAG Query Lambda
+                (arn:...:function:<name>:<alias>)
         """
+        # An unqualified ARN still works but bypasses the provisioned
+        # concurrency alias, so RAG cold starts come back: warn, don't fail
+        # the detector at import time
+        _, _, qualified_name = rag_lambda_arn.partition("function:")
+        function_name, sep, alias = qualified_name.partition(":")
+        if not sep or not alias:
+            logger.warning(
+                f"RAG Lambda ARN is not qualified with an alias, invoking "
+                f"$LATEST without provisioned concurrency: {rag_lambda_arn}"
+            )
+            alias = "$LATEST"
+
         self.lambda_client = lambda_client
         self.rag_lambda_arn = rag_lambda_arn
 
-        logger.info(f"Initialized RAGClient for Lambda: {rag_lambda_arn}")
+        # Single-flight LRU cache of successful lookups per exact location,
+        # shared by async callers and batch worker threads
+        self._cache: "OrderedDict[Tuple[float, float], Future]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        logger.info(
+            f"Initialized RAGClient for Lambda: {function_name} (alias: {alias})"
+        )
 
     async def query_nearest(self, latitude: float, longitude: float) -> Dict:
         """
@@ -41,27 +115,103 @@ class RAGClient:
         Returns:
             Geological context dictionary
         """
+        return await asyncio.to_thread(self._query_coalesced, latitude, longitude)
+
+    def query_nearest_batch(self, points: List[Tuple[float, float]]) -> List[Dict]:
+        """
+        Query nearest hazard zones for many locations in parallel.
+
+        Invocations fan out over a thread pool (boto3 clients are
+        thread-safe for invoke), so total latency is close to the slowest
+        single query instead of the sum.
+
+        Args:
+            points: (latitude, longitude) pairs
+
+        Returns:
+            Geological context dictionaries, in the same order as points
+        """
+        if not points:
+            return []
+
+        workers = min(MAX_BATCH_WORKERS, len(points))
+        logger.info(f"Querying RAG for {len(points)} locations ({workers} workers)")
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda p: self._query_coalesced(*p), points))
+
+    def _query_coalesced(self, latitude: float, longitude: float) -> Dict:
+        """
+        Look up a location, sharing one RAG invocation per exact location.
+
+        Concurrent callers for the same location wait on the first caller's
+        invocation. Successful contexts stay cached (geology does not
+        change) up to CACHE_MAX_ENTRIES locations; failures are not cached.
+        """
+        # Exact coordinates: the context's distance_m is relative to the
+        # queried point, so it cannot be reused for a nearby one
+        key = (float(latitude), float(longitude))
+
+        with self._cache_lock:
+            future = self._cache.get(key)
+            owner = future is None
+            if owner:
+                future = self._cache[key] = Future()
+                while len(self._cache) > CACHE_MAX_ENTRIES:
+                    self._cache.popitem(last=False)
+            else:
+                self._cache.move_to_end(key)
+
+        if not owner:
+            context = future.result()
+            return dict(context) if context else self._get_default_context()
+
+        # Always resolve the future (waiters would otherwise block forever)
+        # and drop failed lookups so the next caller retries
+        context = None
+        try:
+            context = self._invoke_nearest(latitude, longitude)
+        finally:
+            if context is None:
+                with self._cache_lock:
+                    if self._cache.get(key) is future:
+                        del self._cache[key]
+            future.set_result(context)
+
+        return dict(context) if context else self._get_default_context()
+
+    def _invoke_nearest(self, latitude: float, longitude: float) -> Optional[Dict]:
+        """
+        Invoke the RAG Lambda for a single location (blocking).
+
+        Never raises; returns None when no context could be retrieved.
+        """
         logger.info(f"Querying RAG for location ({latitude:.4f}, {longitude:.4f})")
 
-        payload = {"action": "nearest", "latitude": latitude, "longitude": longitude}
+        # envelope=False: RAG returns the result dict directly (no HTTP proxy body)
+        payload = {
+            "action": "nearest",
+            "latitude": latitude,
+            "longitude": longitude,
+            "envelope": False,
+        }
 
         try:
             response = self.lambda_client.invoke(
                 FunctionName=self.rag_lambda_arn,
                 InvocationType="RequestResponse",
-                Payload=json.dumps(payload),
+                Payload=orjson.dumps(payload),
             )
 
-            response_payload = json.loads(response["Payload"].read())
+            body = orjson.loads(response["Payload"].read())
 
             if response.get("FunctionError"):
-                logger.error(f"RAG Lambda error: {response_payload}")
-                return self._get_default_context()
+                logger.error(f"RAG Lambda error: {body}")
+                return None
 
-            if "body" in response_payload:
-                body = json.loads(response_payload["body"])
-            else:
-                body = response_payload
+            # Older RAG deployments always wrap the result in a proxy envelope
+            if isinstance(body.get("body"), str):
+                body = orjson.loads(body["body"])
 
             if "nearest_zone" in body:
                 zone = body["nearest_zone"]
@@ -85,49 +235,19 @@ class RAGClient:
                 return context
             else:
                 logger.warning("No hazard zone found in RAG response")
-                return self._get_default_context()
+                return None
 
         except Exception:
             logger.exception("Failed to query RAG Lambda")
-            return self._get_default_context()
+            return None
 
     def _estimate_critical_moisture(self, hazard_level: str, soil_type: str) -> float:
         """
         Estimate critical moisture threshold based on hazard level and soil type.
 
-        This is a simplified heuristic. In production, this would come from
-        soil water characteristic curves (SWCC) in the RAG database.
-
-        Args:
-            hazard_level: NSDI hazard level
-            soil_type: Soil classification
-
-        Returns:
-            Estimated critical moisture (%)
+        See _estimate_critical_moisture (module level, cached).
         """
-        base_thresholds = {
-            "Colluvium": 35,  # Loose, unstable
-            "Residual": 45,  # More stable
-            "Fill": 30,  # Very unstable
-            "Bedrock": 60,  # Very stable
-        }
-
-        base = base_thresholds.get(soil_type, 40)
-
-        # Adjust by hazard level
-        adjustments = {
-            "Very High": -5,  # Lower threshold (more sensitive)
-            "High": -2,
-            "Moderate": 0,
-            "Low": +5,
-            "Very Low": +10,
-        }
-
-        adjustment = adjustments.get(hazard_level, 0)
-
-        critical = max(25, min(65, base + adjustment))  # Clamp to 25-65%
-
-        return float(critical)
+        return _estimate_critical_moisture(hazard_level, soil_type)
 
     def _get_default_context(self) -> Dict:
         """
@@ -11,9 +11,18 @@ References:
 """
 
 import math
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 from aws_lambda_powertools import Logger
 
+try:
+    from scipy.spatial import cKDTree
+
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
 logger = Logger(child=True)
 
 
@@ -22,6 +31,9 @@ class FusionAlgorithm:
     Implements multi-sensor fusion and spatial correlation analysis.
     """
 
+    # Stateless: configuration lives in class constants, no instance __dict__
+    __slots__ = ()
+
     # Quincunx grid spacing (meters)
     SENSOR_SPACING_M = 20.0
 
@@ -31,6 +43,12 @@ class FusionAlgorithm:
     # Cluster detection parameters
     MIN_CLUSTER_SIZE = 3  # Minimum sensors for cluster
     CLUSTER_RADIUS_M = 50.0
+    CLUSTER_RISK_THRESHOLD = 0.6  # Minimum composite risk for cluster members
+
+    EARTH_RADIUS_M = 6371000.0
+
+    # Rows per block in the scipy-free pair search (bounds its memory)
+    PAIR_BLOCK_ROWS = 256
 
     def __init__(self):
         logger.info(
@@ -46,6 +64,7 @@ class FusionAlgorithm:
         sensor_id: str,
         sensor_risks: Dict[str, Dict],
         telemetry_data: Dict[str, List[Dict]],
+        adjacency: Optional[Dict[str, List[str]]] = None,
     ) -> float:
         """
         Calculate spatial correlation: do nearby sensors agree on risk?
@@ -59,6 +78,9 @@ class FusionAlgorithm:
             sensor_id: Target sensor
             sensor_risks: Risk scores for all sensors
             telemetry_data: Full telemetry dataset
+            adjacency: Optional prebuilt neighbour graph (see
+                build_neighbour_graph). When omitted, neighbours are
+                searched directly in telemetry_data.
 
         Returns:
             Correlation score (0.0 to 1.0)
@@ -74,9 +96,16 @@ class FusionAlgorithm:
         sensor_risk = sensor_risks[sensor_id]["risk_score"]
 
         # Find neighbours
-        neighbours = self._find_neighbours(
-            sensor_lat, sensor_lon, sensor_id, telemetry_data, self.CORRELATION_RADIUS_M
-        )
+        if adjacency is not None:
+            neighbours = adjacency.get(sensor_id, [])
+        else:
+            neighbours = self._find_neighbours(
+                sensor_lat,
+                sensor_lon,
+                sensor_id,
+                telemetry_data,
+                self.CORRELATION_RADIUS_M,
+            )
 
         if len(neighbours) < 2:
             logger.debug(f"Sensor {sensor_id} has insufficient neighbours")
@@ -147,8 +176,73 @@ class FusionAlgorithm:
 
         return composite
 
+    def calculate_spatial_correlation_batch(
+        self,
+        lats: np.ndarray,
+        lons: np.ndarray,
+        risks: np.ndarray,
+        radius_m: Optional[float] = None,
+    ) -> np.ndarray:
+        """
+        Spatial correlation for every sensor from coordinate/risk arrays.
+
+        Vectorised counterpart of calculate_spatial_correlation for callers
+        without a prebuilt neighbour graph.
+
+        Args:
+            lats: Sensor latitudes
+            lons: Sensor longitudes
+            risks: Individual risk scores
+            radius_m: Neighbourhood radius (default CORRELATION_RADIUS_M)
+
+        Returns:
+            Correlation scores (0.0 to 1.0), one per sensor
+        """
+        radius_m = self.CORRELATION_RADIUS_M if radius_m is None else radius_m
+        risks = np.asarray(risks, dtype=np.float64)
+
+        pair_i, pair_j = self._pairs_within_radius(lats, lons, radius_m)
+        src = np.concatenate((pair_i, pair_j))
+        dst = np.concatenate((pair_j, pair_i))
+        degree = np.bincount(src, minlength=len(risks))
+
+        return self._correlations_from_edges(risks, src, dst, degree)
+
+    @staticmethod
+    def calculate_composite_risk_batch(
+        risks: np.ndarray, correlations: np.ndarray
+    ) -> np.ndarray:
+        """
+        Vectorised calculate_composite_risk (same bands and multipliers).
+        """
+        return np.select(
+            [correlations > 0.6, correlations < 0.3],
+            [np.minimum(1.0, risks * 1.3), risks * 0.5],
+            default=risks,
+        )
+
+    @staticmethod
+    def _correlations_from_edges(
+        risks: np.ndarray, src: np.ndarray, dst: np.ndarray, degree: np.ndarray
+    ) -> np.ndarray:
+        # Agreement definition: both high OR both low. Bucket every sensor
+        # once instead of re-comparing both ends of every edge.
+        high = risks > 0.5
+        low = risks < 0.3
+        agree = (high[src] & high[dst]) | (low[src] & low[dst])
+        agreeing = np.bincount(src, weights=agree, minlength=len(risks))
+
+        # Fewer than 2 neighbours: not enough evidence, correlation 0
+        correlations = np.zeros(len(risks), dtype=np.float64)
+        enough = degree >= 2
+        correlations[enough] = agreeing[enough] / degree[enough]
+        return correlations
+
     def detect_clusters(
-        self, sensor_risks: Dict[str, Dict], telemetry_data: Dict[str, List[Dict]]
+        self,
+        sensor_risks: Dict[str, Dict],
+        telemetry_data: Dict[str, List[Dict]],
+        adjacency: Optional[Dict[str, List[str]]] = None,
     ) -> List[Dict]:
         """
         Detect clusters of 3+ sensors showing high risk.
@@ -159,6 +253,9 @@ class FusionAlgorithm:
         Args:
             sensor_risks: Risk scores for all sensors
             telemetry_data: Full telemetry dataset
+            adjacency: Optional prebuilt neighbour graph (built with
+                CLUSTER_RADIUS_M). When omitted, a graph over the high-risk
+                sensors only is built once from their latest locations.
 
         Returns:
             List of cluster descriptions
@@ -166,22 +263,43 @@ class FusionAlgorithm:
         clusters = []
         processed_sensors = set()
 
-        # Sort sensors by composite risk (highest first)
-        sorted_sensors = sorted(
-            sensor_risks.items(),
-            key=lambda x: x[1].get("composite_risk", 0),
+        # Only high-risk sensors can seed a cluster; filter before sorting so
+        # the sort covers the few candidates rather than every sensor
+        candidates = sorted(
+            (
+                (sid, d)
+                for sid, d in sensor_risks.items()
+                if d.get("composite_risk", 0) >= self.CLUSTER_RISK_THRESHOLD
+            ),
+            key=lambda x: x[1]["composite_risk"],
             reverse=True,
         )
 
-        for sensor_id, data in sorted_sensors:
+        # Every member must be high-risk: too few candidates means no cluster,
+        # without any spatial work
+        if len(candidates) < self.MIN_CLUSTER_SIZE:
+            return clusters
+
+        # Cluster members are all high-risk, so low-risk sensors never need
+        # to enter the spatial index
+        if adjacency is None:
+            candidate_ids = {sid for sid, _ in candidates}
+            adjacency = self.build_neighbour_graph(
+                self.build_location_cache(
+                    {
+                        sid: records
+                        for sid, records in telemetry_data.items()
+                        if sid in candidate_ids
+                    }
+                ),
+                self.CLUSTER_RADIUS_M,
+            )
+
+        for sensor_id, data in candidates:
             # Skip if already in a cluster
             if sensor_id in processed_sensors:
                 continue
 
-            # Only consider high-risk sensors
-            if data.get("composite_risk", 0) < 0.6:
-                continue
-
             # Skip if no location data
             if sensor_id not in telemetry_data or not telemetry_data[sensor_id]:
                 continue
@@ -192,15 +310,13 @@ class FusionAlgorithm:
             sensor_lon = sensor_location["longitude"]
 
             # Find high-risk neighbours
-            high_risk_neighbours = self._find_high_risk_neighbours(
-                sensor_lat,
-                sensor_lon,
-                sensor_id,
-                sensor_risks,
-                telemetry_data,
-                self.CLUSTER_RADIUS_M,
-                risk_threshold=0.6,
-            )
+            high_risk_neighbours = [
+                sid
+                for sid in adjacency.get(sensor_id, [])
+                if sid in sensor_risks
+                and sensor_risks[sid].get("composite_risk", 0)
+                >= self.CLUSTER_RISK_THRESHOLD
+            ]
 
             # Cluster needs at least 3 sensors total (center + 2 neighbours)
             if len(high_risk_neighbours) >= 2:
@@ -237,82 +353,225 @@ class FusionAlgorithm:
 
         return clusters
 
-    def _find_neighbours(
-        self,
-        lat: float,
-        lon: float,
-        exclude_sensor: str,
+    @staticmethod
+    def build_location_cache(
         telemetry_data: Dict[str, List[Dict]],
-        radius_m: float,
-    ) -> List[str]:
+    ) -> Dict[str, Tuple[float, float]]:
         """
-        Find all sensors within radius of a point.
+        Collect the latest (lat, lon) of every sensor with telemetry.
 
         Args:
-            lat: Target latitude
-            lon: Target longitude
-            exclude_sensor: Sensor ID to exclude (usually self)
             telemetry_data: Full telemetry dataset
-            radius_m: Search radius in meters
 
         Returns:
-            List of sensor IDs within radius
+            Mapping of sensor_id to (latitude, longitude)
         """
-        neighbours = []
+        return {
+            sensor_id: (
+                float(records[-1]["latitude"]),
+                float(records[-1]["longitude"]),
+            )
+            for sensor_id, records in telemetry_data.items()
+            if records
+        }
 
-        for sensor_id, records in telemetry_data.items():
-            if sensor_id == exclude_sensor or not records:
-                continue
+    def build_neighbour_graph(
+        self, location_cache: Dict[str, Tuple[float, float]], radius_m: float
+    ) -> Dict[str, List[str]]:
+        """
+        Build the full neighbour graph for a set of sensor locations.
 
-            # Get latest location
-            sensor_lat = records[-1]["latitude"]
-            sensor_lon = records[-1]["longitude"]
+        Sensor positions are fixed for a pipeline run, so the graph is computed
+        once and shared by spatial correlation and cluster detection instead of
+        each of them searching neighbourhoods pair by pair.
 
-            # Calculate distance
-            distance = self._haversine_distance(lat, lon, sensor_lat, sensor_lon)
+        Args:
+            location_cache: Mapping of sensor_id to (latitude, longitude)
+            radius_m: Neighbourhood radius in meters
 
-            if distance <= radius_m:
-                neighbours.append(sensor_id)
+        Returns:
+            Mapping of sensor_id to the IDs of sensors within radius (excluding itself)
+        """
+        sensor_ids = list(location_cache)
+        if not sensor_ids:
+            return {}
 
-        return neighbours
+        coords = np.array([location_cache[sid] for sid in sensor_ids], dtype=float)
+        return self._neighbour_graph(sensor_ids, coords[:, 0], coords[:, 1], radius_m)
 
-    def _find_high_risk_neighbours(
+    def _neighbour_graph(
+        self,
+        sensor_ids: List[str],
+        lats: np.ndarray,
+        lons: np.ndarray,
+        radius_m: float,
+    ) -> Dict[str, List[str]]:
+        # Each unordered pair is tested once and mirrored into both lists
+        pair_i, pair_j = self._pairs_within_radius(lats, lons, radius_m)
+
+        adjacency: Dict[str, List[str]] = {sensor_id: [] for sensor_id in sensor_ids}
+        for i, j in zip(pair_i.tolist(), pair_j.tolist()):
+            adjacency[sensor_ids[i]].append(sensor_ids[j])
+            adjacency[sensor_ids[j]].append(sensor_ids[i])
+
+        logger.debug(
+            "Neighbour graph built",
+            extra={
+                "sensors": len(sensor_ids),
+                "edges": len(pair_i),
+                "radius_m": radius_m,
+            },
+        )
+
+        return adjacency
+
+    @classmethod
+    def _pairs_within_radius(
+        cls, lats: np.ndarray, lons: np.ndarray, radius_m: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find all unordered sensor pairs within radius.
+
+        Uses a KD-tree when scipy is available. Otherwise sensors are sorted
+        by latitude and compared in blocks of PAIR_BLOCK_ROWS rows against
+        the later sensors within radius in latitude only, so memory is
+        bounded by the block size rather than growing as N x N.
+
+        Returns:
+            Row indices (i, j) with i < j, ordered by i then j
+        """
+        if SCIPY_AVAILABLE:
+            return cls._pairs_within_radius_kdtree(lats, lons, radius_m)
+
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        order = np.argsort(lats, kind="stable")
+        sorted_lats = lats[order]
+        sorted_lons = lons[order]
+        # No pair further apart than this in latitude can be within radius
+        lat_window = math.degrees(radius_m / cls.EARTH_RADIUS_M)
+
+        pair_i, pair_j = [], []
+        for start in range(0, len(order), cls.PAIR_BLOCK_ROWS):
+            stop = min(len(order), start + cls.PAIR_BLOCK_ROWS)
+            end = np.searchsorted(
+                sorted_lats, sorted_lats[stop - 1] + lat_window, side="right"
+            )
+            distances = cls._haversine_matrix(
+                sorted_lats[start:stop],
+                sorted_lons[start:stop],
+                sorted_lats[start:end],
+                sorted_lons[start:end],
+            )
+            rows, cols = np.nonzero(distances <= radius_m)
+            # Each pair once: only columns after the row in sorted order
+            later = cols > rows
+            pair_i.append(order[rows[later] + start])
+            pair_j.append(order[cols[later] + start])
+
+        if not pair_i:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty
+
+        i = np.concatenate(pair_i)
+        j = np.concatenate(pair_j)
+        i, j = np.minimum(i, j), np.maximum(i, j)
+        ordered = np.lexsort((j, i))
+        return i[ordered], j[ordered]
+
+    @classmethod
+    def _pairs_within_radius_kdtree(
+        cls, lats: np.ndarray, lons: np.ndarray, radius_m: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find all unordered sensor pairs within radius using a KD-tree.
+
+        Points are placed on the unit sphere so that the great-circle radius
+        maps exactly onto a straight-line (chord) radius.
+
+        Returns:
+            Row indices (i, j) with i < j, ordered by i then j
+        """
+        phi = np.radians(np.asarray(lats, dtype=float))
+        lam = np.radians(np.asarray(lons, dtype=float))
+        xyz = np.column_stack(
+            (np.cos(phi) * np.cos(lam), np.cos(phi) * np.sin(lam), np.sin(phi))
+        )
+
+        chord = 2 * math.sin(min(math.pi, radius_m / cls.EARTH_RADIUS_M) / 2)
+        pairs = cKDTree(xyz).query_pairs(r=chord, output_type="ndarray")
+        if len(pairs) == 0:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty
+
+        pairs = np.sort(pairs, axis=1)
+        pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+        return pairs[:, 0], pairs[:, 1]
+
+    def _find_neighbours(
         self,
         lat: float,
         lon: float,
         exclude_sensor: str,
-        sensor_risks: Dict[str, Dict],
         telemetry_data: Dict[str, List[Dict]],
         radius_m: float,
-        risk_threshold: float = 0.6,
     ) -> List[str]:
         """
-        Find high-risk sensors within radius.
+        Find all sensors within radius of a point.
 
         Args:
             lat: Target latitude
             lon: Target longitude
-            exclude_sensor: Sensor ID to exclude
-            sensor_risks: Risk scores for all sensors
+            exclude_sensor: Sensor ID to exclude (usually self)
             telemetry_data: Full telemetry dataset
             radius_m: Search radius in meters
-            risk_threshold: Minimum risk to include
 
         Returns:
-            List of high-risk sensor IDs within radius
+            List of sensor IDs within radius
         """
-        neighbours = self._find_neighbours(
-            lat, lon, exclude_sensor, telemetry_data, radius_m
-        )
+        locations = self.build_location_cache(telemetry_data)
+        locations.pop(exclude_sensor, None)
+        if not locations:
+            return []
+
+        sensor_ids = list(locations)
+        coords = np.array(list(locations.values()), dtype=float)
+        distances = self._haversine_matrix([lat], [lon], coords[:, 0], coords[:, 1])[0]
+
+        return [sensor_ids[i] for i in np.flatnonzero(distances <= radius_m)]
+
+    @classmethod
+    def _haversine_matrix(
+        cls,
+        lat_deg,
+        lon_deg,
+        lat2_deg=None,
+        lon2_deg=None,
+    ) -> np.ndarray:
+        """
+        Calculate pairwise Haversine distances with broadcasting.
 
-        high_risk_neighbours = [
-            sid
-            for sid in neighbours
-            if sid in sensor_risks
-            and sensor_risks[sid].get("composite_risk", 0) >= risk_threshold
-        ]
+        Args:
+            lat_deg, lon_deg: First set of points in degrees, shape (M,)
+            lat2_deg, lon2_deg: Second set of points in degrees, shape (N,)
+                (defaults to the first set)
 
-        return high_risk_neighbours
+        Returns:
+            Distances in meters, shape (M, N)
+        """
+        lat = np.radians(np.asarray(lat_deg, dtype=float))[:, None]
+        lon = np.radians(np.asarray(lon_deg, dtype=float))[:, None]
+        if lat2_deg is None:
+            lat2, lon2 = lat.T, lon.T
+        else:
+            lat2 = np.radians(np.asarray(lat2_deg, dtype=float))[None, :]
+            lon2 = np.radians(np.asarray(lon2_deg, dtype=float))[None, :]
+
+        a = (
+            np.sin((lat2 - lat) / 2) ** 2
+            + np.cos(lat) * np.cos(lat2) * np.sin((lon2 - lon) / 2) ** 2
+        )
+        return 2 * cls.EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
 
     @staticmethod
     def _haversine_distance(
@@ -339,7 +598,7 @@ class FusionAlgorithm:
             math.sin(delta_phi / 2) ** 2
             + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
         )
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+        c = 2 * math.asin(math.sqrt(min(1.0, a)))
 
         distance = R * c
         return distance
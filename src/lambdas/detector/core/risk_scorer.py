@@ -10,8 +10,11 @@ Implements the individual sensor risk calculation based on:
 Each sensor reading is scored 0.0 (safe) to 1.0 (critical failure).
 """
 
-from typing import Dict
+from typing import Any, Dict, Union
+
+import numpy as np
 from aws_lambda_powertools import Logger
+from core.telemetry import Telemetry
 
 logger = Logger(child=True)
 
@@ -42,6 +45,23 @@ class RiskScorer:
     SAFETY_FACTOR_WARNING = 1.2
     SAFETY_FACTOR_FAILURE = 1.0
 
+    # Moisture bands (fraction of the critical threshold)
+    MOISTURE_RATIO_DRY = 0.8
+    MOISTURE_RATIO_SATURATED = 1.2
+
+    # Pore pressure thresholds (kPa; negative = suction)
+    PORE_PRESSURE_SLIGHT = 5.0
+    PORE_PRESSURE_MODERATE = 10.0
+
+    # Band scores (lowest band first), shared by the per-reading _score_*
+    # methods and calculate_sensor_risk_batch
+    MOISTURE_SCORES = (0.0, 0.3, 0.6, 1.0)
+    TILT_SCORES = (0.0, 0.2, 0.7, 1.0)
+    VIBRATION_SCORES = (0.0, 0.3, 0.7, 1.0)
+    PORE_PRESSURE_SCORES = (0.0, 0.4, 0.7, 1.0)
+    SAFETY_FACTOR_SCORES = (0.0, 0.3, 0.7, 1.0)
+    RAINFALL_MULTIPLIERS = (1.0, 1.1, 1.2, 1.3, 1.5)
+
     # Component weights for composite score
     WEIGHTS = {
         "moisture": 0.35,
@@ -54,29 +74,34 @@ class RiskScorer:
     def __init__(self):
         logger.info("Initializing RiskScorer", extra={"weights": self.WEIGHTS})
 
-    def calculate_sensor_risk(self, telemetry: Dict) -> float:
+    def calculate_sensor_risk(self, telemetry: Union[Telemetry, Dict]) -> float:
         """
         Calculate composite risk score for a sensor.
 
         Args:
-            telemetry: Latest sensor reading
+            telemetry: Latest sensor reading (Telemetry, or a raw dict which is
+                parsed with Telemetry.from_dict)
 
         Returns:
             Risk score (0.0 to 1.0)
         """
+        t = (
+            telemetry
+            if isinstance(telemetry, Telemetry)
+            else Telemetry.from_dict(telemetry)
+        )
+
         # Extract readings
-        moisture = telemetry.get("moisture_percent", 0)
-        tilt_rate = telemetry.get("tilt_rate_mm_hr", 0)
-        vibration_count = telemetry.get("vibration_count", 0)
-        vibration_baseline = telemetry.get("vibration_baseline", 5)
-        pore_pressure = telemetry.get(
-            "pore_pressure_kpa", -10
-        )  # Default negative (suction)
-        safety_factor = telemetry.get("safety_factor", 2.0)
-        rainfall_24h = telemetry.get("rainfall_24h_mm", 0)
-
-        # Get critical moisture threshold from enrichment (if available)
-        critical_moisture = telemetry.get("critical_moisture_percent", 40.0)
+        moisture = t.moisture_percent
+        tilt_rate = t.tilt_rate_mm_hr
+        vibration_count = t.vibration_count
+        vibration_baseline = t.vibration_baseline
+        pore_pressure = t.pore_pressure_kpa
+        safety_factor = t.safety_factor
+        rainfall_24h = t.rainfall_24h_mm
+
+        # Critical moisture threshold from enrichment (defaults when unavailable)
+        critical_moisture = t.critical_moisture_percent
 
         # Calculate component scores
         moisture_score = self._score_moisture(moisture, critical_moisture)
@@ -99,7 +124,7 @@ class RiskScorer:
         composite_risk = min(1.0, composite_risk * rainfall_multiplier)
 
         logger.debug(
-            f"Risk calculated for {telemetry.get('sensor_id')}",
+            f"Risk calculated for {t.sensor_id}",
             extra={
                 "moisture_score": moisture_score,
                 "tilt_score": tilt_score,
@@ -113,6 +138,97 @@ class RiskScorer:
 
         return composite_risk
 
+    def calculate_sensor_risk_batch(self, arrays: Dict[str, Any]) -> np.ndarray:
+        """
+        Calculate composite risk scores for many sensors at once.
+
+        Vectorised equivalent of calculate_sensor_risk over column arrays
+        produced by utils.telemetry_arrays.telemetry_to_arrays.
+
+        Args:
+            arrays: Telemetry column arrays (one row per sensor)
+
+        Returns:
+            Risk scores (0.0 to 1.0), one per row
+        """
+        moisture = arrays["moisture_percent"]
+        critical = arrays["critical_moisture_percent"]
+        tilt_rate = arrays["tilt_rate_mm_hr"]
+        pore_pressure = arrays["pore_pressure_kpa"]
+        safety_factor = arrays["safety_factor"]
+        rainfall_24h = arrays["rainfall_24h_mm"]
+
+        baseline = np.where(
+            arrays["vibration_baseline"] == 0, 5.0, arrays["vibration_baseline"]
+        )
+        vibration_multiplier = arrays["vibration_count"] / baseline
+
+        moisture_score = np.select(
+            [
+                moisture < critical * self.MOISTURE_RATIO_DRY,
+                moisture < critical,
+                moisture < critical * self.MOISTURE_RATIO_SATURATED,
+            ],
+            self.MOISTURE_SCORES[:-1],
+            default=self.MOISTURE_SCORES[-1],
+        )
+        tilt_score = np.select(
+            [
+                tilt_rate < self.TILT_RATE_MINOR,
+                tilt_rate < self.TILT_RATE_MODERATE,
+                tilt_rate < self.TILT_RATE_CRITICAL,
+            ],
+            self.TILT_SCORES[:-1],
+            default=self.TILT_SCORES[-1],
+        )
+        vibration_score = np.select(
+            [
+                vibration_multiplier < self.VIBRATION_ELEVATED,
+                vibration_multiplier < self.VIBRATION_HIGH,
+                vibration_multiplier < self.VIBRATION_CRITICAL,
+            ],
+            self.VIBRATION_SCORES[:-1],
+            default=self.VIBRATION_SCORES[-1],
+        )
+        pore_pressure_score = np.select(
+            [
+                pore_pressure < 0,
+                pore_pressure < self.PORE_PRESSURE_SLIGHT,
+                pore_pressure < self.PORE_PRESSURE_MODERATE,
+            ],
+            self.PORE_PRESSURE_SCORES[:-1],
+            default=self.PORE_PRESSURE_SCORES[-1],
+        )
+        safety_factor_score = np.select(
+            [
+                safety_factor > self.SAFETY_FACTOR_CAUTION,
+                safety_factor > self.SAFETY_FACTOR_WARNING,
+                safety_factor >= self.SAFETY_FACTOR_FAILURE,
+            ],
+            self.SAFETY_FACTOR_SCORES[:-1],
+            default=self.SAFETY_FACTOR_SCORES[-1],
+        )
+        rainfall_multiplier = np.select(
+            [
+                rainfall_24h < self.RAINFALL_YELLOW,
+                rainfall_24h < self.RAINFALL_ORANGE,
+                rainfall_24h < self.RAINFALL_RED,
+                rainfall_24h < self.RAINFALL_CRITICAL,
+            ],
+            self.RAINFALL_MULTIPLIERS[:-1],
+            default=self.RAINFALL_MULTIPLIERS[-1],
+        )
+
+        composite_risk = (
+            moisture_score * self.WEIGHTS["moisture"]
+            + tilt_score * self.WEIGHTS["tilt_velocity"]
+            + vibration_score * self.WEIGHTS["vibration"]
+            + pore_pressure_score * self.WEIGHTS["pore_pressure"]
+            + safety_factor_score * self.WEIGHTS["safety_factor"]
+        )
+
+        return np.minimum(1.0, composite_risk * rainfall_multiplier)
+
     def _score_moisture(self, moisture: float, critical_threshold: float) -> float:
         """
         Score soil moisture relative to critical threshold.
@@ -129,17 +245,17 @@ class RiskScorer:
         Returns:
             Score (0.0 to 1.0)
         """
-        if moisture < critical_threshold * 0.8:
-            return 0.0
+        if moisture < critical_threshold * self.MOISTURE_RATIO_DRY:
+            return self.MOISTURE_SCORES[0]
         elif moisture < critical_threshold:
             # Approaching critical (suction declining)
-            return 0.3
-        elif moisture < critical_threshold * 1.2:
+            return self.MOISTURE_SCORES[1]
+        elif moisture < critical_threshold * self.MOISTURE_RATIO_SATURATED:
             # At or slightly above critical
-            return 0.6
+            return self.MOISTURE_SCORES[2]
         else:
             # Well above critical (positive pore pressure likely)
-            return 1.0
+            return self.MOISTURE_SCORES[3]
 
     def _score_tilt_velocity(self, rate: float) -> float:
         """
@@ -154,15 +270,15 @@ class RiskScorer:
             Score (0.0 to 1.0)
         """
         if rate < self.TILT_RATE_MINOR:
-            return 0.0
+            return self.TILT_SCORES[0]
         elif rate < self.TILT_RATE_MODERATE:
-            return 0.2
+            return self.TILT_SCORES[1]
         elif rate < self.TILT_RATE_CRITICAL:
             # Aranayake-level creep
-            return 0.7
+            return self.TILT_SCORES[2]
         else:
             # Extreme creep, failure imminent
-            return 1.0
+            return self.TILT_SCORES[3]
 
     def _score_vibration(self, count: int, baseline: int) -> float:
         """
@@ -184,14 +300,14 @@ class RiskScorer:
         multiplier = count / baseline
 
         if multiplier < self.VIBRATION_ELEVATED:
-            return 0.0
+            return self.VIBRATION_SCORES[0]
         elif multiplier < self.VIBRATION_HIGH:
-            return 0.3
+            return self.VIBRATION_SCORES[1]
         elif multiplier < self.VIBRATION_CRITICAL:
             # Meeriyabedda-level acoustic activity
-            return 0.7
+            return self.VIBRATION_SCORES[2]
         else:
-            return 1.0
+            return self.VIBRATION_SCORES[3]
 
     def _score_pore_pressure(self, pressure: float) -> float:
         """
@@ -210,16 +326,16 @@ class RiskScorer:
         """
         if pressure < 0:
             # Negative pressure = suction = stable
-            return 0.0
-        elif pressure < 5:
+            return self.PORE_PRESSURE_SCORES[0]
+        elif pressure < self.PORE_PRESSURE_SLIGHT:
             # Slight positive pressure
-            return 0.4
-        elif pressure < 10:
+            return self.PORE_PRESSURE_SCORES[1]
+        elif pressure < self.PORE_PRESSURE_MODERATE:
             # Moderate positive pressure
-            return 0.7
+            return self.PORE_PRESSURE_SCORES[2]
         else:
             # High positive pressure (buoyancy effect strong)
-            return 1.0
+            return self.PORE_PRESSURE_SCORES[3]
 
     def _score_safety_factor(self, safety_factor: float) -> float:
         """
@@ -235,14 +351,14 @@ class RiskScorer:
             Score (0.0 to 1.0)
         """
         if safety_factor > self.SAFETY_FACTOR_CAUTION:
-            return 0.0
+            return self.SAFETY_FACTOR_SCORES[0]
         elif safety_factor > self.SAFETY_FACTOR_WARNING:
-            return 0.3
+            return self.SAFETY_FACTOR_SCORES[1]
         elif safety_factor >= self.SAFETY_FACTOR_FAILURE:
-            return 0.7
+            return self.SAFETY_FACTOR_SCORES[2]
         else:
             # FoS < 1.0 = Active failure
-            return 1.0
+            return self.SAFETY_FACTOR_SCORES[3]
 
     def _rainfall_amplification(self, rainfall_24h: float) -> float:
         """
@@ -260,13 +376,13 @@ class RiskScorer:
             Amplification factor (1.0 to 1.5)
         """
         if rainfall_24h < self.RAINFALL_YELLOW:
-            return 1.0
+            return self.RAINFALL_MULTIPLIERS[0]
         elif rainfall_24h < self.RAINFALL_ORANGE:
-            return 1.1  # 10% amplification
+            return self.RAINFALL_MULTIPLIERS[1]  # 10% amplification
         elif rainfall_24h < self.RAINFALL_RED:
-            return 1.2  # 20% amplification
+            return self.RAINFALL_MULTIPLIERS[2]  # 20% amplification
         elif rainfall_24h < self.RAINFALL_CRITICAL:
-            return 1.3  # 30% amplification
+            return self.RAINFALL_MULTIPLIERS[3]  # 30% amplification
         else:
             # Aranayake-level (>200mm/24h)
-            return 1.5  # 50% amplification
+            return self.RAINFALL_MULTIPLIERS[4]  # 50% amplification
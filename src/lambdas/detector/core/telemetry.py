@@ -0,0 +1,56 @@
+"""
+Sensor Telemetry Reading
+
+Typed view of a single telemetry record as used by the risk scoring engine.
+Parsed once from the raw DynamoDB/JSON dict so scoring reads attributes
+instead of repeated dict lookups with defaults.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import Dict, Optional
+
+
+@dataclass(slots=True)
+class Telemetry:
+    """
+    Latest reading of a sensor. Defaults apply when a field is missing.
+    """
+
+    sensor_id: Optional[str] = None
+    latitude: float = 0.0
+    longitude: float = 0.0
+    moisture_percent: float = 0.0
+    tilt_rate_mm_hr: float = 0.0
+    vibration_count: float = 0.0
+    vibration_baseline: float = 5.0
+    pore_pressure_kpa: float = -10.0  # Default negative (suction)
+    safety_factor: float = 2.0
+    rainfall_24h_mm: float = 0.0
+    critical_moisture_percent: float = 40.0  # From RAG enrichment when available
+
+    @classmethod
+    def from_dict(cls, record: Dict) -> "Telemetry":
+        """
+        Build from a raw telemetry dict, ignoring unknown keys.
+
+        Args:
+            record: Raw telemetry record
+
+        Returns:
+            Parsed Telemetry
+        """
+        values = {}
+        for name in NUMERIC_DEFAULTS:
+            value = record.get(name)
+            if value is not None:
+                values[name] = float(value)
+
+        return cls(sensor_id=record.get("sensor_id"), **values)
+
+
+# Numeric field name -> default value
+NUMERIC_DEFAULTS: Dict[str, float] = {
+    f.name: f.default for f in fields(Telemetry) if f.name != "sensor_id"
+}
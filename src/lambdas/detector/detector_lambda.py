@@ -6,31 +6,42 @@ Implements multi-modal fusion algorithm with LLM reasoning.
 
 """
 
-import json
+import asyncio
 import os
 import time
+from collections import Counter
 from datetime import datetime
 from typing import Dict, List, Optional
 
 import boto3
+import numpy as np
+import orjson
 from aws_lambda_powertools import Logger, Tracer
 from aws_lambda_powertools.utilities.typing import LambdaContext
-
+from botocore.config import Config
+from clients.alert_manager import AlertManager
+from clients.bedrock_client import BedrockClient
+from clients.rag_client import RAGClient
 from core.fusion_algorithm import FusionAlgorithm
 from core.risk_scorer import RiskScorer
-from clients.rag_client import RAGClient
-from clients.bedrock_client import BedrockClient
-from clients.alert_manager import AlertManager
-from utils.telemetry_fetcher import TelemetryFetcher
 from utils.location_resolver import LocationResolver
+from utils.telemetry_arrays import telemetry_to_arrays
+from utils.telemetry_fetcher import TelemetryFetcher
 
 logger = Logger()
 tracer = Tracer()
 
 # Initialize clients
-dynamodb = boto3.resource("dynamodb")
-sns = boto3.client("sns")
-lambda_client = boto3.client("lambda")
+# Pool sized for concurrent detections and RAG fan-out (default pool is 10)
+boto_config = Config(
+    max_pool_connections=int(os.environ.get("BOTO_MAX_POOL", "64")),
+    retries={"mode": "adaptive", "max_attempts": 5},
+    tcp_keepalive=True,
+)
+dynamodb = boto3.resource("dynamodb", config=boto_config)
+dynamodb_client = boto3.client("dynamodb", config=boto_config)
+sns = boto3.client("sns", config=boto_config)
+lambda_client = boto3.client("lambda", config=boto_config)
 
 # Environment variables
 TELEMETRY_TABLE = os.environ["TELEMETRY_TABLE_NAME"]
@@ -38,19 +49,27 @@ ALERTS_TABLE = os.environ["ALERTS_TABLE_NAME"]
 RAG_LAMBDA_ARN = os.environ["RAG_LAMBDA_ARN"]
 SNS_TOPIC_ARN = os.environ["SNS_TOPIC_ARN"]
 RISK_THRESHOLD = float(os.environ.get("RISK_THRESHOLD", "0.6"))
+MAX_CONCURRENCY = int(os.environ.get("MAX_CONCURRENCY", "10"))
 BEDROCK_MODEL_ID = os.environ.get(
     "BEDROCK_MODEL_ID", "apac.anthropic.claude-3-haiku-20240307-v1:0"
 )
 
+# Alert level name -> ordinal, shared with AlertManager
+RISK_HIERARCHY = AlertManager.RISK_HIERARCHY
+
 # Initialize algorithm components
 fusion_algorithm = FusionAlgorithm()
 risk_scorer = RiskScorer()
 rag_client = RAGClient(lambda_client, RAG_LAMBDA_ARN)
 bedrock_client = BedrockClient(BEDROCK_MODEL_ID)
 alert_manager = AlertManager(dynamodb, ALERTS_TABLE, sns, SNS_TOPIC_ARN)
-telemetry_fetcher = TelemetryFetcher(dynamodb, TELEMETRY_TABLE)
+telemetry_fetcher = TelemetryFetcher(dynamodb, TELEMETRY_TABLE, dynamodb_client)
 location_resolver = LocationResolver()
 
+# Event loop reused across warm invocations; asyncio.run would rebuild it
+# (and the default executor behind asyncio.to_thread) on every run
+event_loop = asyncio.new_event_loop()
+
 
 @tracer.capture_method
 def fetch_recent_telemetry(hours: int = 24) -> Dict[str, List[Dict]]:
@@ -84,89 +103,189 @@ def analyze_sensors(telemetry_data: Dict[str, List[Dict]]) -> Dict:
     """
     logger.info(f"Analyzing {len(telemetry_data)} sensors")
 
-    # Calculate individual risk scores
-    sensor_risks = {}
-    for sensor_id, records in telemetry_data.items():
-        if not records:
-            continue
+    # Pack the latest reading of each sensor into column arrays once
+    arrays = telemetry_to_arrays(telemetry_data)
 
-        latest = records[-1]  # Most recent reading
-        risk = risk_scorer.calculate_sensor_risk(latest)
-        sensor_risks[sensor_id] = {"risk_score": risk, "telemetry": latest}
-
-    # Calculate spatial correlation
-    for sensor_id in sensor_risks:
-        correlation = fusion_algorithm.calculate_spatial_correlation(
-            sensor_id, sensor_risks, telemetry_data
-        )
-        sensor_risks[sensor_id]["spatial_correlation"] = correlation
+    # Risk, spatial correlation and composite risk stay as parallel arrays
+    # (row i <-> arrays["sensor_ids"][i]) until the per-sensor results are built
+    risks = risk_scorer.calculate_sensor_risk_batch(arrays)
+    correlations = fusion_algorithm.calculate_spatial_correlation_batch(
+        arrays["latitude"], arrays["longitude"], risks
+    )
+    composites = fusion_algorithm.calculate_composite_risk_batch(risks, correlations)
+
+    sensor_risks = {
+        sensor_id: {
+            "risk_score": float(risks[i]),
+            "spatial_correlation": float(correlations[i]),
+            "composite_risk": float(composites[i]),
+            "telemetry": arrays["latest"][i],
+        }
+        for i, sensor_id in enumerate(arrays["sensor_ids"])
+    }
 
-        # Adjust risk based on correlation
-        composite_risk = fusion_algorithm.calculate_composite_risk(
-            sensor_risks[sensor_id]["risk_score"], correlation
-        )
-        sensor_risks[sensor_id]["composite_risk"] = composite_risk
+    # Only high-risk sensors can join a cluster, so the cluster neighbour
+    # graph covers that subset instead of every sensor
+    candidates = np.flatnonzero(composites >= fusion_algorithm.CLUSTER_RISK_THRESHOLD)
+    adjacency = fusion_algorithm.build_neighbour_graph(
+        {
+            arrays["sensor_ids"][i]: (arrays["latitude"][i], arrays["longitude"][i])
+            for i in candidates.tolist()
+        },
+        fusion_algorithm.CLUSTER_RADIUS_M,
+    )
 
     # Detect clusters (3+ sensors in proximity with high risk)
-    clusters = fusion_algorithm.detect_clusters(sensor_risks, telemetry_data)
+    clusters = fusion_algorithm.detect_clusters(
+        sensor_risks, telemetry_data, adjacency=adjacency
+    )
 
     return {
         "sensor_risks": sensor_risks,
         "clusters": clusters,
+        "high_risk_count": int((composites > RISK_THRESHOLD).sum()),
         "analysis_timestamp": int(time.time()),
     }
 
 
 @tracer.capture_method
-async def process_high_risk_detections(analysis: Dict) -> List[Dict]:
+async def process_high_risk_detections(
+    analysis: Dict, remaining_sec: Optional[float] = None
+) -> List[Dict]:
     """
     Process detections exceeding risk threshold with LLM reasoning.
 
-    Now includes per-cluster error handling to prevent one failure
-    from stopping all processing.
+    Clusters and individual sensors are processed concurrently (at most
+    MAX_CONCURRENCY at a time) with per-detection error handling, so one
+    failure does not stop the rest.
 
     Args:
         analysis: Output from analyze_sensors()
+        remaining_sec: Invocation time left on entry (bounds the Bedrock
+            batch wait so real-time fallback calls still fit)
 
     Returns:
         List of alerts created or escalated
     """
+    started = time.monotonic()
     alerts_processed = []
     errors = []
 
-    # Process clusters first (higher priority)
-    for cluster in analysis["clusters"]:
-        if cluster["avg_risk"] > RISK_THRESHOLD:
-            try:
-                alert = await process_cluster(cluster, analysis)
-                if alert:
-                    alerts_processed.append(alert)
-            except Exception as e:
-                cluster_id = f"CLUSTER_{cluster['center_sensor']}"
-                logger.error(
-                    f"Failed to process cluster {cluster_id}",
-                    extra={"error": str(e), "cluster_size": cluster["size"]},
+    # Select work up front so RAG context can be fetched in one parallel batch
+    clusters = [c for c in analysis["clusters"] if c["avg_risk"] > RISK_THRESHOLD]
+    clustered = {m for c in analysis["clusters"] for m in c["members"]}
+    sensors = [
+        (sensor_id, data)
+        for sensor_id, data in analysis["sensor_risks"].items()
+        # Skip sensors already part of a cluster
+        if data["composite_risk"] > RISK_THRESHOLD and sensor_id not in clustered
+    ]
+
+    cluster_points = [
+        (c["center_location"]["lat"], c["center_location"]["lon"]) for c in clusters
+    ]
+    sensor_points = [
+        (d["telemetry"]["latitude"], d["telemetry"]["longitude"]) for _, d in sensors
+    ]
+
+    # Each detection gets the context of its own position (distance_m is
+    # relative to it); the blocking fan-out runs off the event loop
+    rag_contexts = await asyncio.to_thread(
+        rag_client.query_nearest_batch, cluster_points + sensor_points
+    )
+    cluster_contexts = rag_contexts[: len(clusters)]
+    sensor_contexts = rag_contexts[len(clusters) :]
+
+    # With enough detections, assess them all in one Bedrock batch job;
+    # anything without a batch result is assessed in real time below
+    detections = len(clusters) + len(sensors)
+    llm_outputs = [None] * detections
+    if bedrock_client.batch_available(detections):
+        locations = await asyncio.gather(
+            *(
+                asyncio.to_thread(location_resolver.resolve, lat, lon)
+                for lat, lon in cluster_points
+            )
+        )
+        llm_inputs = [
+            {
+                **prepare_llm_input(cluster, rag_context, analysis, is_cluster=True),
+                "location": location,
+            }
+            for cluster, rag_context, location in zip(
+                clusters, cluster_contexts, locations
+            )
+        ] + [
+            prepare_llm_input(data, rag_context, analysis, is_cluster=False)
+            for (_, data), rag_context in zip(sensors, sensor_contexts)
+        ]
+        if remaining_sec is not None:
+            remaining_sec -= time.monotonic() - started
+        llm_outputs = await bedrock_client.assess_risk_batch(llm_inputs, remaining_sec)
+    cluster_outputs = llm_outputs[: len(clusters)]
+    sensor_outputs = llm_outputs[len(clusters) :]
+
+    # Deduplication: fetch the active alerts for every detection in one query
+    # (None on failure, in which case each detection looks up its own)
+    active_alerts = await asyncio.to_thread(
+        alert_manager.get_active_alerts,
+        [f"CLUSTER_{c['center_sensor']}" for c in clusters]
+        + [sensor_id for sensor_id, _ in sensors],
+    )
+
+    # Detections are independent: run them concurrently, bounded to stay
+    # within Bedrock/DynamoDB quotas
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+
+    async def bounded(coro):
+        async with semaphore:
+            return await coro
+
+    results = await asyncio.gather(
+        *(
+            bounded(
+                process_cluster(
+                    cluster, analysis, rag_context, llm_output, active_alerts
+                )
+            )
+            for cluster, rag_context, llm_output in zip(
+                clusters, cluster_contexts, cluster_outputs
+            )
+        ),
+        *(
+            bounded(
+                process_individual_sensor(
+                    sensor_id, data, analysis, rag_context, llm_output, active_alerts
                 )
-                errors.append({"cluster_id": cluster_id, "error": str(e)})
-                # Continue processing other clusters
-
-    # Process individual high-risk sensors not in clusters
-    for sensor_id, data in analysis["sensor_risks"].items():
-        if data["composite_risk"] > RISK_THRESHOLD:
-            # Check if already part of a cluster
-            in_cluster = any(sensor_id in c["members"] for c in analysis["clusters"])
-            if not in_cluster:
-                try:
-                    alert = await process_individual_sensor(sensor_id, data, analysis)
-                    if alert:
-                        alerts_processed.append(alert)
-                except Exception as e:
-                    logger.error(
-                        f"Failed to process sensor {sensor_id}",
-                        extra={"error": str(e), "risk": data["composite_risk"]},
-                    )
-                    errors.append({"sensor_id": sensor_id, "error": str(e)})
-                    # Continue processing other sensors
+            )
+            for (sensor_id, data), rag_context, llm_output in zip(
+                sensors, sensor_contexts, sensor_outputs
+            )
+        ),
+        return_exceptions=True,
+    )
+
+    # One failed detection must not stop the others
+    for cluster, result in zip(clusters, results[: len(clusters)]):
+        if isinstance(result, Exception):
+            cluster_id = f"CLUSTER_{cluster['center_sensor']}"
+            logger.error(
+                f"Failed to process cluster {cluster_id}",
+                extra={"error": str(result), "cluster_size": cluster["size"]},
+            )
+            errors.append({"cluster_id": cluster_id, "error": str(result)})
+        elif result:
+            alerts_processed.append(result)
+
+    for (sensor_id, data), result in zip(sensors, results[len(clusters) :]):
+        if isinstance(result, Exception):
+            logger.error(
+                f"Failed to process sensor {sensor_id}",
+                extra={"error": str(result), "risk": data["composite_risk"]},
+            )
+            errors.append({"sensor_id": sensor_id, "error": str(result)})
+        elif result:
+            alerts_processed.append(result)
 
     # Log summary of errors
     if errors:
@@ -179,13 +298,23 @@ async def process_high_risk_detections(analysis: Dict) -> List[Dict]:
 
 
 @tracer.capture_method
-async def process_cluster(cluster: Dict, analysis: Dict) -> Optional[Dict]:
+async def process_cluster(
+    cluster: Dict,
+    analysis: Dict,
+    rag_context: Optional[Dict] = None,
+    llm_output: Optional[Dict] = None,
+    active_alerts: Optional[Dict[str, Dict]] = None,
+) -> Optional[Dict]:
     """
     Process a high-risk cluster with LLM reasoning.
 
     Args:
         cluster: Cluster detection data
         analysis: Full analysis context
+        rag_context: Prefetched geological context (queried if None)
+        llm_output: Batch LLM risk assessment (assessed now if None)
+        active_alerts: Prefetched active alerts by detection ID (looked up
+            if None)
 
     Returns:
         Alert data if created/escalated, None otherwise
@@ -197,16 +326,20 @@ async def process_cluster(cluster: Dict, analysis: Dict) -> Optional[Dict]:
         extra={"cluster_size": cluster["size"], "avg_risk": cluster["avg_risk"]},
     )
 
-    # Get geological context from RAG
+    # Blocking boto3 calls run in worker threads so gathered detections
+    # overlap their I/O instead of stalling the event loop
     center_location = cluster["center_location"]
-    resolved_location = location_resolver.resolve(
-        float(center_location["lat"]),
-        float(center_location["lon"]),
+    resolved_location = await asyncio.to_thread(
+        location_resolver.resolve,
+        center_location["lat"],
+        center_location["lon"],
     )
 
-    rag_context = await rag_client.query_nearest(
-        center_location["lat"], center_location["lon"]
-    )
+    # Get geological context from RAG
+    if rag_context is None:
+        rag_context = await rag_client.query_nearest(
+            center_location["lat"], center_location["lon"]
+        )
 
     # Prepare data for LLM
     llm_input = prepare_llm_input(cluster, rag_context, analysis, is_cluster=True)
@@ -215,17 +348,27 @@ async def process_cluster(cluster: Dict, analysis: Dict) -> Optional[Dict]:
     llm_input["location"] = resolved_location
 
     # Get LLM risk assessment
-    llm_output = await bedrock_client.assess_risk(llm_input)
+    if llm_output is None:
+        llm_output = await bedrock_client.assess_risk(llm_input)
 
     # Check for existing alert (deduplication)
-    existing_alert = alert_manager.get_active_alert(cluster_id)
+    if active_alerts is not None:
+        existing_alert = active_alerts.get(cluster_id)
+    else:
+        existing_alert = await asyncio.to_thread(
+            alert_manager.get_active_alert, cluster_id
+        )
 
     if existing_alert:
         # Check if escalation needed
         if should_escalate(existing_alert, llm_output):
             logger.info(f"Escalating alert for {cluster_id}")
-            alert = alert_manager.escalate_alert(
-                existing_alert, llm_output, cluster, rag_context
+            alert = await asyncio.to_thread(
+                alert_manager.escalate_alert,
+                existing_alert,
+                llm_output,
+                cluster,
+                rag_context,
             )
             return alert
         else:
@@ -243,13 +386,14 @@ async def process_cluster(cluster: Dict, analysis: Dict) -> Optional[Dict]:
                 {
                     **cluster,
                     "location": resolved_location,
-                    "latitude": float(center_location["lat"]),
-                    "longitude": float(center_location["lon"]),
+                    "latitude": center_location["lat"],
+                    "longitude": center_location["lon"],
                 },
                 rag_context,
             )
 
-        alert = alert_manager.create_alert(
+        alert = await asyncio.to_thread(
+            alert_manager.create_alert,
             cluster_id,
             llm_output,
             cluster,
@@ -262,7 +406,12 @@ async def process_cluster(cluster: Dict, analysis: Dict) -> Optional[Dict]:
 
 @tracer.capture_method
 async def process_individual_sensor(
-    sensor_id: str, sensor_data: Dict, analysis: Dict
+    sensor_id: str,
+    sensor_data: Dict,
+    analysis: Dict,
+    rag_context: Optional[Dict] = None,
+    llm_output: Optional[Dict] = None,
+    active_alerts: Optional[Dict[str, Dict]] = None,
 ) -> Optional[Dict]:
     """
     Process a high-risk individual sensor.
@@ -271,6 +420,10 @@ async def process_individual_sensor(
         sensor_id: Sensor identifier
         sensor_data: Risk and telemetry data
         analysis: Full analysis context
+        rag_context: Prefetched geological context (queried if None)
+        llm_output: Batch LLM risk assessment (assessed now if None)
+        active_alerts: Prefetched active alerts by detection ID (looked up
+            if None)
 
     Returns:
         Alert data if created/escalated, None otherwise
@@ -282,28 +435,36 @@ async def process_individual_sensor(
 
     # Get location from telemetry
     telemetry = sensor_data["telemetry"]
-    lat = float(telemetry["latitude"])
-    lon = float(telemetry["longitude"])
-    resolved_location = location_resolver.resolve(lat, lon)
+    lat = telemetry["latitude"]
+    lon = telemetry["longitude"]
+    resolved_location = await asyncio.to_thread(location_resolver.resolve, lat, lon)
 
     # Get geological context from RAG
-    rag_context = await rag_client.query_nearest(
-        telemetry["latitude"], telemetry["longitude"]
-    )
+    if rag_context is None:
+        rag_context = await rag_client.query_nearest(
+            telemetry["latitude"], telemetry["longitude"]
+        )
 
     # Prepare data for LLM
     llm_input = prepare_llm_input(sensor_data, rag_context, analysis, is_cluster=False)
 
     # Get LLM risk assessment
-    llm_output = await bedrock_client.assess_risk(llm_input)
+    if llm_output is None:
+        llm_output = await bedrock_client.assess_risk(llm_input)
 
     # Check for existing alert
-    existing_alert = alert_manager.get_active_alert(sensor_id)
+    if active_alerts is not None:
+        existing_alert = active_alerts.get(sensor_id)
+    else:
+        existing_alert = await asyncio.to_thread(
+            alert_manager.get_active_alert, sensor_id
+        )
 
     if existing_alert:
         if should_escalate(existing_alert, llm_output):
             logger.info(f"Escalating alert for {sensor_id}")
-            alert = alert_manager.escalate_alert(
+            alert = await asyncio.to_thread(
+                alert_manager.escalate_alert,
                 existing_alert,
                 llm_output,
                 {"sensor_id": sensor_id, "telemetry": telemetry},
@@ -331,11 +492,8 @@ async def process_individual_sensor(
                 rag_context,
             )
 
-        resolved_location = location_resolver.resolve(
-            float(telemetry["latitude"]), float(telemetry["longitude"])
-        )
-
-        alert = alert_manager.create_alert(
+        alert = await asyncio.to_thread(
+            alert_manager.create_alert,
             sensor_id,
             llm_output,
             {"sensor_id": sensor_id, "telemetry": telemetry},
@@ -398,18 +556,19 @@ def should_escalate(existing_alert: Dict, new_assessment: Dict) -> bool:
     Returns:
         True if escalation warranted
     """
-    risk_hierarchy = {"Yellow": 1, "Orange": 2, "Red": 3}
-
-    current_level = existing_alert["risk_level"]
-    new_level = new_assessment["risk_level"]
+    new_num = RISK_HIERARCHY[new_assessment["risk_level"]]
+    # Alerts created before risk_level_num was stored only carry the name
+    current_num = existing_alert.get("risk_level_num")
+    if current_num is None:
+        current_num = RISK_HIERARCHY[existing_alert["risk_level"]]
 
     # Escalate if risk level increased
-    if risk_hierarchy[new_level] > risk_hierarchy[current_level]:
+    if new_num > current_num:
         return True
 
     # Escalate if confidence significantly increased at same level
     if (
-        new_level == current_level
+        new_num == current_num
         and new_assessment["confidence"] > existing_alert["confidence"] + 0.15
     ):
         return True
@@ -445,9 +604,9 @@ def lambda_handler(event: Dict, context: LambdaContext) -> Dict:
             logger.warning("No telemetry data found")
             return {
                 "statusCode": 200,
-                "body": json.dumps(
+                "body": orjson.dumps(
                     {"status": "no_data", "message": "No telemetry data available"}
-                ),
+                ).decode(),
             }
 
         # Analyze sensors
@@ -458,20 +617,19 @@ def lambda_handler(event: Dict, context: LambdaContext) -> Dict:
             extra={
                 "sensors_analyzed": len(analysis["sensor_risks"]),
                 "clusters_detected": len(analysis["clusters"]),
-                "high_risk_count": sum(
-                    1
-                    for s in analysis["sensor_risks"].values()
-                    if s["composite_risk"] > RISK_THRESHOLD
-                ),
+                "high_risk_count": analysis["high_risk_count"],
             },
         )
 
         # Process high-risk detections (async operations)
-        import asyncio
-
-        alerts = asyncio.run(process_high_risk_detections(analysis))
+        alerts = event_loop.run_until_complete(
+            process_high_risk_detections(
+                analysis, context.get_remaining_time_in_millis() / 1000
+            )
+        )
 
         execution_time = time.time() - start_time
+        actions = Counter(a.get("action") for a in alerts)
 
         logger.info(
             "Detection complete",
@@ -483,21 +641,18 @@ def lambda_handler(event: Dict, context: LambdaContext) -> Dict:
 
         return {
             "statusCode": 200,
-            "body": json.dumps(
+            "body": orjson.dumps(
                 {
                     "status": "success",
                     "sensors_analyzed": len(analysis["sensor_risks"]),
                     "clusters_detected": len(analysis["clusters"]),
-                    "alerts_created": sum(
-                        1 for a in alerts if a.get("action") == "created"
-                    ),
-                    "alerts_escalated": sum(
-                        1 for a in alerts if a.get("action") == "escalated"
-                    ),
+                    "alerts_created": actions["created"],
+                    "alerts_escalated": actions["escalated"],
                     "execution_time": execution_time,
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
-            ),
+                    # Naive datetime: same text as isoformat() (no "Z"/offset)
+                    "timestamp": datetime.utcnow(),
+                },
+            ).decode(),
         }
 
     except Exception as e:
@@ -515,11 +670,11 @@ def lambda_handler(event: Dict, context: LambdaContext) -> Dict:
 
         return {
             "statusCode": 500,
-            "body": json.dumps(
+            "body": orjson.dumps(
                 {
                     "status": "error",
                     "error": str(e),
                     "partial_results": partial_info,
                 }
-            ),
+            ).decode(),
         }
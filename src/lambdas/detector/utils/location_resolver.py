@@ -7,19 +7,42 @@ and returns a consistent payload to store in DynamoDB and pass to Bedrock.
 Fallback:
 - If PLACE_INDEX_NAME is not set (or lookup fails), returns coordinates-only label + Google Maps URL.
 
+Caching:
+- Sensors are stationary, so successful lookups are cached per container,
+  keyed on coordinates rounded to 5 decimals (~1 m). Failures are not cached.
+
 """
 
 from __future__ import annotations
 
 import os
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
 
 import boto3
 from aws_lambda_powertools import Logger
+from botocore.config import Config
 
 logger = Logger(child=True)
 
 
+@lru_cache(maxsize=None)
+def _location_client(region: str):
+    """
+    Shared Amazon Location client per region.
+
+    Created on first use and reused by every LocationResolver in the
+    container (warm invocations and tests alike), with a connection pool
+    sized for concurrent detections and keep-alive enabled.
+    """
+    cfg = Config(
+        max_pool_connections=int(os.environ.get("BOTO_MAX_POOL", "64")),
+        retries={"mode": "adaptive", "max_attempts": 5},
+        tcp_keepalive=True,
+    )
+    return boto3.client("location", region_name=region, config=cfg)
+
+
 def _fmt_coord_label(lat: float, lon: float) -> str:
     return f"{lat:.5f}, {lon:.5f}"
 
@@ -32,6 +55,20 @@ def _google_maps_dir_url(lat: float, lon: float) -> str:
     return f"https://www.google.com/maps/dir/?api=1&destination={lat:.6f},{lon:.6f}"
 
 
+@lru_cache(maxsize=4096)
+def _coordinate_strings(lat: float, lon: float) -> Tuple[str, str, str]:
+    """
+    Label, search URL and directions URL for a position.
+
+    Sensors are stationary, so each position is formatted once per container.
+    """
+    return (
+        _fmt_coord_label(lat, lon),
+        _google_maps_search_url(lat, lon),
+        _google_maps_dir_url(lat, lon),
+    )
+
+
 def _safe_get(d: Dict, *keys: str) -> Optional[Any]:
     cur: Any = d
     for k in keys:
@@ -51,9 +88,13 @@ class LocationResolver:
         self.max_results = int(os.environ.get("LOCATION_MAX_RESULTS", "1"))
         self.label_format = os.environ.get("LOCATION_LABEL_FORMAT", "short").lower()
 
+        self._lookup_cached = lru_cache(
+            maxsize=int(os.environ.get("LOCATION_CACHE_SIZE", "4096"))
+        )(self._lookup)
+
         self._client = None
         if self.place_index_name:
-            self._client = boto3.client("location", region_name=self.region)
+            self._client = _location_client(self.region)
             logger.info(
                 "LocationResolver initialised",
                 extra={"place_index": self.place_index_name, "region": self.region},
@@ -78,118 +119,145 @@ class LocationResolver:
           "longitude": <float>,
         }
         """
-        base = {
-            "latitude": float(latitude),
-            "longitude": float(longitude),
-            "location_label": _fmt_coord_label(latitude, longitude),
-            "google_maps_url": _google_maps_search_url(latitude, longitude),
-            "google_maps_directions_url": _google_maps_dir_url(latitude, longitude),
-            "resolved_by": "coordinates_only",
-            "address": {},
-            "place": {},
-        }
-
         if not self._client:
-            return base
+            return self._coordinates_only(latitude, longitude, "coordinates_only")
 
         try:
-            # Amazon Location expects Position=[lon, lat]
-            resp = self._client.search_place_index_for_position(
-                IndexName=self.place_index_name,
-                Position=[float(longitude), float(latitude)],
-                MaxResults=self.max_results,
-                Language=self.language,
+            resolved = self._lookup_cached(round(latitude, 5), round(longitude, 5))
+        except Exception as e:
+            logger.exception(
+                "Amazon Location reverse-geocode failed", extra={"error": str(e)}
             )
+            return self._coordinates_only(latitude, longitude, "amazon_location_error")
+
+        if resolved is None:
+            return self._coordinates_only(latitude, longitude, "coordinates_only")
+
+        # Success path: the lookup supplies label, address and place, so only
+        # the coordinate fields are added (no coordinates-only payload)
+        _, maps_url, directions_url = _coordinate_strings(latitude, longitude)
+        return {
+            "latitude": latitude,
+            "longitude": longitude,
+            "google_maps_url": maps_url,
+            "google_maps_directions_url": directions_url,
+            **resolved,
+        }
 
-            results = resp.get("Results") or []
-            if not results:
-                logger.info(
-                    "Amazon Location: no reverse-geocode results",
-                    extra={"lat": latitude, "lon": longitude},
-                )
-                return base
-
-            top = results[0] or {}
-            place = top.get("Place") or {}
-
-            # Common fields across providers
-            label = place.get("Label")
-            municipality = place.get("Municipality")
-            subregion = place.get("SubRegion")
-            region = place.get("Region")
-            country = place.get("Country")
-            postal = place.get("PostalCode")
-            neighbourhood = place.get("Neighborhood")
-            street = place.get("Street")
-            address_number = place.get("AddressNumber")
-
-            # Build a "short" label for alerts
-            parts_short = [
-                p
-                for p in [neighbourhood, municipality, subregion, region, country]
-                if p
-            ]
-            short_label = ", ".join(parts_short) if parts_short else None
-
-            # Build a structured address dict for storage/search
-            address = {
-                "label": label,
-                "address_number": address_number,
-                "street": street,
-                "neighborhood": neighbourhood,
-                "municipality": municipality,
-                "subregion": subregion,
-                "region": region,
-                "country": country,
-                "postal_code": postal,
-            }
-            # Drop empties
-            address = {k: v for k, v in address.items() if v}
-
-            geom_point = _safe_get(place, "Geometry", "Point")
-            provider_lon = provider_lat = None
-            if isinstance(geom_point, (list, tuple)) and len(geom_point) == 2:
-                provider_lon, provider_lat = float(geom_point[0]), float(geom_point[1])
-
-            place_id = place.get("PlaceId")
-
-            resolved_label = (
-                label if self.label_format == "full" else (short_label or label)
-            )
-            if not resolved_label:
-                resolved_label = _fmt_coord_label(latitude, longitude)
-
-            out = {
-                **base,
-                "location_label": resolved_label,
-                "resolved_by": "amazon_location",
-                "address": address,
-                "place": {
-                    "place_id": place_id,
-                    "provider_geometry": (
-                        {"lat": provider_lat, "lon": provider_lon}
-                        if provider_lat and provider_lon
-                        else {}
-                    ),
-                    "raw": {},
-                },
-            }
+    @staticmethod
+    def _coordinates_only(
+        latitude: float, longitude: float, resolved_by: str
+    ) -> Dict[str, Any]:
+        label, maps_url, directions_url = _coordinate_strings(latitude, longitude)
+        return {
+            "latitude": latitude,
+            "longitude": longitude,
+            "location_label": label,
+            "google_maps_url": maps_url,
+            "google_maps_directions_url": directions_url,
+            "resolved_by": resolved_by,
+            "address": {},
+            "place": {},
+        }
+
+    def _lookup(self, latitude: float, longitude: float) -> Optional[Dict[str, Any]]:
+        """
+        Reverse-geocode one position (cached per instance via _lookup_cached).
+
+        Returns:
+            Fields overriding the coordinates-only payload, or None when the
+            place index has no result. Raises on API errors so that failures
+            are not cached.
+        """
+        # Amazon Location expects Position=[lon, lat]
+        resp = self._client.search_place_index_for_position(
+            IndexName=self.place_index_name,
+            Position=[longitude, latitude],
+            MaxResults=self.max_results,
+            Language=self.language,
+        )
 
+        results = resp.get("Results") or []
+        if not results:
             logger.info(
-                "Amazon Location resolved",
-                extra={
-                    "lat": latitude,
-                    "lon": longitude,
-                    "label": resolved_label,
-                    "region": self.region,
-                    "place_index": self.place_index_name,
-                },
+                "Amazon Location: no reverse-geocode results",
+                extra={"lat": latitude, "lon": longitude},
             )
-            return out
+            return None
 
-        except Exception as e:
-            logger.exception(
-                "Amazon Location reverse-geocode failed", extra={"error": str(e)}
+        top = results[0] or {}
+        place = top.get("Place") or {}
+
+        # Common fields across providers
+        label = place.get("Label")
+        municipality = place.get("Municipality")
+        subregion = place.get("SubRegion")
+        region = place.get("Region")
+        country = place.get("Country")
+        postal = place.get("PostalCode")
+        neighbourhood = place.get("Neighborhood")
+        street = place.get("Street")
+        address_number = place.get("AddressNumber")
+
+        # Build a "short" label for alerts
+        parts_short = [
+            p for p in [neighbourhood, municipality, subregion, region, country] if p
+        ]
+        short_label = ", ".join(parts_short) if parts_short else None
+
+        # Build a structured address dict for storage/search, dropping empties
+        address = {
+            k: v
+            for k, v in (
+                ("label", label),
+                ("address_number", address_number),
+                ("street", street),
+                ("neighborhood", neighbourhood),
+                ("municipality", municipality),
+                ("subregion", subregion),
+                ("region", region),
+                ("country", country),
+                ("postal_code", postal),
             )
-            base["resolved_by"] = "amazon_location_error"
-            return base
+            if v
+        }
+
+        geom_point = _safe_get(place, "Geometry", "Point")
+        provider_lon = provider_lat = None
+        if isinstance(geom_point, (list, tuple)) and len(geom_point) == 2:
+            provider_lon, provider_lat = float(geom_point[0]), float(geom_point[1])
+
+        place_id = place.get("PlaceId")
+
+        resolved_label = (
+            label if self.label_format == "full" else (short_label or label)
+        )
+        if not resolved_label:
+            resolved_label = _fmt_coord_label(latitude, longitude)
+
+        out = {
+            "location_label": resolved_label,
+            "resolved_by": "amazon_location",
+            "address": address,
+            "place": {
+                "place_id": place_id,
+                "provider_geometry": (
+                    {"lat": provider_lat, "lon": provider_lon}
+                    if provider_lat and provider_lon
+                    else {}
+                ),
+                "raw": {},
+            },
+        }
+
+        logger.info(
+            "Amazon Location resolved",
+            extra={
+                "lat": latitude,
+                "lon": longitude,
+                "label": resolved_label,
+                "region": self.region,
+                "place_index": self.place_index_name,
+            },
+        )
+        return out
@@ -0,0 +1,50 @@
+"""
+Telemetry Array Packing
+Converts per-sensor telemetry records into column arrays for batch analysis.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import numpy as np
+from core.telemetry import NUMERIC_DEFAULTS
+
+# Column name -> default used when the latest reading lacks the field.
+# Shares its defaults with core.telemetry.Telemetry.
+TELEMETRY_COLUMNS: Dict[str, float] = NUMERIC_DEFAULTS
+
+
+def telemetry_to_arrays(telemetry_data: Dict[str, List[Dict]]) -> Dict[str, Any]:
+    """
+    Pack the latest reading of every sensor into column arrays (SoA).
+
+    Args:
+        telemetry_data: Sensor telemetry organized by sensor_id
+
+    Returns:
+        {
+          "sensor_ids": [...],            # row index -> sensor_id
+          "latest": [...],                # row index -> latest record dict
+          "<column>": np.ndarray(float64) # one entry per TELEMETRY_COLUMNS
+        }
+    """
+    sensor_ids: List[str] = []
+    latest: List[Dict] = []
+
+    for sensor_id, records in telemetry_data.items():
+        if not records:
+            continue
+        sensor_ids.append(sensor_id)
+        latest.append(records[-1])
+
+    arrays: Dict[str, Any] = {"sensor_ids": sensor_ids, "latest": latest}
+
+    for column, default in TELEMETRY_COLUMNS.items():
+        values = []
+        for record in latest:
+            value = record.get(column)
+            values.append(default if value is None else float(value))
+        arrays[column] = np.array(values, dtype=np.float64)
+
+    return arrays
@@ -5,15 +5,64 @@ Fetches sensor telemetry data from DynamoDB for analysis.
 
 from __future__ import annotations
 
-from typing import Dict, List, Optional
-from boto3.dynamodb.conditions import Key, Attr
-from aws_lambda_powertools import Logger
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import boto3
+from aws_lambda_powertools import Logger
+from botocore.exceptions import ClientError
+from core.telemetry import NUMERIC_DEFAULTS
 
 logger = Logger(child=True)
 
 
+# Numeric telemetry fields, converted straight from the wire string to float
+_FLOAT_FIELDS = frozenset(NUMERIC_DEFAULTS)
+
+
+def _number(value: str) -> Union[int, float]:
+    """Parse a DynamoDB number string: int when integral, float otherwise."""
+    if "." in value or "e" in value or "E" in value:
+        f = float(value)
+        return int(f) if f.is_integer() else f
+    return int(value)
+
+
+def _from_attribute_value(av: Dict[str, Any]) -> Any:
+    """
+    Convert one typed AttributeValue ({"N": "1.5"}, {"S": "x"}, ...) to a
+    native value, without the Decimal intermediate of TypeDeserializer.
+    """
+    ((kind, value),) = av.items()
+    if kind == "N":
+        return _number(value)
+    if kind == "S" or kind == "BOOL" or kind == "B":
+        return value
+    if kind == "M":
+        return {k: _from_attribute_value(v) for k, v in value.items()}
+    if kind == "L":
+        return [_from_attribute_value(v) for v in value]
+    if kind == "NULL":
+        return None
+    if kind == "NS":
+        return {_number(v) for v in value}
+    if kind == "SS" or kind == "BS":
+        return set(value)
+    raise TypeError(f"Unsupported DynamoDB attribute type: {kind}")
+
+
+def _attribute_value(value: Any) -> Dict[str, Any]:
+    """Typed AttributeValue for an expression placeholder."""
+    if isinstance(value, bool):
+        return {"BOOL": value}
+    if isinstance(value, (int, float, Decimal)):
+        return {"N": str(value)}
+    return {"S": str(value)}
+
+
 class TelemetryFetcher:
     """
     Utility for fetching telemetry data from DynamoDB.
@@ -21,17 +70,66 @@ class TelemetryFetcher:
     Uses efficient query patterns:
     1) Query by sensor_id + timestamp range
     2) Query via GSIs if they exist (hazard_level / geohash)
-    3) Scan only as last resort
+    3) Scan only as last resort (parallel segments when fetching all sensors)
     """
 
+    # Parallel scan segments used when fetching all sensors
+    DEFAULT_TOTAL_SEGMENTS = 16
+
+    # Attributes the analysis reads (scoring fields + trends used in prompts);
+    # the all-sensor scan projects to these to cut read bandwidth
+    ANALYSIS_ATTRIBUTES = (
+        "sensor_id",
+        "timestamp",
+        *NUMERIC_DEFAULTS,
+        "moisture_trend_pct_hr",
+        "tilt_acceleration_mm_hr2",
+    )
+    # Placeholders for every name (timestamp is a reserved word)
+    ANALYSIS_ATTRIBUTE_NAMES = {f"#a{i}": a for i, a in enumerate(ANALYSIS_ATTRIBUTES)}
+    ANALYSIS_PROJECTION = ", ".join(ANALYSIS_ATTRIBUTE_NAMES)
+
     # Optional GSI names
     HAZARD_LEVEL_INDEX = "HazardLevelIndex"
     FAILURE_STAGE_INDEX = "FailureStageIndex"
     SPATIAL_INDEX = "SpatialIndex"
 
-    def __init__(self, dynamodb_resource, table_name: str):
+    # Key condition shared by (partition, timestamp range) queries on the table
+    # and its GSIs; built once as a string instead of a Key() tree per page
+    RANGE_CONDITION = "#pk = :pk AND #ts BETWEEN :start AND :end"
+    WINDOW_FILTER = "#ts BETWEEN :start AND :end"
+
+    # Sparse GSI over the per-sensor registry items the ingestor upserts
+    # ({sensor_id, timestamp: 0, registry_pk: "SENSORS", last_seen})
+    SENSOR_REGISTRY_INDEX = "SensorRegistryIndex"
+    SENSOR_REGISTRY_PK = "SENSORS"
+
+    def __init__(self, dynamodb_resource, table_name: str, dynamodb_client=None):
         self.table = dynamodb_resource.Table(table_name)
         self.table_name = table_name
+        # Reads go through a plain low-level client: the resource's own client
+        # runs every item through TypeDeserializer (Decimal), so items come
+        # back as typed AttributeValues and are converted once in to_record
+        if dynamodb_client is None:
+            resource_client = dynamodb_resource.meta.client
+            dynamodb_client = boto3.client(
+                "dynamodb",
+                region_name=resource_client.meta.region_name,
+                config=resource_client.meta.config,
+            )
+        self._client = dynamodb_client
+        self._query_paginator = self._client.get_paginator("query")
+        self._scan_paginator = self._client.get_paginator("scan")
+        # Worker threads for the per-sensor Query fan-out
+        self.fetch_concurrency = int(
+            os.environ.get("TELEMETRY_FETCH_CONCURRENCY", "16")
+        )
+        # Segments for the sensor discovery scan when it cannot be avoided
+        self.scan_segments = max(1, int(os.environ.get("SCAN_SEGMENTS", "8")))
+        # Discover sensors from the registry index instead of a table scan
+        self.use_sensor_registry = (
+            os.environ.get("USE_SENSOR_REGISTRY", "false").lower() == "true"
+        )
         logger.info(f"Initialized TelemetryFetcher for table: {table_name}")
 
     # Utilities
@@ -50,24 +148,88 @@ class TelemetryFetcher:
             return [TelemetryFetcher.to_native(v) for v in x]
         return x
 
+    @staticmethod
+    def to_record(item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert a low-level DynamoDB item to native types in a single pass.
+
+        Coordinates and sensor readings are converted exactly once here, to
+        float, so downstream scoring and location code consume floats
+        directly (an integral number would otherwise come back as int).
+        """
+        record: Dict[str, Any] = {}
+        for name, av in item.items():
+            if name in _FLOAT_FIELDS:
+                number = av.get("N")
+                if number is not None:
+                    record[name] = float(number)
+                    continue
+                value = _from_attribute_value(av)
+                record[name] = float(value) if value is not None else None
+            else:
+                record[name] = _from_attribute_value(av)
+        return record
+
+    @staticmethod
+    def _range_query_kwargs(
+        partition_key: str, partition_value: Any, start_time: int, end_time: int
+    ) -> Dict[str, Any]:
+        """Query arguments for partition_key = value AND timestamp in range."""
+        return {
+            "KeyConditionExpression": TelemetryFetcher.RANGE_CONDITION,
+            "ExpressionAttributeNames": {"#pk": partition_key, "#ts": "timestamp"},
+            "ExpressionAttributeValues": {
+                ":pk": _attribute_value(partition_value),
+                ":start": _attribute_value(start_time),
+                ":end": _attribute_value(end_time),
+            },
+        }
+
+    def _iter_query(self, **kwargs) -> Iterator[Dict]:
+        """Yield every item of a paginated Query."""
+        for page in self._query_paginator.paginate(TableName=self.table_name, **kwargs):
+            yield from page.get("Items", [])
+
+    def _iter_scan(self, **kwargs) -> Iterator[Dict]:
+        """Yield every item of a paginated Scan."""
+        for page in self._scan_paginator.paginate(TableName=self.table_name, **kwargs):
+            yield from page.get("Items", [])
+
     # Primary fetch methods
     def fetch_by_time_range(
-        self, start_time: int, end_time: int, sensor_ids: Optional[List[str]] = None
+        self,
+        start_time: int,
+        end_time: int,
+        sensor_ids: Optional[List[str]] = None,
+        total_segments: int = DEFAULT_TOTAL_SEGMENTS,
     ) -> Dict[str, List[Dict]]:
         """
         Fetch telemetry within a time range.
 
-        If sensor_ids is provided, uses efficient Query per sensor.
-        Otherwise, attempts to discover active sensors (via a minimal scan),
-        then queries each sensor efficiently.
+        If sensor_ids is provided, uses efficient Query per sensor. Otherwise,
+        with the sensor registry enabled, lists the sensors seen in the window
+        from SensorRegistryIndex and queries each one. Without the registry
+        (or when it returns nothing), reads the window with a parallel Scan
+        over total_segments segments; with total_segments <= 1, discovers
+        active sensors (via a minimal scan) then queries each sensor.
 
-        Returns: { sensor_id: [records...] }
+        Returns: { sensor_id: [records...] } (records in timestamp order)
         """
         logger.info(f"Fetching telemetry from {start_time} to {end_time}")
 
         if sensor_ids:
             return self._fetch_by_sensors(sensor_ids, start_time, end_time)
 
+        if self.use_sensor_registry:
+            registered = self._query_sensor_registry(start_time)
+            if registered:
+                logger.info(f"Sensor registry listed {len(registered)} sensors")
+                return self._fetch_by_sensors(registered, start_time, end_time)
+            logger.warning("Sensor registry returned no sensors, falling back to scan")
+
+        if total_segments > 1:
+            return self._parallel_scan(start_time, end_time, total_segments)
+
         return self._fetch_all_sensors(start_time, end_time)
 
     def _fetch_by_sensors(
@@ -79,44 +241,49 @@ class TelemetryFetcher:
         Returns: { sensor_id: [records...] }
         """
         telemetry_by_sensor: Dict[str, List[Dict]] = {}
-
-        for sensor_id in sensor_ids:
-            try:
-                items: List[Dict] = []
-                response = self.table.query(
-                    KeyConditionExpression=(
-                        Key("sensor_id").eq(sensor_id)
-                        & Key("timestamp").between(start_time, end_time)
-                    ),
-                    ScanIndexForward=True,
+        if not sensor_ids:
+            return telemetry_by_sensor
+
+        # One Query (plus pagination) per sensor, overlapped on worker threads;
+        # results are collected in sensor_ids order
+        workers = min(self.fetch_concurrency, len(sensor_ids))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                (
+                    sid,
+                    executor.submit(self._query_one_sensor, sid, start_time, end_time),
                 )
-                items.extend(response.get("Items", []))
-
-                while "LastEvaluatedKey" in response:
-                    response = self.table.query(
-                        KeyConditionExpression=(
-                            Key("sensor_id").eq(sensor_id)
-                            & Key("timestamp").between(start_time, end_time)
-                        ),
-                        ExclusiveStartKey=response["LastEvaluatedKey"],
-                        ScanIndexForward=True,
-                    )
-                    items.extend(response.get("Items", []))
-
+                for sid in sensor_ids
+            ]
+            for sensor_id, future in futures:
+                try:
+                    items = future.result()
+                except Exception as e:
+                    logger.warning(f"Failed to query sensor {sensor_id}: {e}")
+                    continue
                 if items:
-                    items = [TelemetryFetcher.to_native(i) for i in items]
                     telemetry_by_sensor[sensor_id] = items
 
-            except Exception as e:
-                logger.warning(f"Failed to query sensor {sensor_id}: {e}")
-                continue
-
         total_records = sum(len(v) for v in telemetry_by_sensor.values())
         logger.info(
             f"Fetched {total_records} records for {len(telemetry_by_sensor)} sensors"
         )
         return telemetry_by_sensor
 
+    def _query_one_sensor(
+        self, sensor_id: str, start_time: int, end_time: int
+    ) -> List[Dict]:
+        """
+        Query one sensor's records in the time range, following pagination.
+
+        Returns: [records...] in timestamp order
+        """
+        items = self._iter_query(
+            **self._range_query_kwargs("sensor_id", sensor_id, start_time, end_time),
+            ScanIndexForward=True,
+        )
+        return [TelemetryFetcher.to_record(item) for item in items]
+
     def _fetch_all_sensors(
         self, start_time: int, end_time: int
     ) -> Dict[str, List[Dict]]:
@@ -136,37 +303,151 @@ class TelemetryFetcher:
         logger.info(f"Found {len(sensor_ids)} active sensors, querying each...")
         return self._fetch_by_sensors(sensor_ids, start_time, end_time)
 
+    def _parallel_scan(
+        self, start_time: int, end_time: int, total_segments: int
+    ) -> Dict[str, List[Dict]]:
+        """
+        Scan the time window in parallel segments and group by sensor.
+
+        One pass over the table replaces the discovery scan plus a Query per
+        sensor; segments run concurrently on the (thread-safe) low-level client.
+        Sensors whose items sit in a failed segment are missing from the
+        result (the failure is logged).
+
+        Returns: { sensor_id: [records...] }
+        """
+
+        def scan_segment(segment: int) -> List[Dict]:
+            return list(
+                self._iter_scan(
+                    FilterExpression=self.WINDOW_FILTER,
+                    ProjectionExpression=self.ANALYSIS_PROJECTION,
+                    ExpressionAttributeNames={
+                        **self.ANALYSIS_ATTRIBUTE_NAMES,
+                        "#ts": "timestamp",
+                    },
+                    ExpressionAttributeValues={
+                        ":start": _attribute_value(start_time),
+                        ":end": _attribute_value(end_time),
+                    },
+                    Segment=segment,
+                    TotalSegments=total_segments,
+                )
+            )
+
+        telemetry_by_sensor: Dict[str, List[Dict]] = {}
+
+        # A failed segment is logged and skipped; the other segments' sensors
+        # are still returned
+        with ThreadPoolExecutor(max_workers=total_segments) as executor:
+            futures = [
+                (segment, executor.submit(scan_segment, segment))
+                for segment in range(total_segments)
+            ]
+            for segment, future in futures:
+                try:
+                    items = future.result()
+                except Exception as e:
+                    logger.error(f"Scan segment {segment}/{total_segments} failed: {e}")
+                    continue
+                for item in items:
+                    record = TelemetryFetcher.to_record(item)
+                    sid = record.get("sensor_id")
+                    if not sid:
+                        continue
+                    telemetry_by_sensor.setdefault(sid, []).append(record)
+
+        # Scan order is arbitrary; callers expect ascending timestamps
+        for records in telemetry_by_sensor.values():
+            records.sort(key=lambda r: r.get("timestamp", 0))
+
+        total_records = sum(len(v) for v in telemetry_by_sensor.values())
+        logger.info(
+            f"Fetched {total_records} records for {len(telemetry_by_sensor)} sensors "
+            f"({total_segments} scan segments)"
+        )
+        return telemetry_by_sensor
+
     def _get_active_sensor_ids(self, start_time: int, end_time: int) -> List[str]:
         """
         Discover sensor IDs with data in the time range.
+
+        Uses the sensor registry index when enabled (reads one item per
+        sensor); falls back to a filtered table scan, split into
+        scan_segments parallel segments, when the registry is disabled,
+        missing or empty.
         """
-        sensor_ids = set()
+        if self.use_sensor_registry:
+            registered = self._query_sensor_registry(start_time)
+            if registered:
+                return registered
+            logger.warning("Sensor registry returned no sensors, falling back to scan")
 
-        try:
-            response = self.table.scan(
-                ProjectionExpression="sensor_id",
-                FilterExpression=Attr("timestamp").between(start_time, end_time),
-            )
+        total_segments = self.scan_segments
 
-            for item in response.get("Items", []):
+        def scan_segment(segment: int) -> set:
+            sids = set()
+            for item in self._iter_scan(
+                ProjectionExpression="sensor_id",
+                FilterExpression=self.WINDOW_FILTER,
+                ExpressionAttributeNames={"#ts": "timestamp"},
+                ExpressionAttributeValues={
+                    ":start": _attribute_value(start_time),
+                    ":end": _attribute_value(end_time),
+                },
+                Segment=segment,
+                TotalSegments=total_segments,
+            ):
                 if "sensor_id" in item:
-                    sensor_ids.add(item["sensor_id"])
+                    sids.add(item["sensor_id"]["S"])
+            return sids
 
-            while "LastEvaluatedKey" in response:
-                response = self.table.scan(
-                    ProjectionExpression="sensor_id",
-                    FilterExpression=Attr("timestamp").between(start_time, end_time),
-                    ExclusiveStartKey=response["LastEvaluatedKey"],
-                )
-                for item in response.get("Items", []):
-                    if "sensor_id" in item:
-                        sensor_ids.add(item["sensor_id"])
+        sensor_ids = set()
+
+        try:
+            with ThreadPoolExecutor(max_workers=total_segments) as executor:
+                for sids in executor.map(scan_segment, range(total_segments)):
+                    sensor_ids |= sids
 
         except Exception as e:
             logger.exception(f"Failed to scan for sensor IDs: {e}")
 
         return list(sensor_ids)
 
+    def _query_sensor_registry(self, start_time: int) -> Optional[List[str]]:
+        """
+        List sensors seen since start_time from the SensorRegistryIndex GSI.
+
+        Returns None when the index is unavailable or the query fails (so
+        callers can scan instead).
+        """
+        sensor_ids: List[str] = []
+
+        try:
+            for item in self._iter_query(
+                IndexName=self.SENSOR_REGISTRY_INDEX,
+                KeyConditionExpression="registry_pk = :pk AND last_seen >= :since",
+                ExpressionAttributeValues={
+                    ":pk": _attribute_value(self.SENSOR_REGISTRY_PK),
+                    ":since": _attribute_value(start_time),
+                },
+                ProjectionExpression="sensor_id",
+            ):
+                if "sensor_id" in item:
+                    sensor_ids.append(item["sensor_id"]["S"])
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            if code in ("ResourceNotFoundException", "ValidationException"):
+                logger.warning(f"Sensor registry index unavailable ({code})")
+                return None
+            logger.exception(f"Failed to query sensor registry: {e}")
+            return None
+        except Exception as e:
+            logger.exception(f"Failed to query sensor registry: {e}")
+            return None
+
+        return sensor_ids
+
     # Optional GSI-based methods
     def fetch_by_hazard_level(
         self, hazard_level: str, start_time: int, end_time: int
@@ -183,32 +464,15 @@ class TelemetryFetcher:
         telemetry_by_sensor: Dict[str, List[Dict]] = {}
 
         try:
-            items: List[Dict] = []
-            response = self.table.query(
+            items = self._iter_query(
                 IndexName=self.HAZARD_LEVEL_INDEX,
-                KeyConditionExpression=(
-                    Key("hazard_level").eq(hazard_level)
-                    & Key("timestamp").between(start_time, end_time)
+                **self._range_query_kwargs(
+                    "hazard_level", hazard_level, start_time, end_time
                 ),
                 ScanIndexForward=True,
             )
-            items.extend(response.get("Items", []))
-
-            while "LastEvaluatedKey" in response:
-                response = self.table.query(
-                    IndexName=self.HAZARD_LEVEL_INDEX,
-                    KeyConditionExpression=(
-                        Key("hazard_level").eq(hazard_level)
-                        & Key("timestamp").between(start_time, end_time)
-                    ),
-                    ExclusiveStartKey=response["LastEvaluatedKey"],
-                    ScanIndexForward=True,
-                )
-                items.extend(response.get("Items", []))
 
-            items = [TelemetryFetcher.to_native(i) for i in items]
-
-            for item in items:
+            for item in map(TelemetryFetcher.to_record, items):
                 sid = item.get("sensor_id")
                 if not sid:
                     continue
@@ -240,32 +504,13 @@ class TelemetryFetcher:
         telemetry_by_sensor: Dict[str, List[Dict]] = {}
 
         try:
-            items: List[Dict] = []
-            response = self.table.query(
+            items = self._iter_query(
                 IndexName=self.SPATIAL_INDEX,
-                KeyConditionExpression=(
-                    Key("geohash").eq(geohash)
-                    & Key("timestamp").between(start_time, end_time)
-                ),
+                **self._range_query_kwargs("geohash", geohash, start_time, end_time),
                 ScanIndexForward=True,
             )
-            items.extend(response.get("Items", []))
-
-            while "LastEvaluatedKey" in response:
-                response = self.table.query(
-                    IndexName=self.SPATIAL_INDEX,
-                    KeyConditionExpression=(
-                        Key("geohash").eq(geohash)
-                        & Key("timestamp").between(start_time, end_time)
-                    ),
-                    ExclusiveStartKey=response["LastEvaluatedKey"],
-                    ScanIndexForward=True,
-                )
-                items.extend(response.get("Items", []))
-
-            items = [TelemetryFetcher.to_native(i) for i in items]
 
-            for item in items:
+            for item in map(TelemetryFetcher.to_record, items):
                 sid = item.get("sensor_id")
                 if not sid:
                     continue
@@ -292,7 +537,8 @@ class TelemetryFetcher:
         Optimisation:
         - If sensor_ids is known, does Query per sensor with:
             ScanIndexForward=False, Limit=1
-        - If sensor_ids is None, discovers sensors (scan) then queries each.
+        - If sensor_ids is None, discovers sensors (registry or scan) then
+          queries each.
         """
         end_time = int(time.time())
         start_time = end_time - (lookback_hours * 3600)
@@ -304,17 +550,17 @@ class TelemetryFetcher:
 
         for sensor_id in sensor_ids:
             try:
-                resp = self.table.query(
-                    KeyConditionExpression=(
-                        Key("sensor_id").eq(sensor_id)
-                        & Key("timestamp").between(start_time, end_time)
+                resp = self._client.query(
+                    TableName=self.table_name,
+                    **self._range_query_kwargs(
+                        "sensor_id", sensor_id, start_time, end_time
                     ),
                     ScanIndexForward=False,
                     Limit=1,
                 )
                 items = resp.get("Items", [])
                 if items:
-                    latest_by_sensor[sensor_id] = TelemetryFetcher.to_native(items[0])
+                    latest_by_sensor[sensor_id] = TelemetryFetcher.to_record(items[0])
             except Exception as e:
                 logger.warning(f"Failed to fetch latest for {sensor_id}: {e}")
 
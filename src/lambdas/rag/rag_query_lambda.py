@@ -4,19 +4,25 @@ Connects sensor locations to hazard zones using DynamoDB GeoHashIndex
 
 - Uses pygeohash for encoding
 - Uses precision=4 by default (matches GeoHashIndex partition key like "tc1x")
-- Uses an internal neighbour implementation
+- Uses the shared geohash_cells neighbour implementation
 """
 
 from __future__ import annotations
 
-import json
 import math
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import boto3
-from boto3.dynamodb.conditions import Key
+import numpy as np
+import orjson
+from botocore.config import Config
+from geohash_cells import adjacent, geohash_bounds, geohash_neighbors_8
 
 try:
     import pygeohash as pgh
@@ -33,84 +39,6 @@ except ImportError:
     PINECONE_AVAILABLE = False
 
 
-# Geohash neighbour support
-_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
-_NEIGHBORS = {
-    "right": {
-        "even": "bc01fg45238967deuvhjyznpkmstqrwx",
-        "odd": "p0r21436x8zb9dcf5h7kjnmqesgutwvy",
-    },
-    "left": {
-        "even": "238967debc01fg45kmstqrwxuvhjyznp",
-        "odd": "14365h7k9dcfesgujnmqp0r2twvyx8zb",
-    },
-    "top": {
-        "even": "p0r21436x8zb9dcf5h7kjnmqesgutwvy",
-        "odd": "bc01fg45238967deuvhjyznpkmstqrwx",
-    },
-    "bottom": {
-        "even": "14365h7k9dcfesgujnmqp0r2twvyx8zb",
-        "odd": "238967debc01fg45kmstqrwxuvhjyznp",
-    },
-}
-_BORDERS = {
-    "right": {"even": "bcfguvyz", "odd": "prxz"},
-    "left": {"even": "0145hjnp", "odd": "028b"},
-    "top": {"even": "prxz", "odd": "bcfguvyz"},
-    "bottom": {"even": "028b", "odd": "0145hjnp"},
-}
-
-
-def _adjacent(geohash: str, direction: str) -> str:
-    if not geohash:
-        return ""
-
-    geohash = geohash.lower()
-    last = geohash[-1]
-    parent = geohash[:-1]
-    t = "even" if (len(geohash) % 2 == 0) else "odd"
-
-    if last in _BORDERS[direction][t] and parent:
-        parent = _adjacent(parent, direction)
-
-    idx = _NEIGHBORS[direction][t].find(last)
-    if idx < 0:
-        return ""
-
-    return parent + _BASE32[idx]
-
-
-def geohash_neighbors_8(cell: str) -> List[str]:
-    cell = (cell or "").lower()
-    if not cell:
-        return []
-
-    top = _adjacent(cell, "top")
-    bottom = _adjacent(cell, "bottom")
-    right = _adjacent(cell, "right")
-    left = _adjacent(cell, "left")
-
-    candidates = [
-        cell,
-        top,
-        bottom,
-        right,
-        left,
-        _adjacent(top, "right") if top else "",
-        _adjacent(top, "left") if top else "",
-        _adjacent(bottom, "right") if bottom else "",
-        _adjacent(bottom, "left") if bottom else "",
-    ]
-
-    seen = set()
-    out: List[str] = []
-    for c in candidates:
-        if c and len(c) == len(cell) and c not in seen:
-            seen.add(c)
-            out.append(c)
-    return out
-
-
 # Env
 AWS_REGION = os.environ.get("AWS_REGION", "")
 DYNAMODB_TABLE = os.environ.get("DYNAMODB_TABLE_NAME", "")
@@ -122,8 +50,19 @@ PINECONE_API_KEY = os.environ.get("PINECONE_API_KEY")
 PINECONE_INDEX_NAME = os.environ.get("PINECONE_INDEX_NAME", "")
 PINECONE_NAMESPACE = os.environ.get("PINECONE_NAMESPACE", "")
 
-dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
+# Keep-alive connections are reused across warm invocations; the pool covers
+# the concurrent geohash cell queries
+boto_config = Config(
+    max_pool_connections=int(os.environ.get("BOTO_MAX_POOL", "32")),
+    retries={"mode": "adaptive", "max_attempts": 5},
+    tcp_keepalive=True,
+)
+dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION, config=boto_config)
 table = dynamodb.Table(DYNAMODB_TABLE)
+# Paginator on the resource's client: items still come back deserialised
+query_paginator = dynamodb.meta.client.get_paginator("query")
+# Neighbour-cell lookups (centre + 8) run concurrently; reused across invocations
+cell_executor = ThreadPoolExecutor(max_workers=9)
 
 pinecone_index = None
 if PINECONE_AVAILABLE and PINECONE_API_KEY:
@@ -135,6 +74,124 @@ if PINECONE_AVAILABLE and PINECONE_API_KEY:
         pinecone_index = None
 
 
+# Candidate scan reads only what distance filtering needs (plus the table
+# key); full zone details are fetched for the zones that are returned
+ZONE_CANDIDATE_ATTRIBUTES = (
+    "zone_id",
+    "version",
+    "centroid_lat",
+    "centroid_lon",
+    "hazard_level",
+    "level",
+    "geohash",
+)
+ZONE_CANDIDATE_NAMES = {f"#z{i}": a for i, a in enumerate(ZONE_CANDIDATE_ATTRIBUTES)}
+ZONE_CANDIDATE_PROJECTION = ", ".join(ZONE_CANDIDATE_NAMES)
+
+# BatchGetItem key limit
+BATCH_GET_MAX_KEYS = 100
+
+# Hazard zones are static reference data: warm containers reuse cell query
+# results for ZONE_CACHE_TTL_S seconds (LRU-bounded)
+ZONE_CACHE_TTL_S = float(os.environ.get("ZONE_CACHE_TTL_S", "300"))
+ZONE_CACHE_MAX_ENTRIES = 1024
+_zone_cache: "OrderedDict[Tuple[str, str], Tuple[float, List[Dict[str, Any]]]]" = (
+    OrderedDict()
+)
+_zone_cache_lock = threading.Lock()
+
+
+def _query_cell(geohash: str) -> List[Dict[str, Any]]:
+    """
+    Candidate zones (projected attributes) indexed under one geohash cell.
+    """
+    items: List[Dict[str, Any]] = []
+    for page in query_paginator.paginate(
+        TableName=DYNAMODB_TABLE,
+        IndexName=GEOHASH_INDEX_NAME,
+        KeyConditionExpression="geohash = :gh",
+        ProjectionExpression=ZONE_CANDIDATE_PROJECTION,
+        ExpressionAttributeNames=dict(ZONE_CANDIDATE_NAMES),
+        ExpressionAttributeValues={":gh": geohash},
+    ):
+        items.extend(page.get("Items", []))
+    return items
+
+
+def _cached_query_cell(geohash: str) -> List[Dict[str, Any]]:
+    """
+    _query_cell through the in-process TTL cache. Failed queries are not cached.
+    """
+    key = (geohash, GEOHASH_INDEX_NAME)
+    now = time.monotonic()
+
+    with _zone_cache_lock:
+        entry = _zone_cache.get(key)
+        if entry and now - entry[0] < ZONE_CACHE_TTL_S:
+            _zone_cache.move_to_end(key)
+            return entry[1]
+
+    items = _query_cell(geohash)
+
+    with _zone_cache_lock:
+        _zone_cache[key] = (now, items)
+        _zone_cache.move_to_end(key)
+        while len(_zone_cache) > ZONE_CACHE_MAX_ENTRIES:
+            _zone_cache.popitem(last=False)
+
+    return items
+
+
+def _zone_details(candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Full hazard zone items for projected candidates, in the same order.
+
+    Fetched with BatchGetItem on the table key (zone_id, version). A
+    candidate whose details cannot be fetched is returned as is.
+    """
+    # BatchGetItem rejects duplicate keys
+    keys = [
+        {"zone_id": zone_id, "version": version}
+        for zone_id, version in dict.fromkeys(
+            (c["zone_id"], c["version"])
+            for c in candidates
+            if "zone_id" in c and "version" in c
+        )
+    ]
+    found: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+
+    try:
+        for i in range(0, len(keys), BATCH_GET_MAX_KEYS):
+            request = {DYNAMODB_TABLE: {"Keys": keys[i : i + BATCH_GET_MAX_KEYS]}}
+            while request:
+                resp = dynamodb.batch_get_item(RequestItems=request)
+                for item in resp.get("Responses", {}).get(DYNAMODB_TABLE, []):
+                    found[(item.get("zone_id"), item.get("version"))] = item
+                request = resp.get("UnprocessedKeys") or None
+    except Exception as e:
+        print(f"Error fetching zone details: {e}")
+
+    return [found.get((c.get("zone_id"), c.get("version")), c) for c in candidates]
+
+
+def _query_cells(cells: List[str]) -> List[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Query several geohash cells concurrently.
+
+    Returns (cell, items) pairs in the order of cells; a cell whose query
+    fails contributes no items.
+    """
+
+    def query(gh: str) -> List[Dict[str, Any]]:
+        try:
+            return _cached_query_cell(gh)
+        except Exception as e:
+            print(f"Error querying geohash {gh}: {e}")
+            return []
+
+    return list(zip(cells, cell_executor.map(query, cells)))
+
+
 class GeoCalculator:
     EARTH_RADIUS_KM = 6371.0
 
@@ -154,13 +211,118 @@ class GeoCalculator:
         c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
         return (GeoCalculator.EARTH_RADIUS_KM * c) * 1000.0
 
+    @staticmethod
+    def haversine_distance_m_vec(
+        lat1: float, lon1: float, lats: np.ndarray, lons: np.ndarray
+    ) -> np.ndarray:
+        """
+        Distances (m) from one point to many, in a single NumPy pass.
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+
+        lat1_rad = math.radians(lat1)
+        lats_rad = np.radians(lats)
+        dlat = lats_rad - lat1_rad
+        dlon = np.radians(lons - lon1)
+
+        a = (
+            np.sin(dlat / 2) ** 2
+            + math.cos(lat1_rad) * np.cos(lats_rad) * np.sin(dlon / 2) ** 2
+        )
+        c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+        return (GeoCalculator.EARTH_RADIUS_KM * c) * 1000.0
+
+    @staticmethod
+    def centroid_arrays(items: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Zone centroid latitudes and longitudes as float arrays.
+        """
+        lats = np.fromiter(
+            (float(item["centroid_lat"]) for item in items), np.float64, len(items)
+        )
+        lons = np.fromiter(
+            (float(item["centroid_lon"]) for item in items), np.float64, len(items)
+        )
+        return lats, lons
+
+    @staticmethod
+    def cell_min_distance_m(lat: float, lon: float, cell: str) -> float:
+        """
+        Lower bound on the distance (m) from a point to anything in a cell.
+
+        Beside the cell (longitude outside it) the nearest point lies on the
+        closer meridian edge: where the great circle meets that edge at right
+        angles (poleward of the point's own latitude), or else at a corner.
+        """
+        south, north, west, east = geohash_bounds(cell)
+        edge_lon = min(max(lon, west), east)
+        if edge_lon == lon:
+            return GeoCalculator.haversine_distance_m(
+                lat, lon, min(max(lat, south), north), lon
+            )
+
+        dlon = math.radians(lon - edge_lon)
+        lat_rad = math.radians(lat)
+        if math.cos(dlon) > 0:
+            foot_lat = math.degrees(math.atan(math.tan(lat_rad) / math.cos(dlon)))
+            if south <= foot_lat <= north:
+                cross = math.asin(min(1.0, math.cos(lat_rad) * abs(math.sin(dlon))))
+                return GeoCalculator.EARTH_RADIUS_KM * cross * 1000.0
+        return min(
+            GeoCalculator.haversine_distance_m(lat, lon, south, edge_lon),
+            GeoCalculator.haversine_distance_m(lat, lon, north, edge_lon),
+        )
+
     @staticmethod
     def calculate_geohash(lat: float, lon: float, precision: int) -> str:
         return pgh.encode(lat, lon, precision=precision)
 
     @staticmethod
     def get_geohash_neighbors(geohash: str) -> List[str]:
-        return geohash_neighbors_8(geohash)
+        return list(geohash_neighbors_8(geohash))
+
+
+# Upper bound on cells a single query fans out to (very large radii)
+MAX_COVER_CELLS = 49
+
+
+def _cells_covering(
+    lat: float, lon: float, radius_m: float, precision: int = GEOHASH_PRECISION
+) -> List[str]:
+    """
+    Geohash cells that intersect the circle of radius_m around a point.
+
+    The point's own cell comes first; neighbours are added ring by ring
+    (through edge-adjacent cells) while their box is within radius_m. A
+    circle inside its cell needs one query, a large radius gets more than
+    the fixed 3x3 ring.
+    """
+    center = GeoCalculator.calculate_geohash(lat, lon, precision=precision)
+    cells = [center]
+    seen = {center}
+    frontier = [center]
+
+    while frontier:
+        ring: List[str] = []
+        for cell in frontier:
+            for direction in ("top", "bottom", "right", "left"):
+                neighbour = adjacent(cell, direction)
+                if not neighbour or neighbour in seen:
+                    continue
+                seen.add(neighbour)
+                if GeoCalculator.cell_min_distance_m(lat, lon, neighbour) <= radius_m:
+                    ring.append(neighbour)
+        if len(cells) + len(ring) > MAX_COVER_CELLS:
+            print(f"Radius {radius_m:.0f}m covers more than {MAX_COVER_CELLS} cells")
+            # Keep the ring's cells nearest the point
+            ring.sort(key=lambda c: GeoCalculator.cell_min_distance_m(lat, lon, c))
+            cells.extend(ring[: MAX_COVER_CELLS - len(cells)])
+            break
+        cells.extend(ring)
+        frontier = ring
+
+    return cells
 
 
 class RAGQueryHandler:
@@ -168,69 +330,86 @@ class RAGQueryHandler:
     def query_nearest_zone(
         latitude: float, longitude: float, max_distance_km: float = 5.0
     ) -> Dict[str, Any]:
-        geohash = GeoCalculator.calculate_geohash(
-            latitude, longitude, precision=GEOHASH_PRECISION
-        )
-        cells = GeoCalculator.get_geohash_neighbors(geohash)
+        limit_m = max_distance_km * 1000.0
+        cells = _cells_covering(latitude, longitude, limit_m)
+        geohash = cells[0]
 
         print(
             f"Geohash={geohash} precision={GEOHASH_PRECISION} cells={len(cells)} index={GEOHASH_INDEX_NAME}"
         )
 
-        nearest_zone = None
+        nearest = None
         min_distance = float("inf")
 
-        for gh in cells:
-            try:
-                resp = table.query(
-                    IndexName=GEOHASH_INDEX_NAME,
-                    KeyConditionExpression=Key("geohash").eq(gh),
-                )
-
-                for item in resp.get("Items", []):
-                    zone_lat = float(item["centroid_lat"])
-                    zone_lon = float(item["centroid_lon"])
-                    dist_m = GeoCalculator.haversine_distance_m(
-                        latitude, longitude, zone_lat, zone_lon
+        # Zones are indexed by their centroid's cell, so a neighbour cell can
+        # only hold a closer zone when its box is nearer than the current
+        # best: query the centre cell first, then only the neighbours that
+        # could still win
+        for batch in (cells[:1], cells[1:]):
+            reach = min(min_distance, limit_m)
+            batch = [
+                gh
+                for gh in batch
+                if GeoCalculator.cell_min_distance_m(latitude, longitude, gh) <= reach
+            ]
+
+            for gh, items in _query_cells(batch):
+                try:
+                    if not items:
+                        continue
+
+                    # Distances for the whole cell at once; only the closest
+                    # zone can become the new nearest
+                    lats, lons = GeoCalculator.centroid_arrays(items)
+                    dists = GeoCalculator.haversine_distance_m_vec(
+                        latitude, longitude, lats, lons
                     )
+                    best = int(np.argmin(dists))
+                    dist_m = float(dists[best])
 
-                    if dist_m <= (max_distance_km * 1000.0) and dist_m < min_distance:
+                    if dist_m <= limit_m and dist_m < min_distance:
                         min_distance = dist_m
-                        hazard_level = item.get("hazard_level") or item.get(
-                            "level", "Unknown"
+                        nearest = (
+                            items[best],
+                            gh,
+                            float(lats[best]),
+                            float(lons[best]),
                         )
 
-                        nearest_zone = {
-                            "zone_id": item.get("zone_id", "Unknown"),
-                            "hazard_level": hazard_level,
-                            "level": hazard_level,
-                            "distance_meters": round(dist_m, 2),
-                            "distance_m": round(dist_m, 2),
-                            "centroid": {"lat": zone_lat, "lon": zone_lon},
-                            "geohash": item.get("geohash", gh),
-                            "district": item.get("district", "Unknown"),
-                            "ds_division": item.get("ds_division", "Unknown"),
-                            "gn_division": item.get("gn_division", "Unknown"),
-                            "soil_type": item.get("soil_type", "Unknown"),
-                            "land_use": item.get("land_use", "Unknown"),
-                            "landslide_type": item.get("landslide_type", "Unknown"),
-                            "area_sqm": (
-                                float(item.get("metadata", {}).get("shape_area", 0))
-                                if item.get("metadata")
-                                else 0
-                            ),
-                            "metadata": RAGQueryHandler._serialize_metadata(
-                                item.get("metadata", {})
-                            ),
-                        }
-
-                        if item.get("slope_angle") is not None:
-                            nearest_zone["slope_angle"] = float(item["slope_angle"])
+                except Exception as e:
+                    print(f"Error querying geohash {gh}: {e}")
+
+        if nearest:
+            candidate, gh, zone_lat, zone_lon = nearest
+            item = _zone_details([candidate])[0]
+            hazard_level = item.get("hazard_level") or item.get("level", "Unknown")
+            nearest_zone = {
+                "zone_id": item.get("zone_id", "Unknown"),
+                "hazard_level": hazard_level,
+                "level": hazard_level,
+                "distance_meters": round(min_distance, 2),
+                "distance_m": round(min_distance, 2),
+                "centroid": {"lat": zone_lat, "lon": zone_lon},
+                "geohash": item.get("geohash", gh),
+                "district": item.get("district", "Unknown"),
+                "ds_division": item.get("ds_division", "Unknown"),
+                "gn_division": item.get("gn_division", "Unknown"),
+                "soil_type": item.get("soil_type", "Unknown"),
+                "land_use": item.get("land_use", "Unknown"),
+                "landslide_type": item.get("landslide_type", "Unknown"),
+                "area_sqm": (
+                    float(item.get("metadata", {}).get("shape_area", 0))
+                    if item.get("metadata")
+                    else 0
+                ),
+                "metadata": RAGQueryHandler._serialize_metadata(
+                    item.get("metadata", {})
+                ),
+            }
 
-            except Exception as e:
-                print(f"Error querying geohash {gh}: {e}")
+            if item.get("slope_angle") is not None:
+                nearest_zone["slope_angle"] = float(item["slope_angle"])
 
-        if nearest_zone:
             return {
                 "success": True,
                 "nearest_zone": nearest_zone,
@@ -250,53 +429,60 @@ class RAGQueryHandler:
     def query_zones_in_radius(
         latitude: float, longitude: float, radius_km: float = 1.0
     ) -> Dict[str, Any]:
-        geohash = GeoCalculator.calculate_geohash(
-            latitude, longitude, precision=GEOHASH_PRECISION
-        )
-        cells = GeoCalculator.get_geohash_neighbors(geohash)
+        cells = _cells_covering(latitude, longitude, radius_km * 1000.0)
 
         zones: List[Dict[str, Any]] = []
+        hits: List[Tuple[Dict[str, Any], str, float, float, float]] = []
+        # A zone can come back from more than one cell; keep its first hit
+        seen_zone_ids: set = set()
 
-        for gh in cells:
+        for gh, items in _query_cells(cells):
             try:
-                resp = table.query(
-                    IndexName=GEOHASH_INDEX_NAME,
-                    KeyConditionExpression=Key("geohash").eq(gh),
+                if not items:
+                    continue
+
+                lats, lons = GeoCalculator.centroid_arrays(items)
+                dists = GeoCalculator.haversine_distance_m_vec(
+                    latitude, longitude, lats, lons
                 )
 
-                for item in resp.get("Items", []):
-                    zone_lat = float(item["centroid_lat"])
-                    zone_lon = float(item["centroid_lon"])
-                    dist_m = GeoCalculator.haversine_distance_m(
-                        latitude, longitude, zone_lat, zone_lon
+                for i in np.flatnonzero(dists <= (radius_km * 1000.0)).tolist():
+                    zone_id = items[i].get("zone_id")
+                    if zone_id is not None:
+                        if zone_id in seen_zone_ids:
+                            continue
+                        seen_zone_ids.add(zone_id)
+                    hits.append(
+                        (items[i], gh, float(lats[i]), float(lons[i]), dists[i])
                     )
 
-                    if dist_m <= (radius_km * 1000.0):
-                        hazard_level = item.get("hazard_level") or item.get(
-                            "level", "Unknown"
-                        )
-                        zones.append(
-                            {
-                                "zone_id": item.get("zone_id", "Unknown"),
-                                "hazard_level": hazard_level,
-                                "level": hazard_level,
-                                "distance_meters": round(dist_m, 2),
-                                "distance_m": round(dist_m, 2),
-                                "centroid": {"lat": zone_lat, "lon": zone_lon},
-                                "geohash": item.get("geohash", gh),
-                                "district": item.get("district", "Unknown"),
-                                "soil_type": item.get("soil_type", "Unknown"),
-                                "area_sqm": (
-                                    float(item.get("metadata", {}).get("shape_area", 0))
-                                    if item.get("metadata")
-                                    else 0
-                                ),
-                            }
-                        )
-
             except Exception as e:
                 print(f"Error querying geohash {gh}: {e}")
 
+        # Result dicts are built only for zones inside the radius
+        details = _zone_details([hit[0] for hit in hits])
+        for item, (_, gh, zone_lat, zone_lon, dist_m) in zip(details, hits):
+            dist_m = float(dist_m)
+            hazard_level = item.get("hazard_level") or item.get("level", "Unknown")
+            zones.append(
+                {
+                    "zone_id": item.get("zone_id", "Unknown"),
+                    "hazard_level": hazard_level,
+                    "level": hazard_level,
+                    "distance_meters": round(dist_m, 2),
+                    "distance_m": round(dist_m, 2),
+                    "centroid": {"lat": zone_lat, "lon": zone_lon},
+                    "geohash": item.get("geohash", gh),
+                    "district": item.get("district", "Unknown"),
+                    "soil_type": item.get("soil_type", "Unknown"),
+                    "area_sqm": (
+                        float(item.get("metadata", {}).get("shape_area", 0))
+                        if item.get("metadata")
+                        else 0
+                    ),
+                }
+            )
+
         zones.sort(key=lambda x: x["distance_meters"])
 
         level_counts: Dict[str, int] = {}
@@ -332,8 +518,24 @@ class RAGQueryHandler:
             "suggestion": "Use nearest or radius queries instead",
         }
 
+    @staticmethod
+    def _has_decimal(value: Any) -> bool:
+        if isinstance(value, Decimal):
+            return True
+        if isinstance(value, dict):
+            return any(RAGQueryHandler._has_decimal(v) for v in value.values())
+        if isinstance(value, list):
+            return any(RAGQueryHandler._has_decimal(v) for v in value)
+        return False
+
     @staticmethod
     def _serialize_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+        if not metadata:
+            return {}
+        # Metadata without Decimals is returned as is (no copy)
+        if not RAGQueryHandler._has_decimal(metadata):
+            return metadata
+
         out: Dict[str, Any] = {}
         for k, v in (metadata or {}).items():
             if isinstance(v, Decimal):
@@ -365,7 +567,7 @@ def _parse_event(event: Any) -> Dict[str, Any]:
     """Supports direct invoke payloads and API Gateway/Lambda URL style payloads."""
     if isinstance(event, dict) and isinstance(event.get("body"), str):
         try:
-            return json.loads(event["body"])
+            return orjson.loads(event["body"])
         except Exception:
             return event
     if isinstance(event, dict):
@@ -373,9 +575,54 @@ def _parse_event(event: Any) -> Dict[str, Any]:
     return {}
 
 
+def _json_default(obj: Any) -> Any:
+    """orjson fallback for types it does not serialise natively."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (bytes, bytearray)):
+        return obj.decode()
+    return str(obj)
+
+
+def _dumps(result: Dict[str, Any]) -> bytes:
+    """JSON-encode a result (Decimal, NumPy and other values via _json_default)."""
+    return orjson.dumps(
+        result,
+        default=_json_default,
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+    )
+
+
+def _response(
+    result: Dict[str, Any], status_code: int, envelope: bool, cors: bool = False
+) -> Dict[str, Any]:
+    """
+    Wrap a result in the HTTP proxy envelope, or return it bare.
+
+    Direct Lambda invokers that set "envelope": false receive the result dict
+    itself, avoiding a second JSON encode/decode of the body. The bare result
+    still goes through _json_default (one orjson round trip): the runtime's
+    own json encoder rejects Decimal and datetime values.
+    """
+    if not envelope:
+        return orjson.loads(_dumps(result))
+
+    headers = {"Content-Type": "application/json"}
+    if cors:
+        headers["Access-Control-Allow-Origin"] = "*"
+
+    return {
+        "statusCode": status_code,
+        "headers": headers,
+        "body": _dumps(result).decode(),
+    }
+
+
 def lambda_handler(event: Any, context: Any) -> Dict[str, Any]:
+    envelope = True
     try:
         ev = _parse_event(event)
+        envelope = ev.get("envelope", True) is not False
         action = ev.get("action", "nearest")
 
         if action == "nearest":
@@ -403,27 +650,16 @@ def lambda_handler(event: Any, context: Any) -> Dict[str, Any]:
         else:
             result = {"success": False, "error": f"Unknown action: {action}"}
 
-        return {
-            "statusCode": 200 if result.get("success") else 400,
-            "headers": {
-                "Content-Type": "application/json",
-                "Access-Control-Allow-Origin": "*",
-            },
-            "body": json.dumps(result, default=str),
-        }
+        return _response(
+            result, 200 if result.get("success") else 400, envelope, cors=True
+        )
 
     except KeyError as e:
-        return {
-            "statusCode": 400,
-            "headers": {"Content-Type": "application/json"},
-            "body": json.dumps(
-                {"success": False, "error": f"Missing required parameter: {str(e)}"}
-            ),
-        }
+        return _response(
+            {"success": False, "error": f"Missing required parameter: {str(e)}"},
+            400,
+            envelope,
+        )
 
     except Exception as e:
-        return {
-            "statusCode": 500,
-            "headers": {"Content-Type": "application/json"},
-            "body": json.dumps({"success": False, "error": str(e)}),
-        }
+        return _response({"success": False, "error": str(e)}, 500, envelope)
@@ -0,0 +1,135 @@
+"""
+Geohash cell helpers (neighbours, bounds) shared by the RAG and telemetry
+ingestor Lambdas.
+
+Each Lambda's build.sh copies this file next to lambda_function.py.
+"""
+
+from functools import lru_cache
+from typing import Dict, Tuple
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_NEIGHBORS = {
+    "right": {
+        "even": "bc01fg45238967deuvhjyznpkmstqrwx",
+        "odd": "p0r21436x8zb9dcf5h7kjnmqesgutwvy",
+    },
+    "left": {
+        "even": "238967debc01fg45kmstqrwxuvhjyznp",
+        "odd": "14365h7k9dcfesgujnmqp0r2twvyx8zb",
+    },
+    "top": {
+        "even": "p0r21436x8zb9dcf5h7kjnmqesgutwvy",
+        "odd": "bc01fg45238967deuvhjyznpkmstqrwx",
+    },
+    "bottom": {
+        "even": "14365h7k9dcfesgujnmqp0r2twvyx8zb",
+        "odd": "238967debc01fg45kmstqrwxuvhjyznp",
+    },
+}
+_BORDERS = {
+    "right": {"even": "bcfguvyz", "odd": "prxz"},
+    "left": {"even": "0145hjnp", "odd": "028b"},
+    "top": {"even": "prxz", "odd": "bcfguvyz"},
+    "bottom": {"even": "028b", "odd": "0145hjnp"},
+}
+
+
+# (direction, parity, last char) -> (neighbour char, crosses parent border)
+_NEXT: Dict[Tuple[str, str, str], Tuple[str, bool]] = {
+    (direction, parity, last): (
+        _BASE32[_NEIGHBORS[direction][parity].index(last)],
+        last in _BORDERS[direction][parity],
+    )
+    for direction in _NEIGHBORS
+    for parity in ("even", "odd")
+    for last in _BASE32
+}
+
+
+@lru_cache(maxsize=8192)
+def adjacent(geohash: str, direction: str) -> str:
+    """
+    Edge-adjacent cell in direction ("top", "bottom", "right" or "left").
+
+    Cells wrap around the antimeridian; there is no cell beyond a pole, so
+    "" is returned there (and for an empty or invalid geohash).
+    """
+    if not geohash:
+        return ""
+
+    # Replace characters from the end, moving to the parent only while the
+    # step crosses a cell border
+    chars = list(geohash.lower())
+    i = len(chars) - 1
+    while i >= 0:
+        parity = "even" if (i + 1) % 2 == 0 else "odd"
+        step = _NEXT.get((direction, parity, chars[i]))
+        if step is None:
+            return ""
+        chars[i], crosses_border = step
+        if not crosses_border:
+            break
+        i -= 1
+
+    # Crossing the border of the whole world: east-west wraps, north-south
+    # would run past a pole
+    if i < 0 and direction in ("top", "bottom"):
+        return ""
+
+    return "".join(chars)
+
+
+@lru_cache(maxsize=4096)
+def geohash_bounds(cell: str) -> Tuple[float, float, float, float]:
+    """
+    Bounding box of a geohash cell as (south, north, west, east).
+    """
+    south, north, west, east = -90.0, 90.0, -180.0, 180.0
+    even = True
+    for ch in cell.lower():
+        bits = _BASE32.index(ch)
+        for shift in (4, 3, 2, 1, 0):
+            bit = (bits >> shift) & 1
+            if even:
+                mid = (west + east) / 2
+                if bit:
+                    west = mid
+                else:
+                    east = mid
+            else:
+                mid = (south + north) / 2
+                if bit:
+                    south = mid
+                else:
+                    north = mid
+            even = not even
+    return south, north, west, east
+
+
+@lru_cache(maxsize=4096)
+def geohash_neighbors_8(geohash: str) -> Tuple[str, ...]:
+    """
+    A cell followed by its (up to) 8 distinct neighbours.
+    """
+    cell = (geohash or "").lower()
+    if not cell:
+        return ()
+
+    top = adjacent(cell, "top")
+    bottom = adjacent(cell, "bottom")
+    right = adjacent(cell, "right")
+    left = adjacent(cell, "left")
+
+    candidates = (
+        cell,
+        top,
+        bottom,
+        right,
+        left,
+        adjacent(top, "right"),
+        adjacent(top, "left"),
+        adjacent(bottom, "right"),
+        adjacent(bottom, "left"),
+    )
+    return tuple(c for c in dict.fromkeys(candidates) if c and len(c) == len(cell))
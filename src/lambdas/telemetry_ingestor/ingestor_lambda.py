@@ -3,29 +3,106 @@ Telemetry Ingestor Lambda Handler
 """
 
 import json
+import logging
 import os
-import boto3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
 from decimal import Decimal
-import logging
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
 
+import boto3
 from boto3.dynamodb.conditions import Key
+from botocore.config import Config
+from geohash_cells import geohash_neighbors_8  # noqa: F401 (re-exported)
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger()
 logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
 
-dynamodb = boto3.resource("dynamodb")
-eventbridge = boto3.client("events")
+# Module-level clients with keep-alive connections, reused across warm
+# invocations (DynamoDB tables are bound lazily by _tables)
+boto_config = Config(
+    max_pool_connections=int(os.getenv("BOTO_MAX_POOL", "50")),
+    retries={"mode": "adaptive", "max_attempts": 3},
+    connect_timeout=1,
+    read_timeout=3,
+    tcp_keepalive=True,
+)
+eventbridge = boto3.client("events", config=boto_config)
 
 TELEMETRY_TABLE = os.getenv("TELEMETRY_TABLE", "")
 HAZARD_ZONES_TABLE = os.getenv("HAZARD_ZONES_TABLE", "")
 EVENT_BUS = os.getenv("EVENT_BUS", "default")
 ENABLE_NSDI_ENRICHMENT = os.getenv("ENABLE_NSDI_ENRICHMENT", "true").lower() == "true"
 ENABLE_EVENTBRIDGE = os.getenv("ENABLE_EVENTBRIDGE", "true").lower() == "true"
+ENABLE_SENSOR_REGISTRY = os.getenv("ENABLE_SENSOR_REGISTRY", "true").lower() == "true"
+
+
+@lru_cache(maxsize=None)
+def _tables() -> Tuple:
+    """
+    (telemetry_table, hazard_zones_table), built once per container.
+
+    Raises:
+        RuntimeError: If a required table name is not configured
+    """
+    if not TELEMETRY_TABLE:
+        raise RuntimeError("TELEMETRY_TABLE is not set")
+    if ENABLE_NSDI_ENRICHMENT and not HAZARD_ZONES_TABLE:
+        raise RuntimeError("HAZARD_ZONES_TABLE is not set")
+
+    dynamodb = boto3.resource("dynamodb", config=boto_config)
+    hazard_zones_table = (
+        dynamodb.Table(HAZARD_ZONES_TABLE) if HAZARD_ZONES_TABLE else None
+    )
+    return dynamodb.Table(TELEMETRY_TABLE), hazard_zones_table
 
-telemetry_table = dynamodb.Table(TELEMETRY_TABLE)
-hazard_zones_table = dynamodb.Table(HAZARD_ZONES_TABLE)
+
+# Hazard zone candidates per geohash4, kept across warm invocations:
+# geohash4 -> (time.monotonic() when fetched, zones)
+_HAZARD_CACHE: Dict[str, Tuple[float, List[Dict]]] = {}
+_HAZARD_CACHE_LOCK = threading.Lock()
+_HAZARD_TTL = int(os.getenv("HAZARD_CACHE_TTL_S", "300"))
+_HAZARD_CACHE_MAX_ENTRIES = 1024
+
+
+def _hazard_cache_get(geohash4: str) -> Optional[List[Dict]]:
+    entry = _HAZARD_CACHE.get(geohash4)
+    if entry and time.monotonic() - entry[0] < _HAZARD_TTL:
+        return entry[1]
+    return None
+
+
+def _hazard_cache_put(geohash4: str, zones: List[Dict]) -> None:
+    with _HAZARD_CACHE_LOCK:
+        _HAZARD_CACHE.pop(geohash4, None)
+        _HAZARD_CACHE[geohash4] = (time.monotonic(), zones)
+        # FIFO eviction (re-inserting moves a refreshed entry to the back)
+        while len(_HAZARD_CACHE) > _HAZARD_CACHE_MAX_ENTRIES:
+            _HAZARD_CACHE.pop(next(iter(_HAZARD_CACHE)))
+
+
+def _dumps(obj) -> str:
+    """JSON-encode to str (orjson when packaged, stdlib json otherwise)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=str).decode()
+    return json.dumps(obj, default=str)
+
+
+def _loads(data):
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 class ValidationError(Exception):
@@ -55,6 +132,8 @@ class TelemetryValidator:
         "safety_factor": (0, 10),
         "tilt_rate_mm_hr": (0, 50),
     }
+    # (field, min, max) rules, flattened once for the per-record loop
+    _RULES = tuple((f, lo, hi) for f, (lo, hi) in VALIDATION_RULES.items())
 
     @classmethod
     def validate(cls, telemetry: Dict) -> Tuple[bool, Optional[str]]:
@@ -88,12 +167,14 @@ class TelemetryValidator:
         ):
             return False, f"Invalid sensor_id: {telemetry.get('sensor_id')}"
 
-        for field, (min_val, max_val) in cls.VALIDATION_RULES.items():
+        for field, min_val, max_val in cls._RULES:
             if field in telemetry:
                 value = telemetry[field]
-                if not isinstance(value, (int, float)):
+                try:
+                    in_range = min_val <= value <= max_val
+                except TypeError:
                     return False, f"{field} must be numeric, got {type(value)}"
-                if not min_val <= value <= max_val:
+                if not in_range:
                     return False, f"{field}={value} out of range [{min_val}, {max_val}]"
 
         geohash = telemetry.get("geohash", "")
@@ -103,80 +184,19 @@ class TelemetryValidator:
         return True, None
 
 
-# Geohash neighbour support
-_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
-_NEIGHBORS = {
-    "right": {
-        "even": "bc01fg45238967deuvhjyznpkmstqrwx",
-        "odd": "p0r21436x8zb9dcf5h7kjnmqesgutwvy",
-    },
-    "left": {
-        "even": "238967debc01fg45kmstqrwxuvhjyznp",
-        "odd": "14365h7k9dcfesgujnmqp0r2twvyx8zb",
-    },
-    "top": {
-        "even": "p0r21436x8zb9dcf5h7kjnmqesgutwvy",
-        "odd": "bc01fg45238967deuvhjyznpkmstqrwx",
-    },
-    "bottom": {
-        "even": "14365h7k9dcfesgujnmqp0r2twvyx8zb",
-        "odd": "238967debc01fg45kmstqrwxuvhjyznp",
-    },
-}
-_BORDERS = {
-    "right": {"even": "bcfguvyz", "odd": "prxz"},
-    "left": {"even": "0145hjnp", "odd": "028b"},
-    "top": {"even": "prxz", "odd": "bcfguvyz"},
-    "bottom": {"even": "028b", "odd": "0145hjnp"},
-}
-
-
-def _adjacent(geohash: str, direction: str) -> str:
-    if not geohash:
-        return ""
-    geohash = geohash.lower()
-    last = geohash[-1]
-    parent = geohash[:-1]
-    t = "even" if len(geohash) % 2 == 0 else "odd"
-
-    if last in _BORDERS[direction][t] and parent:
-        parent = _adjacent(parent, direction)
-
-    idx = _NEIGHBORS[direction][t].find(last)
-    return parent + _BASE32[idx]
-
-
-def geohash_neighbors_8(geohash6: str) -> List[str]:
-    top = _adjacent(geohash6, "top")
-    bottom = _adjacent(geohash6, "bottom")
-    right = _adjacent(geohash6, "right")
-    left = _adjacent(geohash6, "left")
-
-    return list(
-        {
-            geohash6,
-            top,
-            bottom,
-            right,
-            left,
-            _adjacent(top, "right"),
-            _adjacent(top, "left"),
-            _adjacent(bottom, "right"),
-            _adjacent(bottom, "left"),
-        }
-    )
-
-
 def point_in_bbox(lat: float, lon: float, bbox: Dict) -> bool:
     try:
-        return (
-            bbox["min_lat"] <= Decimal(str(lat)) <= bbox["max_lat"]
-            and bbox["min_lon"] <= Decimal(str(lon)) <= bbox["max_lon"]
-        )
+        return float(bbox["min_lat"]) <= lat <= float(bbox["max_lat"]) and float(
+            bbox["min_lon"]
+        ) <= lon <= float(bbox["max_lon"])
     except Exception:
         return False
 
 
+# Location fields read for every enriched record, in one C-level lookup
+_GET_GEO = itemgetter("geohash", "latitude", "longitude")
+
+
 class NSDIEnricher:
     """
     Enrich telemetry with hazard-zone data.
@@ -189,9 +209,11 @@ class NSDIEnricher:
 
     HAZARD_RANK = {"Very High": 4, "High": 3, "Moderate": 2, "Low": 1, "Unknown": 0}
 
+    # Concurrent GeoHashIndex queries when prefetching a batch's cells
+    PREFETCH_WORKERS = 10
+
     def __init__(self, hazard_table):
         self.table = hazard_table
-        self.cache = {}
         self.index_name = os.getenv("HAZARD_GEOHASH_INDEX", "GeoHashIndex")
         self.index_key = os.getenv("HAZARD_GEOHASH_KEY", "geohash")
 
@@ -204,33 +226,48 @@ class NSDIEnricher:
         return float(v)
 
     @classmethod
-    def _bbox_contains(cls, bbox: dict, lat: float, lon: float) -> bool:
+    def _float_bbox(cls, bbox: dict) -> Optional[Tuple[float, float, float, float]]:
         if not bbox:
-            return False
+            return None
 
-        min_lat = cls._to_float(bbox.get("min_lat"))
-        max_lat = cls._to_float(bbox.get("max_lat"))
-        min_lon = cls._to_float(bbox.get("min_lon"))
-        max_lon = cls._to_float(bbox.get("max_lon"))
+        edges = tuple(
+            cls._to_float(bbox.get(k))
+            for k in ("min_lat", "max_lat", "min_lon", "max_lon")
+        )
+        return None if None in edges else edges
 
-        if None in (min_lat, max_lat, min_lon, max_lon):
-            return False
+    @classmethod
+    def _zone_bbox(cls, zone: dict) -> Optional[Tuple[float, float, float, float]]:
+        """Float bounding box of a zone, converted once and kept on the zone."""
+        if "_bbox_f" not in zone:
+            zone["_bbox_f"] = cls._float_bbox(zone.get("bounding_box"))
+        return zone["_bbox_f"]
 
+    @staticmethod
+    def _edges_contain(edges, lat: float, lon: float) -> bool:
+        if edges is None:
+            return False
+        min_lat, max_lat, min_lon, max_lon = edges
         return (min_lat <= lat <= max_lat) and (min_lon <= lon <= max_lon)
 
+    @classmethod
+    def _bbox_contains(cls, bbox: dict, lat: float, lon: float) -> bool:
+        return cls._edges_contain(cls._float_bbox(bbox), lat, lon)
+
     def _pick_best_zone(self, zones: list, lat: float, lon: float) -> dict | None:
         contained = [
-            z for z in zones if self._bbox_contains(z.get("bounding_box"), lat, lon)
+            z for z in zones if self._edges_contain(self._zone_bbox(z), lat, lon)
         ]
         candidates = contained if contained else zones
         if not candidates:
             return None
 
-        def hazard_rank(zone):
-            level = zone.get("level") or zone.get("hazard_level") or "Unknown"
-            return self.HAZARD_RANK.get(level, 0)
+        return max(candidates, key=self._hazard_rank)
 
-        return sorted(candidates, key=hazard_rank, reverse=True)[0]
+    @classmethod
+    def _hazard_rank(cls, zone: dict) -> int:
+        level = zone.get("level") or zone.get("hazard_level") or "Unknown"
+        return cls.HAZARD_RANK.get(level, 0)
 
     @staticmethod
     def _to_enrichment(zone: dict) -> dict:
@@ -245,6 +282,44 @@ class NSDIEnricher:
             "soil_type": zone.get("soil_type", "Unknown"),
         }
 
+    def _query_zones(self, geohash4: str) -> List[Dict]:
+        resp = self.table.query(
+            IndexName=self.index_name,
+            KeyConditionExpression=Key(self.index_key).eq(geohash4),
+            Limit=50,
+        )
+        return resp.get("Items", [])
+
+    def prefetch(self, records: List[Dict]) -> None:
+        """
+        Load hazard zones for every geohash4 in the batch into the
+        module-level cache, querying uncached or expired cells concurrently. Cells whose query fails
+        are left uncached (get_hazard_zone retries and logs them).
+        """
+        prefixes = {
+            t["geohash"][:4]
+            for t in records
+            if isinstance(t.get("geohash"), str) and len(t["geohash"]) >= 4
+        }
+        missing = [gh for gh in prefixes if _hazard_cache_get(gh) is None]
+        if not missing:
+            return
+
+        def query(geohash4: str) -> Optional[List[Dict]]:
+            try:
+                return self._query_zones(geohash4)
+            except Exception as e:
+                logger.warning(f"Prefetch failed for geohash4={geohash4}: {e}")
+                return None
+
+        workers = min(self.PREFETCH_WORKERS, len(missing))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for geohash4, zones in zip(missing, executor.map(query, missing)):
+                if zones is not None:
+                    for zone in zones:
+                        self._zone_bbox(zone)
+                    _hazard_cache_put(geohash4, zones)
+
     def get_hazard_zone(
         self, geohash: str, latitude: float, longitude: float
     ) -> Optional[Dict]:
@@ -252,17 +327,14 @@ class NSDIEnricher:
         if len(geohash4) < 4:
             return None
 
-        # cache hit
-        zones = self.cache.get(geohash4)
+        # cache hit (shared across warm invocations until the TTL expires)
+        zones = _hazard_cache_get(geohash4)
         if zones is None:
             try:
-                resp = self.table.query(
-                    IndexName=self.index_name,
-                    KeyConditionExpression=Key(self.index_key).eq(geohash4),
-                    Limit=50,
-                )
-                zones = resp.get("Items", [])
-                self.cache[geohash4] = zones
+                zones = self._query_zones(geohash4)
+                for zone in zones:
+                    self._zone_bbox(zone)
+                _hazard_cache_put(geohash4, zones)
             except Exception as e:
                 logger.error(
                     f"Error querying hazard zones (index={self.index_name} key={self.index_key}): {e}"
@@ -277,9 +349,10 @@ class NSDIEnricher:
         return self._to_enrichment(best) if best else None
 
     def enrich_telemetry(self, telemetry: Dict) -> Dict:
-        geohash = telemetry.get("geohash")
-        lat = telemetry.get("latitude")
-        lon = telemetry.get("longitude")
+        try:
+            geohash, lat, lon = _GET_GEO(telemetry)
+        except KeyError:
+            return telemetry
 
         if geohash and lat is not None and lon is not None:
             zone_data = self.get_hazard_zone(geohash, float(lat), float(lon))
@@ -292,25 +365,143 @@ class NSDIEnricher:
         return telemetry
 
 
+@lru_cache(maxsize=256)
+def _float_to_decimal(value: float) -> Decimal:
+    # Decimals are immutable, so repeated readings share one instance
+    return Decimal(str(value))
+
+
 class TelemetryWriter:
-    def __init__(self, table):
+    # Registry items share the telemetry table: timestamp 0 keeps them out of
+    # every time-range read, registry_pk puts them in SensorRegistryIndex
+    REGISTRY_PK = "SENSORS"
+    REGISTRY_TIMESTAMP = 0
+
+    # BatchWriteItem accepts at most 25 put requests per call; unprocessed
+    # items are retried with exponential backoff before counting as failed
+    BATCH_WRITE_MAX_ITEMS = 25
+    BATCH_WRITE_MAX_ATTEMPTS = 5
+    BATCH_WRITE_MAX_BACKOFF_S = 1.0
+
+    # Nested fields that never hold floats: nsdi_enrichment is built from
+    # hazard-zone items (strings, or Decimals as read from DynamoDB)
+    FLOAT_FREE_FIELDS = frozenset({"nsdi_enrichment"})
+
+    def __init__(self, table, enable_registry: bool = ENABLE_SENSOR_REGISTRY):
         self.table = table
+        self.enable_registry = enable_registry
 
     def convert_floats_to_decimal(self, obj):
+        """
+        Convert floats to Decimal in place (iteratively) and return obj.
+
+        Items are handed straight to batch_writer, so nested dicts and lists
+        are updated rather than copied.
+        """
         if isinstance(obj, float):
-            return Decimal(str(obj))
-        if isinstance(obj, dict):
-            return {k: self.convert_floats_to_decimal(v) for k, v in obj.items()}
-        if isinstance(obj, list):
-            return [self.convert_floats_to_decimal(i) for i in obj]
+            return _float_to_decimal(obj)
+
+        stack = [obj]
+        while stack:
+            current = stack.pop()
+            if isinstance(current, dict):
+                entries = current.items()
+            elif isinstance(current, list):
+                entries = enumerate(current)
+            else:
+                continue
+            for k, v in entries:
+                if isinstance(v, float):
+                    current[k] = _float_to_decimal(v)
+                elif isinstance(v, (dict, list)):
+                    stack.append(v)
         return obj
 
-    def add_metadata(self, telemetry: Dict) -> Dict:
-        telemetry["ingested_at"] = datetime.utcnow().isoformat()
-        ttl = datetime.utcnow() + timedelta(days=30)
-        telemetry["ttl"] = int(ttl.timestamp())
+    def decimalize_record(self, telemetry: Dict) -> Dict:
+        """
+        Convert a validated record's floats to Decimal in place.
+
+        Top-level values are converted directly; only nested containers that
+        can hold floats are walked.
+        """
+        for k, v in telemetry.items():
+            if isinstance(v, float):
+                telemetry[k] = _float_to_decimal(v)
+            elif isinstance(v, (dict, list)) and k not in self.FLOAT_FREE_FIELDS:
+                self.convert_floats_to_decimal(v)
+        return telemetry
+
+    @staticmethod
+    def batch_metadata() -> Dict:
+        """ingested_at and ttl, computed once and shared by a whole batch."""
+        now = datetime.utcnow()
+        return {
+            "ingested_at": now.isoformat(),
+            "ttl": int((now + timedelta(days=30)).timestamp()),
+        }
+
+    def add_metadata(self, telemetry: Dict, metadata: Optional[Dict] = None) -> Dict:
+        telemetry.update(metadata or self.batch_metadata())
         return telemetry
 
+    def registry_items(self, batch: List[Dict]) -> List[Dict]:
+        """
+        One registry item per sensor in the batch, stamped with its newest
+        reading so the detector can list active sensors without a scan.
+        """
+        latest: Dict[str, Dict] = {}
+        for item in batch:
+            sid = item.get("sensor_id")
+            current = latest.get(sid)
+            if sid and (current is None or item["timestamp"] > current["timestamp"]):
+                latest[sid] = item
+
+        return [
+            {
+                "sensor_id": sid,
+                "timestamp": self.REGISTRY_TIMESTAMP,
+                "registry_pk": self.REGISTRY_PK,
+                "last_seen": int(item["timestamp"]),
+                "ttl": item["ttl"],
+            }
+            for sid, item in latest.items()
+        ]
+
+    def _batch_write(self, items: List[Dict]) -> List[Tuple[Dict, str]]:
+        """
+        Put items with BatchWriteItem.
+
+        Failures only surface when a request is sent, so they are collected
+        per chunk here rather than per put.
+
+        Returns: [(item, error)] for every item that was not written
+        """
+        client = self.table.meta.client
+        table_name = self.table.name
+        failed = []
+
+        for i in range(0, len(items), self.BATCH_WRITE_MAX_ITEMS):
+            requests = [
+                {"PutRequest": {"Item": item}}
+                for item in items[i : i + self.BATCH_WRITE_MAX_ITEMS]
+            ]
+            error = "Unprocessed after retries"
+            for attempt in range(self.BATCH_WRITE_MAX_ATTEMPTS):
+                if attempt:
+                    time.sleep(min(self.BATCH_WRITE_MAX_BACKOFF_S, 0.05 * (2**attempt)))
+                try:
+                    resp = client.batch_write_item(RequestItems={table_name: requests})
+                except Exception as e:
+                    error = str(e)
+                    break
+                requests = resp.get("UnprocessedItems", {}).get(table_name, [])
+                if not requests:
+                    break
+
+            failed.extend((r["PutRequest"]["Item"], error) for r in requests)
+
+        return failed
+
     def write_batch(self, telemetry_batch: List[Dict]) -> Dict:
         stats = {
             "total": len(telemetry_batch),
@@ -318,25 +509,30 @@ class TelemetryWriter:
             "failed": 0,
             "errors": [],
         }
-        batch = [self.convert_floats_to_decimal(t) for t in telemetry_batch]
-        batch = [self.add_metadata(t) for t in batch]
-
-        with self.table.batch_writer() as writer:
-            for item in batch:
-                try:
-                    writer.put_item(Item=item)
-                    stats["succeeded"] += 1
-                except Exception as e:
-                    stats["failed"] += 1
-                    stats["errors"].append(
-                        {"sensor_id": item.get("sensor_id"), "error": str(e)}
-                    )
-                    logger.error(f"Failed to write {item.get('sensor_id')}: {e}")
+        batch = [self.decimalize_record(t) for t in telemetry_batch]
+        metadata = self.batch_metadata()
+        batch = [self.add_metadata(t, metadata) for t in batch]
+
+        failed = self._batch_write(batch)
+        for item, error in failed:
+            stats["errors"].append({"sensor_id": item.get("sensor_id"), "error": error})
+            logger.error(f"Failed to write {item.get('sensor_id')}: {error}")
+        stats["failed"] = len(failed)
+        stats["succeeded"] = len(batch) - len(failed)
+
+        if self.enable_registry:
+            for item, error in self._batch_write(self.registry_items(batch)):
+                logger.warning(
+                    f"Failed to update registry for {item['sensor_id']}: {error}"
+                )
 
         return stats
 
 
 class EventBridgePublisher:
+    # PutEvents accepts at most 10 entries per call
+    MAX_ENTRIES_PER_CALL = 10
+
     HIGH_RISK_THRESHOLDS = {
         "moisture_percent": 85,
         "pore_pressure_kpa": 10,
@@ -344,79 +540,83 @@ class EventBridgePublisher:
         "safety_factor": 1.2,
     }
 
+    # Enriched hazard levels that lower the moisture trigger
+    HIGH_HAZARD_LEVELS = frozenset({"High", "Very High"})
+
     @classmethod
     def is_high_risk(cls, telemetry: Dict) -> bool:
-        if (
-            telemetry.get("moisture_percent", 0)
-            >= cls.HIGH_RISK_THRESHOLDS["moisture_percent"]
-        ):
-            return True
-        if (
-            telemetry.get("pore_pressure_kpa", 0)
-            >= cls.HIGH_RISK_THRESHOLDS["pore_pressure_kpa"]
-        ):
-            return True
-        if (
-            telemetry.get("tilt_rate_mm_hr", 0)
-            >= cls.HIGH_RISK_THRESHOLDS["tilt_rate_mm_hr"]
-        ):
-            return True
-        if (
-            0
-            < telemetry.get("safety_factor", 10)
-            < cls.HIGH_RISK_THRESHOLDS["safety_factor"]
-        ):
-            return True
+        thresholds = cls.HIGH_RISK_THRESHOLDS
+        moisture = telemetry.get("moisture_percent", 0)
+        safety_factor = telemetry.get("safety_factor", 10)
 
-        nsdi = telemetry.get("nsdi_enrichment", {})
-        if (
-            nsdi.get("hazard_level") in ["High", "Very High"]
-            and telemetry.get("moisture_percent", 0) > 70
-        ):
-            return True
-
-        return False
+        return (
+            moisture >= thresholds["moisture_percent"]
+            or telemetry.get("pore_pressure_kpa", 0) >= thresholds["pore_pressure_kpa"]
+            or telemetry.get("tilt_rate_mm_hr", 0) >= thresholds["tilt_rate_mm_hr"]
+            or 0 < safety_factor < thresholds["safety_factor"]
+            or (
+                moisture > 70
+                and (telemetry.get("nsdi_enrichment") or {}).get("hazard_level")
+                in cls.HIGH_HAZARD_LEVELS
+            )
+        )
 
     @classmethod
-    def publish_event(cls, telemetry: Dict) -> None:
-        try:
-            event = {
-                "Source": "openlews.ingestor",
-                "DetailType": "HighRiskTelemetry",
-                "Detail": json.dumps(
-                    {
-                        "sensor_id": telemetry["sensor_id"],
-                        "timestamp": telemetry["timestamp"],
-                        "latitude": telemetry["latitude"],
-                        "longitude": telemetry["longitude"],
-                        "moisture_percent": telemetry.get("moisture_percent"),
-                        "pore_pressure_kpa": telemetry.get("pore_pressure_kpa"),
-                        "safety_factor": telemetry.get("safety_factor"),
-                        "hazard_level": telemetry.get("nsdi_enrichment", {}).get(
-                            "hazard_level"
-                        ),
-                        "alert_reason": "Critical thresholds exceeded",
-                    }
-                ),
-                "EventBusName": EVENT_BUS,
-            }
+    def build_entry(cls, telemetry: Dict) -> Dict:
+        return {
+            "Source": "openlews.ingestor",
+            "DetailType": "HighRiskTelemetry",
+            "Detail": _dumps(
+                {
+                    "sensor_id": telemetry["sensor_id"],
+                    "timestamp": telemetry["timestamp"],
+                    "latitude": telemetry["latitude"],
+                    "longitude": telemetry["longitude"],
+                    "moisture_percent": telemetry.get("moisture_percent"),
+                    "pore_pressure_kpa": telemetry.get("pore_pressure_kpa"),
+                    "safety_factor": telemetry.get("safety_factor"),
+                    "hazard_level": telemetry.get("nsdi_enrichment", {}).get(
+                        "hazard_level"
+                    ),
+                    "alert_reason": "Critical thresholds exceeded",
+                }
+            ),
+            "EventBusName": EVENT_BUS,
+        }
 
-            response = eventbridge.put_events(Entries=[event])
-            if response.get("FailedEntryCount", 0) > 0:
-                logger.error(f"EventBridge publish failed: {response}")
-            else:
-                logger.info(f"Published high-risk event for {telemetry['sensor_id']}")
+    @classmethod
+    def publish_entries(cls, entries: List[Dict]) -> None:
+        """
+        Publish entries in PutEvents calls of up to 10, logging failed sensors.
+        """
+        for i in range(0, len(entries), cls.MAX_ENTRIES_PER_CALL):
+            chunk = entries[i : i + cls.MAX_ENTRIES_PER_CALL]
+            try:
+                response = eventbridge.put_events(Entries=chunk)
+            except Exception as e:
+                logger.error(f"Error publishing to EventBridge: {e}")
+                continue
 
-        except Exception as e:
-            logger.error(f"Error publishing to EventBridge: {e}")
+            failed = response.get("FailedEntryCount", 0)
+            if failed > 0:
+                for entry, result in zip(chunk, response.get("Entries", [])):
+                    if result.get("ErrorCode"):
+                        sensor_id = _loads(entry["Detail"]).get("sensor_id")
+                        logger.error(
+                            f"EventBridge publish failed for {sensor_id}: "
+                            f"{result['ErrorCode']} {result.get('ErrorMessage', '')}"
+                        )
+            logger.info(f"Published {len(chunk) - failed} high-risk events")
 
 
 def lambda_handler(event, context):
-    logger.info(f"Received event: {json.dumps(event)}")
+    # Full event dumps can be hundreds of KB; only serialize them for DEBUG
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Received event: %s", _dumps(event))
 
     try:
         if isinstance(event.get("body"), str):
-            body = json.loads(event["body"])
+            body = _loads(event["body"])
         else:
             body = event
 
@@ -424,7 +624,7 @@ def lambda_handler(event, context):
         if not telemetry_batch:
             return {
                 "statusCode": 400,
-                "body": json.dumps(
+                "body": _dumps(
                     {
                         "error": "No telemetry data provided",
                         "expected_format": '{"telemetry": [...]}',
@@ -434,14 +634,17 @@ def lambda_handler(event, context):
 
         logger.info(f"Processing {len(telemetry_batch)} telemetry records")
 
+        telemetry_table, hazard_zones_table = _tables()
+
         validator = TelemetryValidator()
         enricher = NSDIEnricher(hazard_zones_table) if ENABLE_NSDI_ENRICHMENT else None
         writer = TelemetryWriter(telemetry_table)
 
         validated = []
         validation_errors = []
-        high_risk_count = 0
+        high_risk_entries = []
 
+        valid_records = []
         for idx, telemetry in enumerate(telemetry_batch):
             is_valid, error_msg = validator.validate(telemetry)
             if not is_valid:
@@ -454,16 +657,24 @@ def lambda_handler(event, context):
                 )
                 logger.warning(f"Validation failed for record {idx}: {error_msg}")
                 continue
+            valid_records.append(telemetry)
 
-            if enricher:
-                telemetry = enricher.enrich_telemetry(telemetry)
+        if enricher and valid_records:
+            # After the prefetch every cell is cached (bar failed queries), so
+            # enrichment is in-memory work done inline
+            enricher.prefetch(valid_records)
+            for telemetry in valid_records:
+                enricher.enrich_telemetry(telemetry)
 
+        for telemetry in valid_records:
             if ENABLE_EVENTBRIDGE and EventBridgePublisher.is_high_risk(telemetry):
-                EventBridgePublisher.publish_event(telemetry)
-                high_risk_count += 1
+                high_risk_entries.append(EventBridgePublisher.build_entry(telemetry))
 
             validated.append(telemetry)
 
+        if high_risk_entries:
+            EventBridgePublisher.publish_entries(high_risk_entries)
+
         write_stats = {"succeeded": 0, "failed": 0}
         if validated:
             write_stats = writer.write_batch(validated)
@@ -476,7 +687,7 @@ def lambda_handler(event, context):
                 "validation_errors": len(validation_errors),
                 "written_to_dynamodb": write_stats.get("succeeded", 0),
                 "write_failures": write_stats.get("failed", 0),
-                "high_risk_events": high_risk_count,
+                "high_risk_events": len(high_risk_entries),
             },
         }
 
@@ -486,7 +697,7 @@ def lambda_handler(event, context):
         if write_stats.get("errors"):
             response_body["write_errors"] = write_stats["errors"]
 
-        logger.info(f"Processing complete: {response_body['statistics']}")
+        logger.info("Processing complete: %s", response_body["statistics"])
 
         return {
             "statusCode": 200,
@@ -494,12 +705,12 @@ def lambda_handler(event, context):
                 "Content-Type": "application/json",
                 "Access-Control-Allow-Origin": "*",
             },
-            "body": json.dumps(response_body),
+            "body": _dumps(response_body),
         }
 
     except Exception as e:
         logger.error(f"Unhandled error: {e}", exc_info=True)
         return {
             "statusCode": 500,
-            "body": json.dumps({"error": "Internal server error", "message": str(e)}),
+            "body": _dumps({"error": "Internal server error", "message": str(e)}),
         }
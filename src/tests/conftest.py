@@ -0,0 +1,17 @@
+"""
+Shared pytest configuration: make the Lambda packages importable (the
+detector's core.*, utils.*, the single-file RAG and ingestor handlers and
+the shared geohash_cells helper) for every test module.
+"""
+
+import os
+import sys
+
+_LAMBDAS = os.path.abspath(os.path.join(os.path.dirname(__file__), "../lambdas"))
+
+for package in ("shared", "telemetry_ingestor", "rag", "detector"):
+    sys.path.insert(0, os.path.join(_LAMBDAS, package))
+
+# The RAG and ingestor handlers create boto3 resources at import time
+os.environ.setdefault("AWS_REGION", "us-east-1")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
@@ -10,77 +10,70 @@ Historical Facts:
 - Expected: Red alert by hour 62 (6h warning)
 """
 
-import os
-import sys
-
-sys.path.insert(
-    0,
-    os.path.abspath(
-        os.path.join(os.path.dirname(__file__), "../../../src/lambdas/detector")
-    ),
-)
-
+import numpy as np
 from core.risk_scorer import RiskScorer
 
+# Alert bands: Green < 0.3 <= Yellow < 0.6 <= Orange < 0.8 <= Red
+LEVEL_THRESHOLDS = [0.3, 0.6, 0.8]
+LEVEL_NAMES = ("Green", "Yellow", "Orange", "Red")
+
 
 def load_aranayake_telemetry():
     """
     Load simulated Aranayake telemetry sequence.
 
     Returns:
-        List of hourly telemetry snapshots (hour 0-72)
+        Column arrays of hourly telemetry (hour 0-72), one row per hour
     """
     # This would load from simulator output
     # For now, return mock data showing progression to failure
 
-    telemetry_sequence = []
-
-    for hour in range(73):
-        # Progressive saturation
-        moisture = min(95, 20 + (hour / 72) * 75)  # 20% → 95%
-
-        # Accelerating tilt (creep)
-        if hour < 40:
-            tilt_rate = 0.5
-        elif hour < 60:
-            tilt_rate = 2.0 + (hour - 40) * 0.2  # Accelerating
-        else:
-            tilt_rate = 6.0 + (hour - 60) * 0.5  # Rapid creep
-
-        # Vibration spikes near failure
-        if hour < 50:
-            vibration = 8
-        elif hour < 65:
-            vibration = 15 + (hour - 50) * 2
-        else:
-            vibration = 50 + (hour - 65) * 10  # Acoustic emissions spike
-
-        # Cumulative rainfall
-        if hour < 24:
-            rainfall_24h = hour * 5  # Light rain
-        elif hour < 48:
-            rainfall_24h = 120 + (hour - 24) * 8  # Heavy rain
-        else:
-            rainfall_24h = 300 + (hour - 48) * 6  # Extreme rain
-
-        telemetry = {
-            "hour": hour,
-            "sensor_id": "ARANAYAKE_CENTER",
-            "moisture_percent": moisture,
-            "tilt_rate_mm_hr": tilt_rate,
-            "vibration_count": vibration,
-            "vibration_baseline": 10,
-            "pore_pressure_kpa": max(-5, -10 + (hour / 72) * 25),  # -10 → +15 kPa
-            "safety_factor": max(0.8, 1.8 - (hour / 72) * 1.0),  # 1.8 → 0.8
-            "rainfall_24h_mm": min(400, rainfall_24h),
-            "critical_moisture_percent": 40.0,  # Colluvium threshold
-            "latitude": 7.1667,
-            "longitude": 80.2833,
-        }
-
-        telemetry_sequence.append(telemetry)
-
-    return telemetry_sequence
+    hour = np.arange(73, dtype=float)
+    hours = len(hour)
+
+    # Progressive saturation
+    moisture = np.minimum(95, 20 + (hour / 72) * 75)  # 20% → 95%
+
+    # Accelerating tilt (creep)
+    tilt_rate = np.select(
+        [hour < 40, hour < 60],
+        [np.full(hours, 0.5), 2.0 + (hour - 40) * 0.2],  # Accelerating
+        default=6.0 + (hour - 60) * 0.5,  # Rapid creep
+    )
+
+    # Vibration spikes near failure
+    vibration = np.select(
+        [hour < 50, hour < 65],
+        [np.full(hours, 8.0), 15 + (hour - 50) * 2],
+        default=50 + (hour - 65) * 10,  # Acoustic emissions spike
+    )
+
+    # Cumulative rainfall
+    rainfall_24h = np.select(
+        [hour < 24, hour < 48],
+        [hour * 5, 120 + (hour - 24) * 8],  # Light rain, then heavy rain
+        default=300 + (hour - 48) * 6,  # Extreme rain
+    )
+
+    return {
+        "hour": hour.astype(int),
+        "moisture_percent": moisture,
+        "tilt_rate_mm_hr": tilt_rate,
+        "vibration_count": vibration,
+        "vibration_baseline": np.full(hours, 10.0),
+        "pore_pressure_kpa": np.maximum(-5, -10 + (hour / 72) * 25),  # -10 → +15 kPa
+        "safety_factor": np.maximum(0.8, 1.8 - (hour / 72) * 1.0),  # 1.8 → 0.8
+        "rainfall_24h_mm": np.minimum(400, rainfall_24h),
+        "critical_moisture_percent": np.full(hours, 40.0),  # Colluvium threshold
+        "latitude": np.full(hours, 7.1667),
+        "longitude": np.full(hours, 80.2833),
+    }
+
+
+def first_hour(hours, mask):
+    """First hour where mask is set, or None."""
+    idx = np.flatnonzero(mask)
+    return int(hours[idx[0]]) if idx.size else None
 
 
 def test_aranayake_replay():
@@ -92,42 +85,26 @@ def test_aranayake_replay():
     print("=" * 60)
 
     scorer = RiskScorer()
-    telemetry_sequence = load_aranayake_telemetry()
-
-    first_yellow = None
-    first_orange = None
-    first_red = None
-
-    for telemetry in telemetry_sequence:
-        hour = telemetry["hour"]
-        risk = scorer.calculate_sensor_risk(telemetry)
-
-        # Classify risk level
-        if risk < 0.3:
-            level = "Green"
-        elif risk < 0.6:
-            level = "Yellow"
-        elif risk < 0.8:
-            level = "Orange"
-        else:
-            level = "Red"
-
-        # Track first occurrence of each level
-        if level == "Yellow" and first_yellow is None:
-            first_yellow = hour
-        if level == "Orange" and first_orange is None:
-            first_orange = hour
-        if level == "Red" and first_red is None:
-            first_red = hour
-
-        # Print key hours
-        if hour % 12 == 0 or level in ["Orange", "Red"]:
-            print(
-                f"Hour {hour:2d}: Risk={risk:.3f} [{level:6s}] | "
-                f"Moisture={telemetry['moisture_percent']:.1f}% | "
-                f"Tilt={telemetry['tilt_rate_mm_hr']:.1f}mm/hr | "
-                f"Rain={telemetry['rainfall_24h_mm']:.0f}mm"
-            )
+    telemetry = load_aranayake_telemetry()
+    hours = telemetry["hour"]
+
+    # Score and classify every hour in one pass
+    risks = scorer.calculate_sensor_risk_batch(telemetry)
+    levels = np.searchsorted(LEVEL_THRESHOLDS, risks, side="right")
+
+    # Track first occurrence of each level
+    first_yellow = first_hour(hours, levels == 1)
+    first_orange = first_hour(hours, levels == 2)
+    first_red = first_hour(hours, levels == 3)
+
+    # Print key hours
+    for i in np.flatnonzero((hours % 12 == 0) | (levels >= 2)):
+        print(
+            f"Hour {hours[i]:2d}: Risk={risks[i]:.3f} [{LEVEL_NAMES[levels[i]]:6s}] | "
+            f"Moisture={telemetry['moisture_percent'][i]:.1f}% | "
+            f"Tilt={telemetry['tilt_rate_mm_hr'][i]:.1f}mm/hr | "
+            f"Rain={telemetry['rainfall_24h_mm'][i]:.0f}mm"
+        )
 
     print("\n" + "-" * 60)
     print("ALERT TIMELINE:")
@@ -0,0 +1,80 @@
+"""
+Unit Tests for Alert Manager
+
+Tests alert deduplication against alerts written by create_alert.
+"""
+
+from clients.alert_manager import AlertManager
+
+
+class FakeAlertsTable:
+    """In-memory alerts table answering DetectionIndex queries."""
+
+    def __init__(self):
+        self.items = []
+
+    def put_item(self, Item):
+        self.items.append(Item)
+
+    def query(self, IndexName, ExpressionAttributeValues, **kwargs):
+        assert IndexName == "DetectionIndex"
+        values = ExpressionAttributeValues
+        matches = [
+            item
+            for item in self.items
+            if item.get("detection_id") == values[":detection_id"]
+            and item.get("status") == values[":status"]
+        ]
+        matches.sort(key=lambda item: item["created_at"], reverse=True)
+        return {"Items": matches}
+
+
+class FakeDynamoDB:
+    def __init__(self, table):
+        self._table = table
+
+    def Table(self, name):
+        return self._table
+
+
+class TestAlertManager:
+    """Test alert deduplication"""
+
+    def setup_method(self):
+        self.table = FakeAlertsTable()
+        self.manager = AlertManager(
+            dynamodb_resource=FakeDynamoDB(self.table),
+            alerts_table_name="alerts",
+            sns_client=None,
+            sns_topic_arn="",
+        )
+
+    def create(self, detection_id):
+        return self.manager.create_alert(
+            alert_id_prefix=detection_id,
+            llm_assessment={"risk_level": "Yellow", "confidence": 0.7},
+            detection_data={"sensor_id": detection_id, "risk_score": 0.5},
+            rag_context={},
+            location={"latitude": 6.9934, "longitude": 81.0550},
+        )
+
+    def test_prefetch_finds_created_alert(self):
+        """Alert IDs from _generate_alert_id are matched to their detection"""
+        created = self.create("SENSOR_01")
+        assert created["alert_id"].startswith("ALERT_")
+
+        active = self.manager.get_active_alerts(["SENSOR_01", "SENSOR_02"])
+
+        assert set(active) == {"SENSOR_01"}
+        assert active["SENSOR_01"]["alert_id"] == created["alert_id"]
+        assert (
+            self.manager.get_active_alert("SENSOR_01")["alert_id"]
+            == created["alert_id"]
+        )
+
+    def test_detection_ids_are_not_prefix_matched(self):
+        """An alert for SENSOR_10 must not deduplicate SENSOR_1"""
+        self.create("SENSOR_10")
+
+        assert self.manager.get_active_alerts(["SENSOR_1"]) == {}
+        assert self.manager.get_active_alert("SENSOR_1") is None
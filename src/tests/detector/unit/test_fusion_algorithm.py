@@ -4,26 +4,46 @@ Unit Tests for Fusion Algorithm
 Tests spatial correlation, cluster detection, and composite risk scoring.
 """
 
-import pytest
-import sys
-import os
-
-# Add parent directory to path
-sys.path.insert(
-    0,
-    os.path.abspath(
-        os.path.join(os.path.dirname(__file__), "../../src/lambdas/detector")
-    ),
-)
+import operator
 
+import core.fusion_algorithm as fusion_module
+import numpy as np
+import pytest
 from core.fusion_algorithm import FusionAlgorithm
+from utils.telemetry_arrays import telemetry_to_arrays
+
+# Quincunx patch: SENSOR_02/03 ~30m and SENSOR_04 ~55m from SENSOR_01,
+# SENSOR_05 far away
+SENSOR_FIELD = {
+    "SENSOR_01": [{"latitude": 6.9934, "longitude": 81.0550}],
+    "SENSOR_02": [{"latitude": 6.9936, "longitude": 81.0552}],
+    "SENSOR_03": [{"latitude": 6.9932, "longitude": 81.0548}],
+    "SENSOR_04": [{"latitude": 6.9934, "longitude": 81.0555}],
+    "SENSOR_05": [{"latitude": 6.9950, "longitude": 81.0600}],
+}
+
+
+@pytest.fixture(scope="class")
+def sensor_field():
+    """
+    Shared sensor field and its neighbour graph, built once per class from
+    the packed column arrays (as analyze_sensors does).
+    """
+    fusion = FusionAlgorithm()
+    arrays = telemetry_to_arrays(SENSOR_FIELD)
+    adjacency = fusion.build_neighbour_graph(
+        dict(zip(arrays["sensor_ids"], zip(arrays["latitude"], arrays["longitude"]))),
+        fusion.CORRELATION_RADIUS_M,
+    )
+    return SENSOR_FIELD, adjacency
 
 
 class TestFusionAlgorithm:
 
-    def setup_method(self):
-        """Initialize fusion algorithm for each test."""
-        self.fusion = FusionAlgorithm()
+    @classmethod
+    def setup_class(cls):
+        """Initialize one fusion algorithm for all tests (it holds no state)."""
+        cls.fusion = FusionAlgorithm()
 
     def test_haversine_distance(self):
         """Test distance calculation."""
@@ -35,126 +55,168 @@ class TestFusionAlgorithm:
 
         assert 9000 < distance < 12000, f"Distance {distance}m outside expected range"
 
-    def test_spatial_correlation_high_agreement(self):
-        """Test high spatial correlation (neighbours agree)."""
-        # Mock 5 sensors in quincunx, all with high risk
+    def test_neighbour_graph_matches_direct_search(self):
+        """Test prebuilt neighbour graph gives the same neighbours and correlation."""
         sensor_risks = {
             "SENSOR_01": {"risk_score": 0.8},
             "SENSOR_02": {"risk_score": 0.75},
             "SENSOR_03": {"risk_score": 0.82},
             "SENSOR_04": {"risk_score": 0.78},
-            "SENSOR_05": {"risk_score": 0.2},  # One low-risk sensor
+            "SENSOR_05": {"risk_score": 0.2},
         }
 
-        telemetry_data = {
-            "SENSOR_01": [{"latitude": 6.9934, "longitude": 81.0550}],
-            "SENSOR_02": [{"latitude": 6.9936, "longitude": 81.0552}],  # ~25m away
-            "SENSOR_03": [{"latitude": 6.9932, "longitude": 81.0548}],  # ~25m away
-            "SENSOR_04": [{"latitude": 6.9934, "longitude": 81.0555}],  # ~40m away
-            "SENSOR_05": [{"latitude": 6.9950, "longitude": 81.0600}],  # Far away
-        }
+        telemetry_data = SENSOR_FIELD
 
-        correlation = self.fusion.calculate_spatial_correlation(
-            "SENSOR_01", sensor_risks, telemetry_data
+        locations = self.fusion.build_location_cache(telemetry_data)
+        adjacency = self.fusion.build_neighbour_graph(
+            locations, self.fusion.CORRELATION_RADIUS_M
         )
 
-        # Should have high correlation (3/3 nearby sensors agree on high risk)
-        assert correlation >= 0.6, f"Expected high correlation, got {correlation}"
-
-    def test_spatial_correlation_isolated_anomaly(self):
-        """Test low correlation for isolated high-risk sensor (likely fault)."""
+        for sensor_id, (lat, lon) in locations.items():
+            expected = self.fusion._find_neighbours(
+                lat, lon, sensor_id, telemetry_data, self.fusion.CORRELATION_RADIUS_M
+            )
+            assert sorted(adjacency[sensor_id]) == sorted(expected)
+
+            assert self.fusion.calculate_spatial_correlation(
+                sensor_id, sensor_risks, telemetry_data, adjacency=adjacency
+            ) == self.fusion.calculate_spatial_correlation(
+                sensor_id, sensor_risks, telemetry_data
+            )
+
+    def test_composite_risks_batch_matches_per_sensor(self):
+        """Test the detector's array correlation/composite equals the per-sensor path."""
+        risk_scores = [0.8, 0.75, 0.82, 0.7, 0.2, 0.1, 0.15, 0.9]
         sensor_risks = {
-            "SENSOR_01": {"risk_score": 0.9},  # High risk
-            "SENSOR_02": {"risk_score": 0.1},  # Low risk
-            "SENSOR_03": {"risk_score": 0.15},  # Low risk
-            "SENSOR_04": {"risk_score": 0.12},  # Low risk
+            f"SENSOR_{i:02d}": {"risk_score": r} for i, r in enumerate(risk_scores)
         }
-
         telemetry_data = {
-            "SENSOR_01": [{"latitude": 6.9934, "longitude": 81.0550}],
-            "SENSOR_02": [{"latitude": 6.9936, "longitude": 81.0552}],
-            "SENSOR_03": [{"latitude": 6.9932, "longitude": 81.0548}],
-            "SENSOR_04": [{"latitude": 6.9934, "longitude": 81.0555}],
+            f"SENSOR_{i:02d}": [
+                {"latitude": 6.9934 + i * 0.0001, "longitude": 81.0550 + (i % 3) * 1e-4}
+            ]
+            for i in range(len(risk_scores))
         }
 
-        correlation = self.fusion.calculate_spatial_correlation(
-            "SENSOR_01", sensor_risks, telemetry_data
+        locations = self.fusion.build_location_cache(telemetry_data)
+        adjacency = self.fusion.build_neighbour_graph(
+            locations, self.fusion.CORRELATION_RADIUS_M
         )
 
-        # Should have low correlation (isolated anomaly)
-        assert (
-            correlation < 0.3
-        ), f"Expected low correlation for isolated anomaly, got {correlation}"
-
-    def test_composite_risk_boost(self):
-        """Test risk boost when correlation is high."""
-        individual_risk = 0.7
-        high_correlation = 0.8
-
-        composite = self.fusion.calculate_composite_risk(
-            individual_risk, high_correlation
+        expected = {}
+        for sensor_id, data in sensor_risks.items():
+            correlation = self.fusion.calculate_spatial_correlation(
+                sensor_id, sensor_risks, telemetry_data, adjacency=adjacency
+            )
+            expected[sensor_id] = (
+                correlation,
+                self.fusion.calculate_composite_risk(data["risk_score"], correlation),
+            )
+
+        # Same calls as analyze_sensors, on the packed column arrays
+        arrays = telemetry_to_arrays(telemetry_data)
+        risks = np.array(
+            [sensor_risks[sid]["risk_score"] for sid in arrays["sensor_ids"]]
         )
+        correlations = self.fusion.calculate_spatial_correlation_batch(
+            arrays["latitude"], arrays["longitude"], risks
+        )
+        composites = self.fusion.calculate_composite_risk_batch(risks, correlations)
 
-        # Should be boosted (1.3x)
-        expected = min(1.0, 0.7 * 1.3)
-        assert abs(composite - expected) < 0.01, f"Expected {expected}, got {composite}"
+        assert correlations.tolist() == pytest.approx(
+            [expected[sid][0] for sid in arrays["sensor_ids"]]
+        )
+        assert composites.tolist() == pytest.approx(
+            [expected[sid][1] for sid in arrays["sensor_ids"]]
+        )
 
-    def test_composite_risk_reduction(self):
-        """Test risk reduction when correlation is low (sensor fault)."""
-        individual_risk = 0.8
-        low_correlation = 0.2
+    @pytest.mark.skipif(
+        not fusion_module.SCIPY_AVAILABLE, reason="KD-tree path needs scipy"
+    )
+    def test_neighbour_graph_kdtree_matches_pairwise(self, monkeypatch):
+        """Test KD-tree and pairwise neighbour graphs are identical on a grid."""
+        # 10x10 grid at ~20m spacing (quincunx-like density)
+        locations = {
+            f"SENSOR_{r:02d}_{c:02d}": (6.99 + r * 0.00018, 81.05 + c * 0.00018)
+            for r in range(10)
+            for c in range(10)
+        }
 
-        composite = self.fusion.calculate_composite_risk(
-            individual_risk, low_correlation
+        kdtree_graph = self.fusion.build_neighbour_graph(locations, 50.0)
+
+        monkeypatch.setattr(fusion_module, "SCIPY_AVAILABLE", False)
+        # Small blocks so the pair search spans several of them
+        monkeypatch.setattr(FusionAlgorithm, "PAIR_BLOCK_ROWS", 7)
+        pairwise_graph = self.fusion.build_neighbour_graph(locations, 50.0)
+
+        assert kdtree_graph == pairwise_graph
+        assert any(len(v) >= 8 for v in pairwise_graph.values())
+
+    @pytest.mark.parametrize(
+        "individual_risk, correlation, multiplier",
+        [
+            (0.7, 0.8, 1.3),  # High correlation: boosted
+            (0.8, 0.2, 0.5),  # Low correlation (sensor fault): reduced
+        ],
+        ids=["boost", "reduction"],
+    )
+    def test_composite_risk(self, individual_risk, correlation, multiplier):
+        """Test composite risk scaling by spatial correlation."""
+        composite = self.fusion.calculate_composite_risk(individual_risk, correlation)
+
+        assert composite == pytest.approx(
+            min(1.0, individual_risk * multiplier), abs=0.01
         )
 
-        # Should be reduced (0.5x)
-        expected = 0.8 * 0.5
-        assert abs(composite - expected) < 0.01, f"Expected {expected}, got {composite}"
-
-    def test_cluster_detection_aranayake_pattern(self):
-        """Test cluster detection for Aranayake-type failure (3+ sensors)."""
-        # Mock Aranayake: 4 sensors in center with high risk
+    @pytest.mark.parametrize(
+        "risk_scores, compare, threshold",
+        [
+            # Neighbours agree on high risk (one far low-risk sensor)
+            ([0.8, 0.75, 0.82, 0.78, 0.2], operator.ge, 0.6),
+            # Isolated high-risk sensor among low-risk neighbours (likely fault)
+            ([0.9, 0.1, 0.15, 0.12], operator.lt, 0.3),
+        ],
+        ids=["high_agreement", "isolated_anomaly"],
+    )
+    def test_spatial_correlation(self, sensor_field, risk_scores, compare, threshold):
+        """Test spatial correlation of SENSOR_01 against its neighbours."""
+        telemetry_data, adjacency = sensor_field
         sensor_risks = {
-            "SENSOR_01": {"composite_risk": 0.85},
-            "SENSOR_02": {"composite_risk": 0.80},
-            "SENSOR_03": {"composite_risk": 0.82},
-            "SENSOR_04": {"composite_risk": 0.78},
-            "SENSOR_05": {"composite_risk": 0.2},  # Outside cluster
+            f"SENSOR_{i:02d}": {"risk_score": r}
+            for i, r in enumerate(risk_scores, start=1)
         }
 
-        telemetry_data = {
-            "SENSOR_01": [{"latitude": 6.9934, "longitude": 81.0550}],
-            "SENSOR_02": [{"latitude": 6.9936, "longitude": 81.0552}],
-            "SENSOR_03": [{"latitude": 6.9932, "longitude": 81.0548}],
-            "SENSOR_04": [{"latitude": 6.9934, "longitude": 81.0555}],
-            "SENSOR_05": [{"latitude": 7.0000, "longitude": 81.1000}],  # Far away
-        }
-
-        clusters = self.fusion.detect_clusters(sensor_risks, telemetry_data)
-
-        assert len(clusters) >= 1, "Should detect at least 1 cluster"
-        assert clusters[0]["size"] >= 3, f"Cluster size {clusters[0]['size']} < 3"
-        assert clusters[0]["avg_risk"] > 0.7, "Cluster average risk should be high"
+        correlation = self.fusion.calculate_spatial_correlation(
+            "SENSOR_01", sensor_risks, telemetry_data, adjacency=adjacency
+        )
 
-    def test_no_cluster_for_isolated_sensors(self):
-        """Test that isolated high-risk sensors don't form clusters."""
+        assert compare(
+            correlation, threshold
+        ), f"Correlation {correlation} fails {compare.__name__} {threshold}"
+
+    @pytest.mark.parametrize(
+        "composite_risks, expected_clusters",
+        [
+            # Aranayake-type failure: 4 high-risk sensors in the centre
+            ([0.85, 0.80, 0.82, 0.78, 0.2], 1),
+            # Isolated high-risk sensor does not form a cluster
+            ([0.85, 0.15, 0.20], 0),
+        ],
+        ids=["aranayake_pattern", "isolated_sensor"],
+    )
+    def test_cluster_detection(self, sensor_field, composite_risks, expected_clusters):
+        """Test cluster detection (3+ adjacent high-risk sensors)."""
+        telemetry_data, adjacency = sensor_field
         sensor_risks = {
-            "SENSOR_01": {"composite_risk": 0.85},
-            "SENSOR_02": {"composite_risk": 0.15},
-            "SENSOR_03": {"composite_risk": 0.20},
-        }
-
-        telemetry_data = {
-            "SENSOR_01": [{"latitude": 6.9934, "longitude": 81.0550}],
-            "SENSOR_02": [{"latitude": 6.9936, "longitude": 81.0552}],
-            "SENSOR_03": [{"latitude": 6.9932, "longitude": 81.0548}],
+            f"SENSOR_{i:02d}": {"composite_risk": r}
+            for i, r in enumerate(composite_risks, start=1)
         }
 
-        clusters = self.fusion.detect_clusters(sensor_risks, telemetry_data)
-
-        assert len(clusters) == 0, "Should not detect cluster for isolated sensor"
-
+        clusters = self.fusion.detect_clusters(
+            sensor_risks, telemetry_data, adjacency=adjacency
+        )
 
-if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
+        assert len(clusters) == expected_clusters
+        assert clusters == self.fusion.detect_clusters(sensor_risks, telemetry_data)
+        for cluster in clusters:
+            assert cluster["size"] >= 3, f"Cluster size {cluster['size']} < 3"
+            assert cluster["avg_risk"] > 0.7, "Cluster average risk should be high"
@@ -0,0 +1,33 @@
+"""
+Unit Tests for RAG Client
+
+Tests RAG Lambda ARN handling at client construction.
+"""
+
+import pytest
+from clients.rag_client import RAGClient
+
+RAG_ARN = "arn:aws:lambda:ap-southeast-1:123456789012:function:rag-query-lambda"
+
+
+class TestRAGClientInit:
+    """Test construction with qualified and unqualified ARNs"""
+
+    def test_qualified_arn(self, caplog):
+        """An alias-qualified ARN is used as is, without a warning"""
+        client = RAGClient(lambda_client=None, rag_lambda_arn=f"{RAG_ARN}:live")
+
+        assert client.rag_lambda_arn == f"{RAG_ARN}:live"
+        assert "not qualified" not in caplog.text
+
+    @pytest.mark.parametrize("arn", [RAG_ARN, f"{RAG_ARN}:"], ids=["bare", "empty"])
+    def test_unqualified_arn_warns(self, arn, caplog):
+        """An unqualified ARN logs a warning instead of failing the import"""
+        client = RAGClient(lambda_client=None, rag_lambda_arn=arn)
+
+        assert client.rag_lambda_arn == arn
+        assert "RAG Lambda ARN is not qualified with an alias" in caplog.text
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,90 @@
+"""
+Unit Tests for Risk Scorer
+
+Tests per-sensor and vectorised batch scores against hand-computed values.
+"""
+
+import pytest
+from core.risk_scorer import RiskScorer
+from utils.telemetry_arrays import telemetry_to_arrays
+
+# Reading -> expected composite risk (weighted band scores x rainfall multiplier)
+SCORED_READINGS = [
+    # All defaults: every component in its safe band
+    ({}, 0.0),
+    # 0.3*.35 + 0.2*.25 + 0.3*.15 + 0.4*.15 + 0.3*.10 = 0.29, x1.1 rainfall
+    (
+        {
+            "moisture_percent": 35,
+            "tilt_rate_mm_hr": 2.0,
+            "vibration_count": 12,
+            "vibration_baseline": 5,
+            "pore_pressure_kpa": 2,
+            "safety_factor": 1.4,
+            "rainfall_24h_mm": 80,
+        },
+        0.319,
+    ),
+    # 0.6*.35 + 0.7*(.25 + .15 + .15 + .10) = 0.665, x1.2 rainfall
+    # (zero vibration baseline falls back to 5)
+    (
+        {
+            "moisture_percent": 45,
+            "tilt_rate_mm_hr": 6.0,
+            "vibration_count": 30,
+            "vibration_baseline": 0,
+            "pore_pressure_kpa": 7,
+            "safety_factor": 1.1,
+            "rainfall_24h_mm": 120,
+            "critical_moisture_percent": 45.0,
+        },
+        0.798,
+    ),
+    # Every component critical, x1.5 rainfall, capped at 1.0
+    (
+        {
+            "moisture_percent": 95,
+            "tilt_rate_mm_hr": 12.0,
+            "vibration_count": 120,
+            "vibration_baseline": 10,
+            "pore_pressure_kpa": 15,
+            "safety_factor": 0.8,
+            "rainfall_24h_mm": 250,
+        },
+        1.0,
+    ),
+    # Saturated soil only: 1.0*.35, x1.3 rainfall
+    ({"moisture_percent": 60, "rainfall_24h_mm": 170}, 0.455),
+]
+READING_IDS = ["defaults", "low_bands", "high_bands", "critical", "saturated"]
+
+
+class TestRiskScorer:
+
+    def setup_method(self):
+        """Initialize risk scorer for each test."""
+        self.scorer = RiskScorer()
+
+    @pytest.mark.parametrize("reading, expected", SCORED_READINGS, ids=READING_IDS)
+    def test_sensor_risk(self, reading, expected):
+        """Test calculate_sensor_risk against hand-computed scores."""
+        assert self.scorer.calculate_sensor_risk(reading) == pytest.approx(expected)
+
+    def test_batch_risk(self):
+        """Test batch scoring against the same hand-computed scores."""
+        telemetry_data = {
+            f"SENSOR_{i:02d}": [{"latitude": 6.99, "longitude": 81.05, **reading}]
+            for i, (reading, _) in enumerate(SCORED_READINGS)
+        }
+
+        arrays = telemetry_to_arrays(telemetry_data)
+        batch = self.scorer.calculate_sensor_risk_batch(arrays)
+
+        assert arrays["sensor_ids"] == list(telemetry_data)
+        assert batch.tolist() == pytest.approx(
+            [expected for _, expected in SCORED_READINGS]
+        )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
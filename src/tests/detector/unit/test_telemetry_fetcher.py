@@ -0,0 +1,184 @@
+"""
+Unit Tests for Telemetry Fetcher
+
+Tests AttributeValue conversion and the parallel scan's handling of a
+failed segment.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from utils.telemetry_fetcher import (
+    TelemetryFetcher,
+    _from_attribute_value,
+    _number,
+)
+
+
+class TestAttributeValues:
+    """Test typed AttributeValue conversion"""
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            ("42", 42),
+            ("-7", -7),
+            ("0.25", 0.25),
+            ("3.0", 3),
+            ("1.5E2", 150),
+            ("2.5e-1", 0.25),
+        ],
+        ids=[
+            "int",
+            "negative",
+            "float",
+            "integral-float",
+            "exponent",
+            "small-exponent",
+        ],
+    )
+    def test_number(self, value, expected):
+        """Int when integral, float otherwise"""
+        result = _number(value)
+        assert result == expected
+        assert type(result) is type(expected)
+
+    @pytest.mark.parametrize(
+        "av,expected",
+        [
+            ({"N": "12"}, 12),
+            ({"N": "12.5"}, 12.5),
+            ({"S": "SENSOR_01"}, "SENSOR_01"),
+            ({"BOOL": True}, True),
+            ({"BOOL": False}, False),
+            ({"NULL": True}, None),
+            (
+                {"M": {"level": {"S": "High"}, "score": {"N": "0.8"}}},
+                {"level": "High", "score": 0.8},
+            ),
+            (
+                {"L": [{"N": "1"}, {"S": "a"}, {"M": {"x": {"NULL": True}}}]},
+                [1, "a", {"x": None}],
+            ),
+            ({"NS": ["1", "2.5"]}, {1, 2.5}),
+            ({"SS": ["a", "b"]}, {"a", "b"}),
+        ],
+        ids=["N", "N-float", "S", "BOOL", "BOOL-false", "NULL", "M", "L", "NS", "SS"],
+    )
+    def test_from_attribute_value(self, av, expected):
+        """Each DynamoDB type converts to its native value"""
+        assert _from_attribute_value(av) == expected
+
+    def test_unsupported_type(self):
+        """Unknown type descriptors are rejected"""
+        with pytest.raises(TypeError):
+            _from_attribute_value({"X": "?"})
+
+
+class TestToRecord:
+    """Test low-level item to record conversion"""
+
+    def test_float_fields_are_floats(self):
+        """Readings and coordinates come back as float, even when integral"""
+        record = TelemetryFetcher.to_record(
+            {
+                "sensor_id": {"S": "SENSOR_01"},
+                "timestamp": {"N": "1735430400"},
+                "latitude": {"N": "7"},
+                "longitude": {"N": "80.6337"},
+                "moisture_percent": {"N": "85"},
+                "safety_factor": {"NULL": True},
+                "vibration_count": {"S": "12"},
+            }
+        )
+
+        assert record == {
+            "sensor_id": "SENSOR_01",
+            "timestamp": 1735430400,
+            "latitude": 7.0,
+            "longitude": 80.6337,
+            "moisture_percent": 85.0,
+            "safety_factor": None,
+            "vibration_count": 12.0,
+        }
+        assert type(record["timestamp"]) is int
+        for name in ("latitude", "longitude", "moisture_percent", "vibration_count"):
+            assert type(record[name]) is float
+
+    def test_missing_attributes_stay_missing(self):
+        """Absent attributes are not filled in (scoring applies defaults)"""
+        record = TelemetryFetcher.to_record({"sensor_id": {"S": "SENSOR_01"}})
+        assert record == {"sensor_id": "SENSOR_01"}
+
+    def test_other_fields_keep_native_types(self):
+        """Non-reading attributes convert without float casting"""
+        record = TelemetryFetcher.to_record(
+            {
+                "nsdi_enrichment": {"M": {"hazard_level": {"S": "High"}}},
+                "ttl": {"N": "1738022400"},
+                "flags": {"L": [{"BOOL": True}]},
+            }
+        )
+        assert record == {
+            "nsdi_enrichment": {"hazard_level": "High"},
+            "ttl": 1738022400,
+            "flags": [True],
+        }
+
+
+class FakeScanPaginator:
+    """Serves one page per scan segment; failing segments raise."""
+
+    def __init__(self, pages, failing=()):
+        self.pages = pages
+        self.failing = set(failing)
+
+    def paginate(self, Segment, **kwargs):
+        if Segment in self.failing:
+            raise RuntimeError(f"segment {Segment} throttled")
+        return [{"Items": self.pages.get(Segment, [])}]
+
+
+class FakeDynamoDBClient:
+    def __init__(self, scan_paginator):
+        self.scan_paginator = scan_paginator
+
+    def get_paginator(self, name):
+        return self.scan_paginator if name == "scan" else None
+
+
+def _item(sensor_id, timestamp):
+    return {"sensor_id": {"S": sensor_id}, "timestamp": {"N": str(timestamp)}}
+
+
+class TestParallelScan:
+    """Test the all-sensor parallel scan"""
+
+    PAGES = {
+        0: [_item("SENSOR_01", 20), _item("SENSOR_01", 10)],
+        1: [_item("SENSOR_02", 10)],
+        2: [_item("SENSOR_03", 10)],
+    }
+
+    def fetcher(self, failing=()):
+        client = FakeDynamoDBClient(FakeScanPaginator(self.PAGES, failing))
+        resource = SimpleNamespace(Table=lambda name: None)
+        return TelemetryFetcher(resource, "telemetry", dynamodb_client=client)
+
+    def test_groups_segments_by_sensor(self):
+        """Records from every segment, per sensor, in timestamp order"""
+        result = self.fetcher()._parallel_scan(0, 100, total_segments=3)
+
+        assert set(result) == {"SENSOR_01", "SENSOR_02", "SENSOR_03"}
+        assert [r["timestamp"] for r in result["SENSOR_01"]] == [10, 20]
+
+    def test_failed_segment_keeps_other_sensors(self, caplog):
+        """A failed segment is logged; the other segments' sensors remain"""
+        result = self.fetcher(failing={1})._parallel_scan(0, 100, total_segments=3)
+
+        assert set(result) == {"SENSOR_01", "SENSOR_03"}
+        assert "Scan segment 1/3 failed: segment 1 throttled" in caplog.text
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
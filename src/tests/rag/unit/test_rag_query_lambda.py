@@ -0,0 +1,331 @@
+"""
+Unit Tests for RAG Query Lambda
+
+Tests the geohash cell distance bound used to prune neighbour cells, the
+pruned nearest-zone search against a brute-force scan, and response
+serialisation.
+"""
+
+import json
+import random
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pygeohash")
+
+import rag_query_lambda  # noqa: E402
+from rag_query_lambda import (  # noqa: E402
+    MAX_COVER_CELLS,
+    GeoCalculator,
+    RAGQueryHandler,
+    _cells_covering,
+    _response,
+    geohash_bounds,
+    lambda_handler,
+)
+
+# Synthetic hazard zones scattered over the Sri Lankan hill country, indexed
+# by their centroid's geohash4 as in the hazard-zones table
+_zone_rng = random.Random(3)
+ZONES = [
+    {
+        "zone_id": f"ZONE_{i:03d}",
+        "version": 1,
+        "centroid_lat": lat,
+        "centroid_lon": lon,
+        "hazard_level": _zone_rng.choice(["Low", "Moderate", "High", "Very High"]),
+        "geohash": GeoCalculator.calculate_geohash(lat, lon, 4),
+    }
+    for i, (lat, lon) in enumerate(
+        (_zone_rng.uniform(5.9, 8.1), _zone_rng.uniform(79.9, 82.0)) for _ in range(400)
+    )
+]
+
+
+def _boundary(cell, steps=2001):
+    """Points sampled densely along a cell's four edges."""
+    south, north, west, east = geohash_bounds(cell)
+    t = np.linspace(0.0, 1.0, steps)
+    lats = np.concatenate(
+        [south + (north - south) * t] * 2
+        + [np.full_like(t, south), np.full_like(t, north)]
+    )
+    lons = np.concatenate(
+        [np.full_like(t, west), np.full_like(t, east)] + [west + (east - west) * t] * 2
+    )
+    return lats, lons
+
+
+def _cases(count, seed=11):
+    """(lat, lon, cell) with the cell near, but usually not around, the point."""
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(count):
+        lat = rng.uniform(-80.0, 80.0)
+        lon = rng.uniform(-170.0, 170.0)
+        precision = rng.choice((3, 4, 5))
+        cell = GeoCalculator.calculate_geohash(
+            max(-89.0, min(89.0, lat + rng.uniform(-2.0, 2.0))),
+            lon + rng.uniform(-2.0, 2.0),
+            precision,
+        )
+        cases.append((lat, lon, cell))
+    return cases
+
+
+class TestCellMinDistance:
+    """Test the point-to-cell distance lower bound"""
+
+    @pytest.mark.parametrize(
+        "lat,lon,cell",
+        [
+            (6.9934, 81.0550, "tc3n"),  # Badulla, cell to the north-west
+            (7.2906, 80.6337, "tc1x"),  # Kandy, cell to the south-east
+            (60.0, 10.0, "u4pr"),  # high latitude, cell to the south-east
+            (-45.0, 170.0, "rbsm"),  # southern hemisphere, cell to the north-east
+        ]
+        + _cases(300),
+    )
+    def test_lower_bound(self, lat, lon, cell):
+        """Never more than the haversine distance to any point in the cell"""
+        bound = GeoCalculator.cell_min_distance_m(lat, lon, cell)
+        south, north, west, east = geohash_bounds(cell)
+
+        lats, lons = _boundary(cell)
+        rng = np.random.default_rng(0)
+        lats = np.concatenate([lats, rng.uniform(south, north, 500)])
+        lons = np.concatenate([lons, rng.uniform(west, east, 500)])
+        dists = GeoCalculator.haversine_distance_m_vec(lat, lon, lats, lons)
+
+        assert bound <= dists.min() + 1e-6
+
+    def test_bound_is_tight_beside_a_cell(self):
+        """East of a cell the bound is the distance to its meridian edge"""
+        south, north, _, east = geohash_bounds("u4pr")
+        lat, lon = (south + north) / 2, east + 0.5
+
+        lats, lons = _boundary("u4pr", steps=20001)
+        nearest = GeoCalculator.haversine_distance_m_vec(lat, lon, lats, lons).min()
+
+        assert GeoCalculator.cell_min_distance_m(lat, lon, "u4pr") == pytest.approx(
+            nearest, abs=0.5
+        )
+
+    @pytest.mark.parametrize(
+        "lat,lon", [(6.9934, 81.0550), (7.2906, 80.6337), (60.0, 10.0)]
+    )
+    @pytest.mark.parametrize("precision", [3, 4, 6])
+    def test_zero_inside_cell(self, lat, lon, precision):
+        """A point inside a cell is 0 m from it"""
+        cell = GeoCalculator.calculate_geohash(lat, lon, precision)
+        south, north, west, east = geohash_bounds(cell)
+
+        assert south <= lat <= north and west <= lon <= east
+        assert GeoCalculator.cell_min_distance_m(lat, lon, cell) == 0.0
+
+
+def _brute_force_nearest(lat, lon, limit_m, zones=ZONES):
+    """Nearest zone within limit_m by scanning every zone."""
+    best = None
+    for zone in zones:
+        dist = GeoCalculator.haversine_distance_m(
+            lat, lon, zone["centroid_lat"], zone["centroid_lon"]
+        )
+        if dist <= limit_m and (best is None or dist < best[1]):
+            best = (zone, dist)
+    return best
+
+
+@pytest.fixture
+def zone_table(monkeypatch):
+    """
+    Serve ZONES from memory in place of the GeoHashIndex queries; the
+    returned list records every cell queried.
+    """
+    by_cell = {}
+    for zone in ZONES:
+        by_cell.setdefault(zone["geohash"], []).append(zone)
+    queried = []
+
+    def query_cells(cells):
+        queried.extend(cells)
+        return [(gh, by_cell.get(gh, [])) for gh in cells]
+
+    monkeypatch.setattr(rag_query_lambda, "_query_cells", query_cells)
+    monkeypatch.setattr(rag_query_lambda, "_zone_details", list)
+    return queried
+
+
+def _query_points(count, seed=5):
+    rng = random.Random(seed)
+    return [(rng.uniform(6.0, 8.0), rng.uniform(80.0, 81.9)) for _ in range(count)]
+
+
+class TestNearestZone:
+    """Test the pruned nearest-zone search against a brute-force scan"""
+
+    @pytest.mark.parametrize("max_distance_km", [0.5, 2.0, 5.0, 15.0, 40.0])
+    def test_matches_brute_force(self, zone_table, max_distance_km):
+        """Same zone and distance as scanning every zone"""
+        for lat, lon in _query_points(60):
+            result = RAGQueryHandler.query_nearest_zone(lat, lon, max_distance_km)
+            expected = _brute_force_nearest(lat, lon, max_distance_km * 1000.0)
+
+            if expected is None:
+                assert result["success"] is False
+                continue
+            zone, dist = expected
+            assert result["success"] is True
+            assert result["nearest_zone"]["zone_id"] == zone["zone_id"]
+            assert result["nearest_zone"]["distance_m"] == round(dist, 2)
+
+    @pytest.mark.parametrize("max_distance_km", [150.0, 500.0])
+    def test_capped_cover_matches_brute_force(self, zone_table, max_distance_km):
+        """
+        Radii past the cell cap query MAX_COVER_CELLS cells and still return
+        the nearest zone among them
+        """
+        for lat, lon in _query_points(20):
+            cells = _cells_covering(lat, lon, max_distance_km * 1000.0)
+            assert len(cells) == MAX_COVER_CELLS
+            covered = [z for z in ZONES if z["geohash"] in set(cells)]
+
+            del zone_table[:]
+            result = RAGQueryHandler.query_nearest_zone(lat, lon, max_distance_km)
+            zone, dist = _brute_force_nearest(
+                lat, lon, max_distance_km * 1000.0, covered
+            )
+
+            assert set(zone_table) <= set(cells)
+            assert result["nearest_zone"]["zone_id"] == zone["zone_id"]
+            assert result["nearest_zone"]["distance_m"] == round(dist, 2)
+
+    def test_capped_cover_finds_close_zone(self, zone_table):
+        """A large radius still finds the zone the small radius finds"""
+        for lat, lon in _query_points(40):
+            near = RAGQueryHandler.query_nearest_zone(lat, lon, 20.0)
+            far = RAGQueryHandler.query_nearest_zone(lat, lon, 500.0)
+
+            if near["success"]:
+                assert far["nearest_zone"]["zone_id"] == near["nearest_zone"]["zone_id"]
+
+    def test_prunes_neighbour_cells(self, zone_table):
+        """A zone next to the query point leaves the neighbour cells unqueried"""
+        zone = ZONES[0]
+        lat, lon = zone["centroid_lat"] + 1e-4, zone["centroid_lon"]
+
+        result = RAGQueryHandler.query_nearest_zone(lat, lon, 40.0)
+
+        assert result["nearest_zone"]["zone_id"] == zone["zone_id"]
+        assert len(zone_table) < len(_cells_covering(lat, lon, 40_000.0))
+
+
+class TestCellsCovering:
+    """Test the geohash cover of a query circle"""
+
+    @pytest.mark.parametrize("radius_m", [100.0, 5_000.0, 30_000.0, 80_000.0])
+    def test_covers_every_cell_in_radius(self, radius_m):
+        """Every cell of the circle's neighbourhood within radius_m is covered"""
+        for lat, lon in _query_points(30):
+            cells = _cells_covering(lat, lon, radius_m)
+            assert cells[0] == GeoCalculator.calculate_geohash(lat, lon, 4)
+            assert len(cells) == len(set(cells)) <= MAX_COVER_CELLS
+            if len(cells) == MAX_COVER_CELLS:
+                continue
+
+            # Candidate cells: centroid cells of the synthetic zones
+            for zone in ZONES:
+                gh = zone["geohash"]
+                if GeoCalculator.cell_min_distance_m(lat, lon, gh) <= radius_m:
+                    assert gh in cells
+
+    def test_cap_keeps_nearest_cells(self, monkeypatch):
+        """When the cap truncates a ring, the ring's nearest cells are kept"""
+        monkeypatch.setattr(rag_query_lambda, "MAX_COVER_CELLS", 3)
+        lat, lon = 7.01, 81.2  # near the east edge of tc1x
+        center = GeoCalculator.calculate_geohash(lat, lon, 4)
+        ring = sorted(
+            (
+                rag_query_lambda.adjacent(center, d)
+                for d in ("top", "bottom", "right", "left")
+            ),
+            key=lambda c: GeoCalculator.cell_min_distance_m(lat, lon, c),
+        )
+
+        cells = _cells_covering(lat, lon, 500_000.0)
+
+        assert cells[0] == center
+        assert set(cells[1:]) == set(ring[:2])
+
+
+class TestResponse:
+    """Test enveloped and bare (envelope: false) responses"""
+
+    RESULT = {
+        "success": True,
+        "area_sqm": Decimal("1250.5"),
+        "count": Decimal("3"),
+        "updated_at": datetime(2025, 11, 27, 6, 30, tzinfo=timezone.utc),
+        "centroid": {"lat": np.float64(7.29), "lon": 80.63},
+        "zones": [{"slope_angle": Decimal("32.5")}],
+    }
+    EXPECTED = {
+        "success": True,
+        "area_sqm": 1250.5,
+        "count": 3.0,
+        "updated_at": "2025-11-27T06:30:00+00:00",
+        "centroid": {"lat": 7.29, "lon": 80.63},
+        "zones": [{"slope_angle": 32.5}],
+    }
+
+    def test_bare_result_is_json_safe(self):
+        """The bare result goes through the same serialiser as the body"""
+        bare = _response(self.RESULT, 200, envelope=False)
+
+        assert bare == self.EXPECTED
+        assert json.loads(json.dumps(bare)) == self.EXPECTED
+
+    def test_envelope_body(self):
+        """The enveloped body decodes to the same values"""
+        response = _response(self.RESULT, 200, envelope=True, cors=True)
+
+        assert response["statusCode"] == 200
+        assert response["headers"]["Access-Control-Allow-Origin"] == "*"
+        assert json.loads(response["body"]) == self.EXPECTED
+
+    def test_handler_without_envelope(self, zone_table, monkeypatch):
+        """A direct invoke with envelope: false gets a JSON-safe result dict"""
+        zone = ZONES[0]
+        metadata = {
+            "shape_area": Decimal("1250.5"),
+            "surveyed_at": self.RESULT["updated_at"],
+        }
+        monkeypatch.setattr(
+            rag_query_lambda,
+            "_zone_details",
+            lambda candidates: [{**c, "metadata": metadata} for c in candidates],
+        )
+        event = {
+            "action": "nearest",
+            "latitude": zone["centroid_lat"],
+            "longitude": zone["centroid_lon"],
+            "max_distance_km": Decimal("5"),
+            "envelope": False,
+        }
+
+        result = lambda_handler(event, None)
+
+        assert "statusCode" not in result
+        assert result["nearest_zone"]["zone_id"] == zone["zone_id"]
+        assert result["nearest_zone"]["metadata"] == {
+            "shape_area": 1250.5,
+            "surveyed_at": "2025-11-27T06:30:00+00:00",
+        }
+        assert json.loads(json.dumps(result)) == result
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,128 @@
+"""
+Unit Tests for Geohash Cells
+
+Tests the shared neighbour lookup against pygeohash, including cell-border,
+antimeridian wrap-around and polar cases.
+"""
+
+import random
+
+import pytest
+from geohash_cells import _BASE32, adjacent, geohash_bounds, geohash_neighbors_8
+
+pgh = pytest.importorskip("pygeohash")
+
+DIRECTIONS = ("top", "bottom", "right", "left")
+
+# Cells whose neighbours cross parent-cell borders, the antimeridian
+# (east-west wrap) or would run past a pole
+EDGE_CELLS = [
+    "tc1x",  # Sri Lanka, interior
+    "tc1z",  # crosses the parent border to the top and right
+    "tc1b",  # crosses the parent border to the left
+    "7zzz",  # four-way corner of top-level cells
+    "s000",  # equator / prime meridian corner
+    "b",  # top-left of the world
+    "zzzz",  # north-east corner: wraps east, no cell to the north
+    "pbpb",  # south-east corner: wraps east, no cell to the south
+    "0000",  # south-west corner: wraps west, no cell to the south
+    "bpbp",  # north-west corner: wraps west, no cell to the north
+    "9q8yyk",
+    "u4pruydqqvj",
+]
+
+
+def _random_cells(count, seed=7):
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choice(_BASE32) for _ in range(rng.randint(1, 9)))
+        for _ in range(count)
+    ]
+
+
+def _expected_adjacent(cell, direction):
+    """pygeohash neighbour, with "" where it refuses to cross a pole."""
+    try:
+        return pgh.get_adjacent(cell, direction)
+    except ValueError:
+        return ""
+
+
+class TestAdjacent:
+    """Test edge-adjacent cells"""
+
+    @pytest.mark.parametrize("direction", DIRECTIONS)
+    @pytest.mark.parametrize("cell", EDGE_CELLS)
+    def test_matches_pygeohash_at_edges(self, cell, direction):
+        """Border, wrap-around and polar cells match pygeohash"""
+        assert adjacent(cell, direction) == _expected_adjacent(cell, direction)
+
+    def test_matches_pygeohash_random_cells(self):
+        """Random cells of every precision match pygeohash"""
+        for cell in _random_cells(2000):
+            for direction in DIRECTIONS:
+                assert adjacent(cell, direction) == _expected_adjacent(
+                    cell, direction
+                ), (cell, direction)
+
+    def test_wraps_around_the_antimeridian(self):
+        """Stepping east from the last column lands in the first"""
+        assert adjacent("zzzz", "right") == "bpbp"
+        assert adjacent("bpbp", "left") == "zzzz"
+
+    def test_no_cell_beyond_a_pole(self):
+        """The top row has no northern neighbour, the bottom no southern"""
+        assert adjacent("zzzz", "top") == ""
+        assert adjacent("0000", "bottom") == ""
+
+    def test_invalid_geohash(self):
+        """Empty and invalid geohashes have no neighbours"""
+        assert adjacent("", "top") == ""
+        assert adjacent("tc1a", "top") == ""
+
+
+class TestNeighbors8:
+    """Test the 3x3 block around a cell"""
+
+    @pytest.mark.parametrize("cell", EDGE_CELLS)
+    def test_matches_pygeohash(self, cell):
+        """Centre first, then the distinct neighbours pygeohash finds"""
+        expected = {cell}
+        for vertical in ("top", "bottom"):
+            above = _expected_adjacent(cell, vertical)
+            expected.add(above)
+            for horizontal in ("right", "left"):
+                expected.add(_expected_adjacent(cell, horizontal))
+                if above:
+                    expected.add(_expected_adjacent(above, horizontal))
+        expected.discard("")
+
+        neighbours = geohash_neighbors_8(cell)
+
+        assert neighbours[0] == cell
+        assert len(neighbours) == len(set(neighbours))
+        assert set(neighbours) == expected
+
+    def test_polar_cell_has_five_neighbours(self):
+        """A top-row cell has no row above it"""
+        assert len(geohash_neighbors_8("zzzz")[1:]) == 5
+
+    def test_empty_geohash(self):
+        """An empty geohash has no block"""
+        assert geohash_neighbors_8("") == ()
+
+
+class TestBounds:
+    """Test cell bounding boxes"""
+
+    @pytest.mark.parametrize("cell", EDGE_CELLS + _random_cells(50))
+    def test_matches_pygeohash(self, cell):
+        """(south, north, west, east) matches pygeohash's bounding box"""
+        box = pgh.get_bounding_box(cell)
+        assert geohash_bounds(cell) == pytest.approx(
+            (box.min_lat, box.max_lat, box.min_lon, box.max_lon)
+        )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,168 @@
+"""
+Unit Tests for Telemetry Ingestor Lambda
+
+Tests the geohash neighbour helper the ingestor shares with the RAG Lambda
+and BatchWriteItem chunking and retries.
+"""
+
+import logging
+from types import SimpleNamespace
+
+import ingestor_lambda
+import pytest
+from ingestor_lambda import TelemetryWriter, geohash_neighbors_8
+
+pgh = pytest.importorskip("pygeohash")
+
+# Sri Lankan sensor cells (geohash6), plus cells on parent-cell borders and
+# the antimeridian/polar edges
+CELLS = ["tc1xyz", "tc1xzz", "tc1xb0", "tc3n80", "tc0pbp", "zzzzzz", "000000"]
+
+
+def _pygeohash_block(cell):
+    """The cell and its 8 neighbours per pygeohash (none past a pole)."""
+
+    def adjacent(gh, direction):
+        try:
+            return pgh.get_adjacent(gh, direction) if gh else ""
+        except ValueError:
+            return ""
+
+    top = adjacent(cell, "top")
+    bottom = adjacent(cell, "bottom")
+    block = {cell, top, bottom}
+    for row in (cell, top, bottom):
+        block.add(adjacent(row, "right"))
+        block.add(adjacent(row, "left"))
+    block.discard("")
+    return block
+
+
+class TestGeohashNeighbors:
+    """Test the 3x3 block around a sensor cell"""
+
+    @pytest.mark.parametrize("cell", CELLS)
+    def test_matches_pygeohash(self, cell):
+        """Centre first, then the distinct neighbours pygeohash finds"""
+        neighbours = geohash_neighbors_8(cell)
+
+        assert neighbours[0] == cell
+        assert len(neighbours) == len(set(neighbours))
+        assert set(neighbours) == _pygeohash_block(cell)
+
+    def test_same_helper_as_rag(self):
+        """The ingestor and RAG Lambdas share one neighbour implementation"""
+        import rag_query_lambda
+
+        assert geohash_neighbors_8 is rag_query_lambda.geohash_neighbors_8
+
+
+class FakeBatchWriteClient:
+    """
+    Records batch_write_item calls; each response leaves unprocessed the
+    items the next entry of `unprocessed` names (by sensor_id), or raises it.
+    """
+
+    def __init__(self, table_name, unprocessed=()):
+        self.table_name = table_name
+        self.unprocessed = list(unprocessed)
+        self.calls = []
+
+    def batch_write_item(self, RequestItems):
+        requests = RequestItems[self.table_name]
+        self.calls.append([r["PutRequest"]["Item"]["sensor_id"] for r in requests])
+        outcome = self.unprocessed.pop(0) if self.unprocessed else ()
+        if isinstance(outcome, Exception):
+            raise outcome
+        left = [r for r in requests if r["PutRequest"]["Item"]["sensor_id"] in outcome]
+        return {"UnprocessedItems": {self.table_name: left} if left else {}}
+
+
+def _writer(unprocessed=()):
+    client = FakeBatchWriteClient("telemetry", unprocessed)
+    table = SimpleNamespace(name="telemetry", meta=SimpleNamespace(client=client))
+    return TelemetryWriter(table, enable_registry=False), client
+
+
+def _items(count):
+    return [
+        {"sensor_id": f"SENSOR_{i:03d}", "timestamp": 1735430400} for i in range(count)
+    ]
+
+
+class TestBatchWrite:
+    """Test BatchWriteItem chunking, retries and failures"""
+
+    @pytest.fixture(autouse=True)
+    def sleeps(self, monkeypatch):
+        """Backoff delays requested, without sleeping"""
+        delays = []
+        monkeypatch.setattr(ingestor_lambda.time, "sleep", delays.append)
+        return delays
+
+    def test_chunks_of_25(self, sleeps):
+        """60 items go out as 25 + 25 + 10 in input order"""
+        writer, client = _writer()
+        items = _items(60)
+
+        assert writer._batch_write(items) == []
+        assert [len(call) for call in client.calls] == [25, 25, 10]
+        assert [sid for call in client.calls for sid in call] == [
+            item["sensor_id"] for item in items
+        ]
+        assert sleeps == []
+
+    def test_retries_only_unprocessed_items(self, sleeps):
+        """A partial response resends just the unprocessed items"""
+        writer, client = _writer(
+            unprocessed=[{"SENSOR_003", "SENSOR_007"}, {"SENSOR_007"}]
+        )
+
+        assert writer._batch_write(_items(10)) == []
+        assert client.calls[1:] == [["SENSOR_003", "SENSOR_007"], ["SENSOR_007"]]
+        assert sleeps == [0.1, 0.2]
+
+    def test_backoff_over_five_attempts(self, sleeps):
+        """Five attempts per chunk, backing off exponentially up to the cap"""
+        writer, client = _writer(unprocessed=[{"SENSOR_001"}] * 5)
+        writer.BATCH_WRITE_MAX_BACKOFF_S = 0.3
+
+        failed = writer._batch_write(_items(3))
+
+        assert len(client.calls) == TelemetryWriter.BATCH_WRITE_MAX_ATTEMPTS == 5
+        assert sleeps == [0.1, 0.2, 0.3, 0.3]
+        assert failed == [
+            (
+                {"sensor_id": "SENSOR_001", "timestamp": 1735430400},
+                "Unprocessed after retries",
+            )
+        ]
+
+    def test_exhausted_items_are_reported(self, caplog):
+        """Items still unprocessed after the last attempt are counted and logged"""
+        writer, _ = _writer(unprocessed=[{"SENSOR_001", "SENSOR_002"}] * 5)
+
+        with caplog.at_level(logging.ERROR):
+            stats = writer.write_batch(_items(4))
+
+        assert stats["succeeded"] == 2
+        assert stats["failed"] == 2
+        assert [e["sensor_id"] for e in stats["errors"]] == ["SENSOR_001", "SENSOR_002"]
+        assert "Failed to write SENSOR_001: Unprocessed after retries" in caplog.text
+
+    def test_client_error_fails_remaining_items(self, sleeps):
+        """An exception fails the chunk's remaining items with its message"""
+        writer, client = _writer(
+            unprocessed=[{"SENSOR_002"}, RuntimeError("throttled")]
+        )
+
+        failed = writer._batch_write(_items(30))
+
+        assert failed == [
+            ({"sensor_id": "SENSOR_002", "timestamp": 1735430400}, "throttled")
+        ]
+        assert [len(call) for call in client.calls] == [25, 1, 5]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])